@@ -0,0 +1,104 @@
+# benchmarks/cold_start.py
+"""
+Cold start: import time of main.py and latency of the first requests.
+
+Each run starts a fresh interpreter (like a new App Engine instance). It
+installs the fake MySQL pool with a simulated connect handshake, times
+``import main`` and the app's startup, and times the first and
+second call to each endpoint. --warmup calls /_ah/warmup and waits for it
+to finish first, which is what App Engine does before sending traffic.
+
+    python -m benchmarks.cold_start --runs 5
+    python -m benchmarks.cold_start --runs 5 --warmup
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+REQUESTS = [
+    ("GET /", "GET", "/", None),
+    ("GET /api/questions", "GET", "/api/questions", None),
+    ("POST /api/analyze", "POST", "/api/analyze",
+     {"q1_response": 1, "q2_response": 2, "q3_response": 3,
+      "q4_response": 1, "q5_response": 2, "q6_response": 3}),
+    ("POST /api/generate-pdf", "POST", "/api/generate-pdf",
+     {"perspective": "Modern", "scores": [20.0, 60.0, 20.0],
+      "category_responses": {"Overview": "Bench"}}),
+]
+
+
+def child(warmup: bool, connect_latency: float):
+    """Runs inside the fresh interpreter; prints one JSON line of timings"""
+    import logging
+    import time
+
+    start = time.perf_counter()
+    from tests import fakedb
+    fakedb.install(fakedb.FakeDatabase(connect_latency=connect_latency))
+    import main
+    import_ms = (time.perf_counter() - start) * 1000
+    logging.disable(logging.CRITICAL)
+
+    from fastapi.testclient import TestClient
+    timings = {"import main": import_ms}
+    begin = time.perf_counter()
+    with TestClient(main.app, raise_server_exceptions=False) as client:
+        timings["startup"] = (time.perf_counter() - begin) * 1000
+        if warmup:
+            begin = time.perf_counter()
+            client.get("/_ah/warmup")
+            while main.warmup_task is None or not main.warmup_task.done():
+                time.sleep(0.01)
+            timings["warmup"] = (time.perf_counter() - begin) * 1000
+        for label, method, path, body in REQUESTS:
+            for attempt in ("first", "second"):
+                begin = time.perf_counter()
+                response = client.request(method, path, json=body)
+                timings[f"{label} ({attempt})"] = (time.perf_counter() - begin) * 1000
+                if response.status_code >= 400:
+                    timings[f"{label} status"] = response.status_code
+    # Fetched last so a module imported by the warm-up or a request is counted
+    timings["fpdf loaded"] = "fpdf" in sys.modules
+    print(json.dumps(timings))
+    sys.stdout.flush()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--warmup", action="store_true", help="Call /_ah/warmup before measuring")
+    parser.add_argument("--connect-latency", type=float, default=0.05,
+                        help="Simulated MySQL connect handshake (s)")
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        child(args.warmup, args.connect_latency)
+        return
+
+    runs = []
+    command = [sys.executable, "-m", "benchmarks.cold_start", "--child",
+               "--connect-latency", str(args.connect_latency)] + (["--warmup"] if args.warmup else [])
+    env = {**os.environ, "DB_SPOOL_ENABLED": "false"}
+    for _ in range(args.runs):
+        output = subprocess.run(command, cwd=ROOT, env=env, capture_output=True, text=True, check=True)
+        runs.append(json.loads(output.stdout.strip().splitlines()[-1]))
+
+    print(f"runs={args.runs} warmup={args.warmup} connect_latency={args.connect_latency}s")
+    print(f"{'step':<34} {'median ms':>10} {'max ms':>10}")
+    for key, value in runs[0].items():
+        if isinstance(value, bool) or key.endswith("status"):
+            print(f"{key:<34} {str(value):>10}")
+            continue
+        samples = [run[key] for run in runs]
+        print(f"{key:<34} {statistics.median(samples):>10.1f} {max(samples):>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,175 @@
+# benchmarks/load.py
+"""
+In-process HTTP load: /api/submit, /api/analyze and /api/generate-pdf together.
+
+Runs the FastAPI app (with its lifespan) on httpx's ASGI transport against
+the fake MySQL pool, whose query latency and failure rate are set from the
+command line. A fixed number of concurrent clients each pick an endpoint
+by weight, send a request and immediately send the next one (a closed
+loop), for --duration seconds after a short warm-up. Reports p50/p95/p99,
+throughput and status codes per endpoint. Submissions use unique session
+ids, answers are drawn from a seeded generator, and PDF requests cycle
+through --pdf-variants distinct reports so the render cache is exercised
+without serving everything from it.
+
+    python -m benchmarks.load --concurrency 16 --duration 10 --json load.json
+    python -m benchmarks.load --db-latency 0.05 --db-failure-rate 0.05 --mix submit=1
+"""
+import argparse
+import asyncio
+import logging
+import os
+import random
+import tempfile
+import time
+from collections import Counter
+
+import httpx
+
+from benchmarks import results
+from tests import fakedb
+
+ENDPOINTS = {
+    "submit": ("POST", "/api/submit"),
+    "analyze": ("POST", "/api/analyze"),
+    "pdf": ("POST", "/api/generate-pdf"),
+}
+
+
+def parse_mix(text: str) -> dict:
+    """"submit=5,analyze=4,pdf=1" -> {"submit": 5.0, ...}"""
+    mix = {}
+    for part in text.split(","):
+        name, _, weight = part.partition("=")
+        if name not in ENDPOINTS:
+            raise argparse.ArgumentTypeError(f"Unknown endpoint {name!r}; use {', '.join(ENDPOINTS)}")
+        mix[name] = float(weight or 1)
+    return mix
+
+
+class Workload:
+    """Request bodies for each endpoint, reproducible from a seed"""
+
+    def __init__(self, app_module, seed: int, pdf_variants: int):
+        self.rng = random.Random(seed)
+        self.questions = app_module.load_questions()["questions"]
+        self.sessions = 0
+        self.run_id = f"{seed}-{time.time_ns()}"
+        self.reports = []
+        for _ in range(pdf_variants):
+            answers = self.answers()
+            analysis = app_module.compute_analysis(answers)
+            self.reports.append({"perspective": analysis["perspective"],
+                                 "scores": analysis["scores"],
+                                 "category_responses": analysis["category_responses"]})
+
+    def answers(self) -> dict:
+        return {f"{key.lower()}_response": self.rng.randint(1, len(question["responses"]))
+                for key, question in self.questions.items()}
+
+    def body(self, endpoint: str) -> dict:
+        if endpoint == "submit":
+            self.sessions += 1
+            answers = self.answers()
+            return dict(answers, session_id=f"load-{self.run_id}-{self.sessions}",
+                        n1=40, n2=35, n3=25, plot_x="393.75", plot_y="438.75",
+                        browser="bench", region="bench", source="bench")
+        if endpoint == "analyze":
+            return self.answers()
+        return self.rng.choice(self.reports)
+
+
+async def run_load(app_module, workload: Workload, mix: dict, concurrency: int,
+                   duration: float, warmup: float) -> dict:
+    transport = httpx.ASGITransport(app=app_module.app)
+    samples = {name: [] for name in mix}
+    statuses = {name: Counter() for name in mix}
+    names, weights = list(mix), list(mix.values())
+    measuring = {"on": False}
+
+    async with app_module.lifespan(app_module.app):
+        await app_module.warm_up()
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench",
+                                     timeout=60) as client:
+            async def worker(deadline: float):
+                while time.perf_counter() < deadline:
+                    name = workload.rng.choices(names, weights)[0]
+                    method, path = ENDPOINTS[name]
+                    start = time.perf_counter()
+                    try:
+                        status = (await client.request(method, path, json=workload.body(name))).status_code
+                    except httpx.HTTPError as e:
+                        status = type(e).__name__
+                    if measuring["on"]:
+                        samples[name].append((time.perf_counter() - start) * 1000)
+                        statuses[name][str(status)] += 1
+
+            await asyncio.gather(*(worker(time.perf_counter() + warmup) for _ in range(concurrency)))
+            measuring["on"] = True
+            began = time.perf_counter()
+            await asyncio.gather(*(worker(began + duration) for _ in range(concurrency)))
+            elapsed = time.perf_counter() - began
+        db_stats = app_module.db_manager.stats()
+
+    report = {}
+    for name in mix:
+        report[name] = dict(results.summarize(samples[name]),
+                            throughput_rps=round(len(samples[name]) / elapsed, 2),
+                            statuses=dict(statuses[name]))
+    total = sum(len(s) for s in samples.values())
+    report["all"] = dict(results.summarize([x for s in samples.values() for x in s]),
+                         throughput_rps=round(total / elapsed, 2))
+    report["database"] = {"breaker": db_stats["breaker"], "write_pool": db_stats["write_pool"]}
+    return report
+
+
+def main_cli():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--concurrency", type=int, default=16, help="Concurrent clients")
+    parser.add_argument("--duration", type=float, default=10.0, help="Measured seconds")
+    parser.add_argument("--warmup", type=float, default=1.0, help="Unmeasured seconds first")
+    parser.add_argument("--mix", type=parse_mix, default=parse_mix("submit=5,analyze=4,pdf=1"),
+                        help="Endpoint weights, e.g. submit=5,analyze=4,pdf=1")
+    parser.add_argument("--db-latency", type=float, default=0.01, help="Simulated query latency (s)")
+    parser.add_argument("--db-failure-rate", type=float, default=0.0,
+                        help="Fraction of queries that fail with OperationalError")
+    parser.add_argument("--pdf-workers", type=int, default=2, help="PDF_WORKERS for the run")
+    parser.add_argument("--pdf-variants", type=int, default=20, help="Distinct PDF reports")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--json", metavar="PATH", help="Write results to this file")
+    args = parser.parse_args()
+
+    # Read by main and the modules it imports, so set before importing it
+    os.environ["PDF_WORKERS"] = str(args.pdf_workers)
+    os.environ["DB_SPOOL_DIR"] = tempfile.mkdtemp(prefix="survey_spool_")
+    fake_db = fakedb.install(fakedb.FakeDatabase(latency=args.db_latency,
+                                                 failure_rate=args.db_failure_rate, seed=args.seed))
+    import main
+    logging.disable(logging.WARNING)
+
+    workload = Workload(main, args.seed, args.pdf_variants)
+    report = asyncio.run(run_load(main, workload, args.mix, args.concurrency,
+                                  args.duration, args.warmup))
+    report["database"]["queries"] = fake_db.queries
+    report["database"]["rows"] = len(fake_db.rows)
+
+    print(f"concurrency={args.concurrency} duration={args.duration}s db_latency={args.db_latency}s "
+          f"db_failure_rate={args.db_failure_rate} pdf_workers={args.pdf_workers}")
+    print(f"{'endpoint':<10} {'requests':>9} {'req/s':>9} {'p50':>10} {'p95':>10} {'p99':>10} "
+          f"{'max':>10}  statuses")
+    for name in list(args.mix) + ["all"]:
+        row = report[name]
+        if not row["count"]:
+            print(f"{name:<10} {0:>9}")
+            continue
+        print(f"{name:<10} {row['count']:>9} {row['throughput_rps']:>9.1f} {row['p50_ms']:>8.1f}ms "
+              f"{row['p95_ms']:>8.1f}ms {row['p99_ms']:>8.1f}ms {row['max_ms']:>8.1f}ms  "
+              f"{row.get('statuses', '')}")
+
+    if args.json:
+        params = dict(vars(args), mix=args.mix)
+        results.write(args.json, "load", params, report)
+
+
+if __name__ == "__main__":
+    main_cli()
@@ -0,0 +1,117 @@
+# benchmarks/micro.py
+"""
+Micro-benchmarks of the scoring, analysis and report functions.
+
+Times calculate_perspective_scores, PerspectiveAnalyzer.get_perspective_summary,
+get_category_responses, the whole compute_analysis path and
+generate_pdf_report (with and without an embedded plot) on a fixed,
+seeded set of inputs. Each case is calibrated with timeit's autorange and
+repeated; the per-call best, median and p95 over the repeats are reported.
+
+    python -m benchmarks.micro --repeat 7 --json micro.json
+    python -m benchmarks.micro --only pdf
+"""
+import argparse
+import itertools
+import logging
+import random
+import statistics
+import timeit
+
+from benchmarks import results
+from tests import fakedb
+
+fakedb.install(fakedb.FakeDatabase())
+
+import main  # noqa: E402  (must import after the fake pool is installed)
+from src.visualization.pdf_generator import generate_pdf_report  # noqa: E402
+from src.visualization.perspective_analyzer import PerspectiveAnalyzer  # noqa: E402
+
+logging.disable(logging.INFO)
+
+
+def make_inputs(count: int, seed: int) -> dict:
+    """Answer sets, their scores and analyses, and the category text of each"""
+    rng = random.Random(seed)
+    questions = main.load_questions()["questions"]
+    templates = main.load_templates()
+    answers = [{f"{key.lower()}_response": rng.randint(1, len(question["responses"]))
+                for key, question in questions.items()} for _ in range(count)]
+    scores = [main.calculate_perspective_scores(a, questions) for a in answers]
+    analyses = [PerspectiveAnalyzer.get_perspective_summary(s) for s in scores]
+    return {
+        "questions": questions,
+        "templates": templates,
+        "answers": answers,
+        "scores": scores,
+        "analyses": analyses,
+        "category_responses": [main.get_category_responses(a, templates) for a in analyses],
+        "descriptions": [PerspectiveAnalyzer.get_perspective_description(a) for a in analyses],
+    }
+
+
+def cases(inputs: dict, plot_png: bytes) -> dict:
+    """name -> zero-argument callable; each call advances through the inputs"""
+    questions, templates = inputs["questions"], inputs["templates"]
+    answers = itertools.cycle(inputs["answers"])
+    scores = itertools.cycle(inputs["scores"])
+    analyses = itertools.cycle(inputs["analyses"])
+    reports = itertools.cycle(list(zip(inputs["descriptions"], inputs["scores"],
+                                       inputs["category_responses"])))
+
+    def pdf(plot=None):
+        perspective, report_scores, category_responses = next(reports)
+        return generate_pdf_report(perspective, report_scores, category_responses, plot_image=plot)
+
+    return {
+        "calculate_perspective_scores":
+            lambda: main.calculate_perspective_scores(next(answers), questions),
+        "get_perspective_summary": lambda: PerspectiveAnalyzer.get_perspective_summary(next(scores)),
+        "get_category_responses": lambda: main.get_category_responses(next(analyses), templates),
+        "compute_analysis": lambda: main.compute_analysis(next(answers)),
+        "generate_pdf_report": pdf,
+        "generate_pdf_report_with_plot": lambda: pdf(plot_png),
+    }
+
+
+def measure(func, repeat: int) -> dict:
+    timer = timeit.Timer(func)
+    number, _ = timer.autorange()
+    per_call = [total / number * 1e6 for total in timer.repeat(repeat=repeat, number=number)]
+    return {
+        "calls_per_repeat": number,
+        "best_us": round(min(per_call), 3),
+        "median_us": round(statistics.median(per_call), 3),
+        "p95_us": round(results.percentile(per_call, 95), 3),
+        "ops_per_sec": round(1e6 / statistics.median(per_call), 1),
+    }
+
+
+def main_cli():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--repeat", type=int, default=5, help="Timed repeats per case")
+    parser.add_argument("--inputs", type=int, default=256, help="Distinct inputs cycled through")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--only", help="Run cases whose name contains this text")
+    parser.add_argument("--json", metavar="PATH", help="Write results to this file")
+    args = parser.parse_args()
+
+    from benchmarks.pdf_workers import make_plot_png
+    selected = {name: func for name, func in cases(make_inputs(args.inputs, args.seed),
+                                                   make_plot_png()).items()
+                if not args.only or args.only in name}
+
+    print(f"repeat={args.repeat} inputs={args.inputs} seed={args.seed}")
+    print(f"{'case':<32} {'best':>12} {'median':>12} {'p95':>12} {'ops/s':>12}")
+    measured = {}
+    for name, func in selected.items():
+        measured[name] = result = measure(func, args.repeat)
+        print(f"{name:<32} {result['best_us']:>10.1f}us {result['median_us']:>10.1f}us "
+              f"{result['p95_us']:>10.1f}us {result['ops_per_sec']:>12.1f}")
+
+    if args.json:
+        results.write(args.json, "micro", vars(args), measured)
+
+
+if __name__ == "__main__":
+    main_cli()
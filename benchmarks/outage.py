@@ -0,0 +1,85 @@
+# benchmarks/outage.py
+"""
+Submission latency and data loss across a simulated Cloud SQL outage.
+
+Runs DatabaseManager against the fake pool in three phases: healthy, an
+outage in which every query fails, and recovery. Submissions keep coming
+from several threads throughout. Reports per-phase latency, how many
+submissions raised, and whether every acknowledged session_id ended up
+in survey_results exactly once after the spool replayed.
+--no-spool disables the journal for comparison with the old behaviour.
+
+    python -m benchmarks.outage --per-phase 200
+"""
+import argparse
+import os
+import statistics
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from tests import fakedb
+
+
+def submit(db_manager, session_id):
+    row = {
+        "session_id": session_id, "q1_response": 1, "q2_response": 2, "q3_response": 3,
+        "q4_response": 4, "q5_response": 5, "q6_response": 1, "n1": 40, "n2": 35, "n3": 25,
+        "plot_x": 393.75, "plot_y": 438.75, "browser": "bench", "region": "bench",
+        "source": "bench", "hash_email_session": None,
+    }
+    start = time.perf_counter()
+    try:
+        db_manager.save_response(row)
+        ok = True
+    except Exception:
+        ok = False
+    return (time.perf_counter() - start) * 1000, ok
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--per-phase", type=int, default=200)
+    parser.add_argument("--threads", type=int, default=8)
+    parser.add_argument("--latency", type=float, default=0.005, help="Simulated query latency (s)")
+    parser.add_argument("--retry-delay", type=float, default=0.2)
+    parser.add_argument("--no-spool", action="store_true")
+    args = parser.parse_args()
+
+    os.environ["DB_SPOOL_DIR"] = tempfile.mkdtemp(prefix="survey_spool_")
+    os.environ["DB_BREAKER_RESET_SECONDS"] = "1"
+    os.environ["DB_SPOOL_REPLAY_INTERVAL"] = "0.2"
+    db = fakedb.install(fakedb.FakeDatabase(latency=args.latency, seed=0))
+
+    from db_manager import DatabaseManager
+    import logging
+    logging.disable(logging.ERROR)
+    db_manager = DatabaseManager(spool=not args.no_spool)
+    db_manager.RETRY_DELAY_SECONDS = args.retry_delay
+
+    acknowledged = []
+    print(f"spool={'off' if args.no_spool else 'on'} per_phase={args.per_phase} threads={args.threads}")
+    print(f"{'phase':<10} {'p50 ms':>8} {'p99 ms':>8} {'errors':>7}")
+    with ThreadPoolExecutor(args.threads) as pool:
+        for phase, failure_rate in (("healthy", 0.0), ("outage", 1.0), ("recovery", 0.0)):
+            db.failure_rate = failure_rate
+            ids = [f"{phase}-{i}" for i in range(args.per_phase)]
+            results = list(pool.map(lambda s: submit(db_manager, s), ids))
+            acknowledged += [s for s, (_, ok) in zip(ids, results) if ok]
+            latencies = [ms for ms, _ in results]
+            errors = sum(not ok for _, ok in results)
+            p99 = statistics.quantiles(latencies, n=100)[98]
+            print(f"{phase:<10} {statistics.median(latencies):>8.1f} {p99:>8.1f} {errors:>7}")
+
+    deadline = time.monotonic() + 30
+    while db_manager.spool is not None and db_manager.spool.has_backlog() and time.monotonic() < deadline:
+        time.sleep(0.1)
+    stored = [row["session_id"] for row in db.rows]
+    missing = set(acknowledged) - set(stored)
+    print(f"acknowledged={len(acknowledged)} stored={len(stored)} unique={len(set(stored))} "
+          f"missing={len(missing)} breaker_opened={db_manager.breaker.times_opened}")
+    db_manager.close()
+
+
+if __name__ == "__main__":
+    main()
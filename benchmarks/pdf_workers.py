@@ -0,0 +1,79 @@
+# benchmarks/pdf_workers.py
+"""
+Throughput of PDF rendering as the worker pool grows.
+
+Submits a burst of concurrent render jobs (with an embedded plot image, the
+expensive part of a report) to PDFWorkerPool and reports reports/second for
+each worker count. workers=0 is the thread fallback for comparison. By
+default the plot is an RGBA PNG like the browser upload; --server-plot has
+the workers draw it instead.
+
+    python -m benchmarks.pdf_workers --workers 0,1,2,4 --jobs 64
+"""
+import argparse
+import asyncio
+import io
+import json
+import os
+import time
+
+import matplotlib
+matplotlib.use("Agg")
+import matplotlib.pyplot as plt  # noqa: E402
+
+from src.visualization.pdf_worker import PDFWorkerPool  # noqa: E402
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), "src", "data")
+
+
+def make_plot_png() -> bytes:
+    fig, ax = plt.subplots(figsize=(8, 7), dpi=100)
+    ax.fill([0, 0.5, 1, 0], [0, 0.87, 0, 0], color="#dbeafe")
+    ax.scatter([0.4], [0.3], s=200, color="red")
+    ax.axis("off")
+    buffer = io.BytesIO()
+    fig.savefig(buffer, format="png")
+    plt.close(fig)
+    return buffer.getvalue()
+
+
+def load_category_responses() -> dict:
+    with open(os.path.join(DATA_DIR, "response_templates.json")) as f:
+        categories = json.load(f)["categories"]
+    return {name: texts["Modern"]["response"] for name, texts in categories.items()}
+
+
+async def run(workers: int, jobs: int, plot_image: bytes, category_responses: dict) -> float:
+    pool = PDFWorkerPool(workers=workers, max_queue=jobs, timeout=120)
+    await asyncio.get_running_loop().run_in_executor(None, pool.start)
+    start = time.perf_counter()
+    await asyncio.gather(*[
+        pool.render("Strongly Modern", [10.0, 80.0, 10.0], category_responses,
+                    plot_image=plot_image, render_plot=plot_image is None)
+        for _ in range(jobs)
+    ])
+    elapsed = time.perf_counter() - start
+    pool.shutdown()
+    return jobs / elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--workers", default="0,1,2,4")
+    parser.add_argument("--jobs", type=int, default=64)
+    parser.add_argument("--server-plot", action="store_true",
+                        help="Render the plot in the workers instead of embedding an upload")
+    args = parser.parse_args()
+
+    category_responses = load_category_responses()
+    plot_image = None if args.server_plot else make_plot_png()
+    plot = "server" if plot_image is None else f"{len(plot_image)} byte upload"
+    print(f"cpus={os.cpu_count()} jobs={args.jobs} plot={plot}")
+    print(f"{'workers':>8} {'reports/s':>10}")
+    for workers in (int(w) for w in args.workers.split(",")):
+        rate = asyncio.run(run(workers, args.jobs, plot_image, category_responses))
+        print(f"{workers:>8} {rate:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+# benchmarks/questions_latency.py
+"""
+Load test: /api/questions latency while /api/submit is hitting a slow database.
+
+Drives the FastAPI app in-process with httpx and a fake MySQL server (see
+tests/fakedb.py). For each simulated insert latency it keeps a stream of
+submits in flight and measures /api/questions percentiles. With the async
+data access layer the p99 stays flat as the database gets slower;
+``--blocking`` swaps in the old synchronous call for comparison.
+
+    python -m benchmarks.questions_latency
+    python -m benchmarks.questions_latency --blocking
+"""
+import argparse
+import asyncio
+import logging
+import statistics
+import time
+
+import httpx
+
+from tests import fakedb
+
+fake_db = fakedb.install(fakedb.FakeDatabase())
+
+import main  # noqa: E402  (must import after the fake pool is installed)
+
+logging.disable(logging.INFO)
+
+SUBMISSION = {
+    "q1_response": 1, "q2_response": 2, "q3_response": 3,
+    "q4_response": 4, "q5_response": 5, "q6_response": 1,
+    "n1": 40, "n2": 40, "n3": 20, "plot_x": "450", "plot_y": "520",
+    "browser": "bench", "region": "US", "source": "bench"
+}
+
+
+class BlockingSaver:
+    """Previous behaviour: the blocking driver call runs on the event loop"""
+
+    async def save_response(self, data):
+        return main.db_manager.save_response(data)
+
+
+def percentile(samples, pct):
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+async def run_scenario(latency: float, requests: int, submitters: int) -> dict:
+    fake_db.latency = latency
+    transport = httpx.ASGITransport(app=main.app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        stop = asyncio.Event()
+
+        async def submitter():
+            while not stop.is_set():
+                await client.post("/api/submit", json=SUBMISSION)
+
+        background = [asyncio.create_task(submitter()) for _ in range(submitters)]
+        await asyncio.sleep(0.05)
+
+        samples = []
+        for _ in range(requests):
+            start = time.perf_counter()
+            response = await client.get("/api/questions")
+            samples.append((time.perf_counter() - start) * 1000)
+            response.raise_for_status()
+            await asyncio.sleep(0.005)
+
+        stop.set()
+        await asyncio.gather(*background)
+
+    return {
+        "db_latency_ms": latency * 1000,
+        "p50_ms": round(statistics.median(samples), 2),
+        "p99_ms": round(percentile(samples, 99), 2),
+        "max_ms": round(max(samples), 2),
+    }
+
+
+def main_cli():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--latencies", default="0,0.05,0.2,0.5",
+                        help="Comma-separated simulated insert latencies in seconds")
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--submitters", type=int, default=4)
+    parser.add_argument("--blocking", action="store_true",
+                        help="Call DatabaseManager.save_response inline (old behaviour)")
+    args = parser.parse_args()
+
+    if args.blocking:
+        main.async_db = BlockingSaver()
+
+    mode = "blocking" if args.blocking else "async"
+    print(f"mode={mode} submitters={args.submitters} requests={args.requests}")
+    print(f"{'db latency':>12} {'p50':>10} {'p99':>10} {'max':>10}")
+    for latency in (float(x) for x in args.latencies.split(",")):
+        result = asyncio.run(run_scenario(latency, args.requests, args.submitters))
+        print(f"{result['db_latency_ms']:>10.0f}ms {result['p50_ms']:>8.2f}ms "
+              f"{result['p99_ms']:>8.2f}ms {result['max_ms']:>8.2f}ms")
+
+
+if __name__ == "__main__":
+    main_cli()
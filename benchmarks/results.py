@@ -0,0 +1,107 @@
+# benchmarks/results.py
+"""
+JSON result files shared by the benchmarks, and a comparison of two runs.
+
+write() stores a benchmark's parameters and results together with the
+commit, Python version and machine they came from, so a later run can be
+compared against it:
+
+    python -m benchmarks.micro --json before.json
+    ... change something ...
+    python -m benchmarks.micro --json after.json
+    python -m benchmarks.results before.json after.json
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+from datetime import datetime, timezone
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+
+def percentile(samples, pct):
+    """Nearest-rank percentile of an unsorted sample"""
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def summarize(samples_ms) -> dict:
+    """count, mean and p50/p95/p99/max of latencies in milliseconds"""
+    if not samples_ms:
+        return {"count": 0}
+    return {
+        "count": len(samples_ms),
+        "mean_ms": round(statistics.fmean(samples_ms), 3),
+        "p50_ms": round(percentile(samples_ms, 50), 3),
+        "p95_ms": round(percentile(samples_ms, 95), 3),
+        "p99_ms": round(percentile(samples_ms, 99), 3),
+        "max_ms": round(max(samples_ms), 3),
+    }
+
+
+def environment() -> dict:
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT,
+                                capture_output=True, text=True, timeout=10).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        commit = None
+    return {
+        "commit": commit,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpus": os.cpu_count(),
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+    }
+
+
+def write(path: str, benchmark: str, params: dict, results: dict):
+    document = {"benchmark": benchmark, "environment": environment(),
+                "params": params, "results": results}
+    with open(path, "w") as f:
+        json.dump(document, f, indent=2, sort_keys=True)
+    print(f"Results written to {path}")
+
+
+def _flatten(value, prefix=""):
+    """{"a": {"p50_ms": 1}} -> {"a.p50_ms": 1}, numeric leaves only"""
+    if isinstance(value, dict):
+        for key, item in value.items():
+            yield from _flatten(item, f"{prefix}.{key}" if prefix else str(key))
+    elif isinstance(value, (int, float)) and not isinstance(value, bool):
+        yield prefix, value
+
+
+def compare(before: dict, after: dict):
+    if before.get("benchmark") != after.get("benchmark"):
+        print(f"warning: comparing {before.get('benchmark')} with {after.get('benchmark')}")
+    for label, document in (("before", before), ("after", after)):
+        env = document.get("environment", {})
+        print(f"{label:<7} {env.get('commit')} {env.get('timestamp')} python {env.get('python')}")
+    if before.get("params") != after.get("params"):
+        print("warning: parameters differ")
+    old = dict(_flatten(before.get("results", {})))
+    new = dict(_flatten(after.get("results", {})))
+    print(f"{'metric':<48} {'before':>12} {'after':>12} {'change':>9}")
+    for key in old:
+        if key not in new:
+            continue
+        change = f"{(new[key] - old[key]) / old[key] * 100:+.1f}%" if old[key] else ""
+        print(f"{key:<48} {old[key]:>12.3f} {new[key]:>12.3f} {change:>9}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare two benchmark result files")
+    parser.add_argument("before")
+    parser.add_argument("after")
+    args = parser.parse_args()
+    with open(args.before) as f, open(args.after) as g:
+        compare(json.load(f), json.load(g))
+
+
+if __name__ == "__main__":
+    main()
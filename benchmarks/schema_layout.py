@@ -0,0 +1,194 @@
+# benchmarks/schema_layout.py
+"""
+Insert and query latency of the baseline and migrated survey_results layouts.
+
+Loads the same synthetic rows into a table shaped like the original schema
+(primary key only, wide types) and one shaped like schema.sql (compact
+types plus secondary indexes), then times single-row inserts with a commit
+each (the web path), a bulk load, and the lookups the app and dashboards
+run: by session_id, by created_at window, by source and by region.
+
+SQLite is the default stand-in so it runs anywhere; --mysql runs against
+the database in .env using scratch tables that are dropped afterwards.
+
+    python -m benchmarks.schema_layout --rows 200000
+    python -m benchmarks.schema_layout --mysql --rows 200000
+"""
+import argparse
+import random
+import sqlite3
+import statistics
+import tempfile
+import time
+import uuid
+from datetime import datetime, timedelta
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+COLUMNS = ["session_id", "q1_response", "q2_response", "q3_response", "q4_response",
+           "q5_response", "q6_response", "n1", "n2", "n3", "plot_x", "plot_y",
+           "browser", "region", "source", "hash_email_session", "created_at"]
+SOURCES = ["web", "local", "newsletter", "twitter", "reddit"]
+REGIONS = ["North America", "Europe", "Asia", "South America", "Africa", "Oceania"]
+
+SQLITE_LAYOUTS = {
+    "baseline": """CREATE TABLE {table} (
+        id INTEGER PRIMARY KEY AUTOINCREMENT, session_id VARCHAR(255) NOT NULL,
+        q1_response INT, q2_response INT, q3_response INT, q4_response INT,
+        q5_response INT, q6_response INT, n1 FLOAT, n2 FLOAT, n3 FLOAT,
+        plot_x FLOAT, plot_y FLOAT, browser VARCHAR(255), region VARCHAR(255),
+        source VARCHAR(255), hash_email_session VARCHAR(255), created_at TIMESTAMP)""",
+    "migrated": """CREATE TABLE {table} (
+        id INTEGER PRIMARY KEY AUTOINCREMENT, session_id VARCHAR(64) NOT NULL,
+        q1_response TINYINT, q2_response TINYINT, q3_response TINYINT, q4_response TINYINT,
+        q5_response TINYINT, q6_response TINYINT, n1 SMALLINT, n2 SMALLINT, n3 SMALLINT,
+        plot_x DECIMAL(6,2), plot_y DECIMAL(6,2), browser VARCHAR(255), region VARCHAR(100),
+        source VARCHAR(50), hash_email_session VARCHAR(128), created_at TIMESTAMP NOT NULL);
+        CREATE UNIQUE INDEX {table}_session_id ON {table} (session_id);
+        CREATE INDEX {table}_created_at ON {table} (created_at);
+        CREATE INDEX {table}_source_created ON {table} (source, created_at);
+        CREATE INDEX {table}_region_created ON {table} (region, created_at)""",
+}
+
+
+def mysql_layout(name: str, table: str) -> str:
+    """DDL from the baseline migration or the canonical schema, renamed to a scratch table"""
+    path = ROOT / ("migrations/0001_create_survey_results.sql" if name == "baseline" else "schema.sql")
+    sql = "\n".join(l for l in path.read_text().splitlines() if not l.strip().startswith("--"))
+    sql = sql.split(";")[0]  # survey_results only, not the dimension tables
+    return sql.replace("IF NOT EXISTS survey_results", table).replace("idx_survey_results", f"idx_{table}")
+
+
+def make_rows(count: int, start: datetime, rng: random.Random):
+    rows = []
+    for i in range(count):
+        pre = rng.randint(0, 100)
+        mod = rng.randint(0, 100 - pre)
+        post = 100 - pre - mod
+        rows.append((
+            str(uuid.UUID(int=rng.getrandbits(128))),
+            *[rng.randint(1, 6) for _ in range(6)],
+            pre, mod, post,
+            round((750 * mod + 1500 * post) / 200, 2), round((1300 * mod + 650 * (pre + post)) / 200, 2),
+            "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 Chrome/120.0",
+            rng.choice(REGIONS), rng.choice(SOURCES), None,
+            (start + timedelta(seconds=i * 30)).strftime("%Y-%m-%d %H:%M:%S"),
+        ))
+    return rows
+
+
+def timed(func, repeat: int):
+    samples = []
+    for _ in range(repeat):
+        begin = time.perf_counter()
+        func()
+        samples.append((time.perf_counter() - begin) * 1000)
+    return statistics.median(samples), max(samples)
+
+
+def run_layout(connect, placeholder, ddl, table, rows, single_inserts, queries, rng, executescript):
+    connection = connect()
+    cursor = connection.cursor()
+    executescript(cursor, ddl)
+    connection.commit()
+    values = ", ".join([placeholder] * len(COLUMNS))
+    insert = f"INSERT INTO {table} ({', '.join(COLUMNS)}) VALUES ({values})"
+
+    begin = time.perf_counter()
+    for start in range(0, len(rows), 5000):
+        cursor.executemany(insert, rows[start:start + 5000])
+        connection.commit()
+    bulk_seconds = time.perf_counter() - begin
+
+    extra = make_rows(single_inserts, datetime(2026, 1, 1), rng)
+    insert_ms = []
+    for row in extra:
+        begin = time.perf_counter()
+        cursor.execute(insert, row)
+        connection.commit()
+        insert_ms.append((time.perf_counter() - begin) * 1000)
+
+    sessions = [row[0] for row in rng.sample(rows, queries)]
+    window_start = rows[len(rows) // 2][-1]
+    window_end = rows[len(rows) // 2 + 2880][-1] if len(rows) > len(rows) // 2 + 2880 else rows[-1][-1]
+
+    def run(query, params):
+        cursor.execute(query, params)
+        cursor.fetchall()
+
+    lookups = iter(sessions * 2)
+    results = {
+        "bulk rows/s": (len(rows) / bulk_seconds, None),
+        "insert+commit": (statistics.median(insert_ms), max(insert_ms)),
+        "by session_id": timed(lambda: run(
+            f"SELECT id FROM {table} WHERE session_id = {placeholder}", (next(lookups),)), queries),
+        "created_at day": timed(lambda: run(
+            f"SELECT COUNT(*) FROM {table} WHERE created_at >= {placeholder} AND created_at < {placeholder}",
+            (window_start, window_end)), 20),
+        "source in day": timed(lambda: run(
+            f"SELECT source, COUNT(*) FROM {table} WHERE created_at >= {placeholder} "
+            f"AND created_at < {placeholder} GROUP BY source", (window_start, window_end)), 20),
+        "region count": timed(lambda: run(
+            f"SELECT COUNT(*) FROM {table} WHERE region = {placeholder}", ("Oceania",)), 20),
+    }
+    cursor.close()
+    connection.close()
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=200_000)
+    parser.add_argument("--inserts", type=int, default=500, help="Single-row inserts to time")
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--mysql", action="store_true", help="Use the MySQL database from .env")
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    rows = make_rows(args.rows, datetime(2025, 1, 1), rng)
+
+    if args.mysql:
+        from dotenv import load_dotenv
+        from db_manager import DatabaseManager
+        load_dotenv()
+        db_manager = DatabaseManager(pool_size=1, spool=False)
+        connect, placeholder = db_manager.connect_dedicated, "%s"
+        layouts = {name: mysql_layout(name, f"bench_survey_results_{name}") for name in SQLITE_LAYOUTS}
+
+        def executescript(cursor, sql):
+            for statement in filter(str.strip, sql.split(";")):
+                cursor.execute(statement)
+    else:
+        path = Path(tempfile.mkdtemp()) / "schema_layout.sqlite"
+        connect, placeholder = (lambda: sqlite3.connect(path)), "?"
+        layouts = {name: ddl.format(table=f"bench_survey_results_{name}")
+                   for name, ddl in SQLITE_LAYOUTS.items()}
+
+        def executescript(cursor, sql):
+            cursor.executescript(sql)
+
+    print(f"backend={'mysql' if args.mysql else 'sqlite'} rows={args.rows}")
+    results = {}
+    try:
+        for name, ddl in layouts.items():
+            results[name] = run_layout(connect, placeholder, ddl, f"bench_survey_results_{name}",
+                                       rows, args.inserts, args.queries, rng, executescript)
+    finally:
+        if args.mysql:
+            connection = connect()
+            cursor = connection.cursor()
+            for name in layouts:
+                cursor.execute(f"DROP TABLE IF EXISTS bench_survey_results_{name}")
+            connection.close()
+
+    print(f"{'metric':<16} {'baseline':>20} {'migrated':>20}   (median / max ms)")
+    for metric in results["baseline"]:
+        cells = []
+        for name in ("baseline", "migrated"):
+            median, worst = results[name][metric]
+            cells.append(f"{median:>10.0f}" if worst is None else f"{median:>9.3f} / {worst:<8.3f}")
+        print(f"{metric:<16} {cells[0]:>20} {cells[1]:>20}")
+
+
+if __name__ == "__main__":
+    main()
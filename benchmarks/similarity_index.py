@@ -0,0 +1,86 @@
+# benchmarks/similarity_index.py
+"""
+Build, insert and query cost of the similarity index at scale.
+
+Generates N synthetic respondents (random answers scored with the real
+questionnaire and rounded to whole percentages like the front end stores
+them), bulk-loads SimplexGridIndex, streams extra single-row inserts
+through observe(), and times k-nearest queries against a NumPy brute-force
+scan of every row. Results are checked for identical neighbour distances.
+
+    python -m benchmarks.similarity_index --rows 1000000 --queries 500
+"""
+import argparse
+import time
+
+import numpy as np
+
+from src.analytics.similarity import ANSWER_COLUMNS, SCORE_COLUMNS, SimplexGridIndex
+from src.visualization.score_engine import ScoreEngine
+
+
+def make_rows(engine: ScoreEngine, rows: int, rng: np.random.Generator):
+    answers = rng.integers(1, 7, size=(rows, len(engine.question_ids)), dtype=np.int8)
+    scores = np.rint(engine.score(answers).scores)
+    return scores, answers
+
+
+def brute_force(scores, answers, query, query_answers, k, answer_weight):
+    distance = np.sqrt(((scores - query) ** 2).sum(axis=1))
+    distance += answer_weight * (answers != query_answers).sum(axis=1)
+    return np.sort(np.partition(distance, k - 1)[:k])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--inserts", type=int, default=10_000)
+    parser.add_argument("--queries", type=int, default=500)
+    parser.add_argument("-k", type=int, default=10)
+    parser.add_argument("--cell-size", type=float, default=2.0)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    engine = ScoreEngine.from_file()
+    scores, answers = make_rows(engine, args.rows, rng)
+    index = SimplexGridIndex(cell_size=args.cell_size)
+
+    start = time.perf_counter()
+    index.bulk_load(scores, answers)
+    print(f"bulk load    {args.rows:>9} rows  {(time.perf_counter() - start) * 1000:9.1f} ms")
+
+    extra_scores, extra_answers = make_rows(engine, args.inserts, rng)
+    rows = [dict(zip(SCORE_COLUMNS + ANSWER_COLUMNS, map(int, [*s, *a])))
+            for s, a in zip(extra_scores, extra_answers)]
+    start = time.perf_counter()
+    for row in rows:
+        index.observe([row])
+    elapsed = time.perf_counter() - start
+    print(f"observe      {args.inserts:>9} rows  {elapsed / args.inserts * 1e6:9.1f} us/row")
+
+    all_scores = np.concatenate([scores, extra_scores]).astype(np.float32)
+    all_answers = np.concatenate([answers, extra_answers])
+    query_scores, query_answers = make_rows(engine, args.queries, rng)
+    query_scores = engine.score(query_answers).scores
+
+    timings = {"index": [], "brute force": []}
+    for q, qa in zip(query_scores, query_answers):
+        start = time.perf_counter()
+        _, _, found = index.query(q.tolist(), qa.tolist(), args.k)
+        timings["index"].append(time.perf_counter() - start)
+
+        start = time.perf_counter()
+        expected = brute_force(all_scores, all_answers, q.astype(np.float32), qa, args.k,
+                               index.answer_weight)
+        timings["brute force"].append(time.perf_counter() - start)
+        assert np.allclose(found, expected, atol=1e-3), (q, found, expected)
+
+    print(f"{'query':<12} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9}")
+    for name, values in timings.items():
+        p50, p95, p99 = np.percentile(np.array(values) * 1000, [50, 95, 99])
+        print(f"{name:<12} {p50:>9.2f} {p95:>9.2f} {p99:>9.2f}")
+    print(f"{args.queries} queries matched brute force (k={args.k}, population={len(index)})")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,35 +1,150 @@
 import os
 import time
+import asyncio
+import functools
+import queue
+import tempfile
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 import mysql.connector
-from mysql.connector import Error, pooling
+from mysql.connector import Error
 import logging
 from contextlib import contextmanager
+from typing import Optional, Tuple
+from src.data.dimensions import DimensionEncoder
+from db_pool import ManagedPool, ReplicaLagProbe
+from src.monitoring.metrics import (db_checkout_wait_seconds, db_connection_held_seconds,
+                                    db_query_seconds, db_save_outcomes, db_save_retries)
+from src.monitoring import profiling
+from db_resilience import CircuitBreaker, CircuitOpen, SpoolJournal, SpoolReplayer, is_transient
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+class WriteBehindQueueFull(RuntimeError):
+    """Raised when the write-behind queue stays full for longer than the put timeout"""
+
+
+class RecentSubmissions:
+    """Bounded LRU of session_id -> record_id for rejecting repeat submissions.
+
+    A record_id of None means the row is queued in the write-behind buffer.
+    """
+
+    def __init__(self, max_entries: int = 10000):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+
+    def lookup(self, session_id: str) -> Tuple[bool, Optional[int]]:
+        with self._lock:
+            if session_id not in self._entries:
+                return False, None
+            self._entries.move_to_end(session_id)
+            self.hits += 1
+            return True, self._entries[session_id]
+
+    def remember(self, session_id: str, record_id: Optional[int]):
+        if session_id is None:
+            return
+        with self._lock:
+            self._entries[session_id] = record_id
+            self._entries.move_to_end(session_id)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def forget(self, session_id: str):
+        with self._lock:
+            self._entries.pop(session_id, None)
+
+
 class DatabaseManager:
-    def __init__(self):
+    def __init__(self, write_behind: bool = None, pool_size: int = None, dimensions: bool = None,
+                 spool: bool = None):
         logger.info("Initializing DatabaseManager")
         self.is_gae = os.getenv('GAE_ENV', '').startswith('standard')
         logger.info(f"Running in App Engine: {self.is_gae}")
         self._config = self._get_db_config()
         logger.info(f"Database config (sanitized): {self._sanitize_config(self._config)}")
         
-        # Initialize connection pool
-        self.pool_config = {
-            'pool_name': 'mypool',
-            'pool_size': 5,
-            'pool_reset_session': True,
-            **self._config
-        }
-        
-        try:
-            self.pool = mysql.connector.pooling.MySQLConnectionPool(**self.pool_config)
-            logger.info("Connection pool created successfully")
-        except Error as e:
-            logger.error(f"Error creating connection pool: {e}")
-            raise
+        # Write pool (inserts) and read pool (analytics, exports), sized separately
+        # so reporting load cannot starve ingestion. Reads use a replica when
+        # one is configured and its lag is within DB_READ_MAX_LAG_SECONDS.
+        self.pool = self._create_pool(
+            'write', self._config,
+            min_size=int(os.getenv('DB_POOL_MIN_SIZE', '1')),
+            max_size=pool_size or int(os.getenv('DB_POOL_MAX_SIZE', '5'))
+        )
+        self._read_config = self._get_read_config()
+        self.read_pool = self._create_pool(
+            'read', self._read_config or self._config,
+            min_size=int(os.getenv('DB_READ_POOL_MIN_SIZE', '1')),
+            max_size=pool_size or int(os.getenv('DB_READ_POOL_MAX_SIZE', '3'))
+        )
+        self.replica_lag = None
+        self.primary_read_pool = None
+        if self._read_config is not None:
+            # Reads fall back here, not to the write pool, while the replica lags
+            self.primary_read_pool = self._create_pool('primary_read', self._config, min_size=0,
+                                                       max_size=self.read_pool.max_size)
+            max_lag = float(os.getenv('DB_READ_MAX_LAG_SECONDS', '30'))
+            self.replica_lag = ReplicaLagProbe(
+                self.read_pool, max_lag=max_lag,
+                interval=float(os.getenv('DB_READ_LAG_CHECK_INTERVAL', '5')),
+                checkout_timeout=float(os.getenv('DB_READ_LAG_CHECK_TIMEOUT', '0.25'))
+            )
+            logger.info(f"Read replica (sanitized): {self._sanitize_config(self._read_config)}")
+        logger.info(f"Connection pools configured (write max={self.pool.max_size}, "
+                    f"read max={self.read_pool.max_size})")
+
+        # Fail fast while the database is unhealthy and journal submissions locally
+        self.breaker = CircuitBreaker(
+            failure_threshold=int(os.getenv('DB_BREAKER_FAILURES', '5')),
+            reset_timeout=float(os.getenv('DB_BREAKER_RESET_SECONDS', '30'))
+        )
+        self.spool = None
+        self.spool_replayer = None
+        if spool is None:
+            spool = os.getenv('DB_SPOOL_ENABLED', 'true').lower() in ('1', 'true', 'yes')
+        if spool:
+            spool_dir = os.getenv('DB_SPOOL_DIR') or os.path.join(tempfile.gettempdir(), 'survey_spool')
+            try:
+                self.spool = SpoolJournal(spool_dir)
+                self.spool_replayer = SpoolReplayer(
+                    self, self.spool, self.breaker,
+                    interval=float(os.getenv('DB_SPOOL_REPLAY_INTERVAL', '5')),
+                    batch_size=int(os.getenv('DB_SPOOL_REPLAY_BATCH_SIZE', '100'))
+                )
+                logger.info(f"Outage spool enabled at {spool_dir}")
+            except OSError as e:
+                logger.warning(f"Outage spool disabled, {spool_dir} unusable: {e}")
+
+        # Optional write-behind mode: submissions are queued and inserted in batches
+        if write_behind is None:
+            write_behind = os.getenv('DB_WRITE_BEHIND', '').lower() in ('1', 'true', 'yes')
+        self.write_buffer = None
+        if write_behind:
+            self.write_buffer = WriteBehindBuffer(
+                self,
+                max_queue=int(os.getenv('DB_WRITE_BEHIND_QUEUE_SIZE', '1000')),
+                batch_size=int(os.getenv('DB_WRITE_BEHIND_BATCH_SIZE', '50')),
+                flush_interval=float(os.getenv('DB_WRITE_BEHIND_FLUSH_INTERVAL', '1.0')),
+                put_timeout=float(os.getenv('DB_WRITE_BEHIND_PUT_TIMEOUT', '2.0'))
+            )
+
+        # Optional dictionary encoding of browser/region/source (needs migration 0003)
+        if dimensions is None:
+            dimensions = os.getenv('DB_DIMENSIONS', '').lower() in ('1', 'true', 'yes')
+        self.dimensions = DimensionEncoder() if dimensions else None
+        self.insert_query = self.INSERT_QUERY_DIMENSIONS if dimensions else self.INSERT_QUERY
+
+        # Front cache for idempotent submissions, backed by UNIQUE(session_id)
+        self.recent_submissions = RecentSubmissions(int(os.getenv('DB_DEDUP_CACHE_SIZE', '10000')))
+
+        # Callbacks notified with the rows of every committed insert
+        self._listeners = []
 
     def _sanitize_config(self, config):
         """Remove sensitive info for logging"""
@@ -61,13 +176,62 @@ class DatabaseManager:
                 'connect_timeout': 10
             }
 
+    def _create_pool(self, name: str, config: dict, min_size: int, max_size: int) -> ManagedPool:
+        return ManagedPool(
+            config,
+            name=name,
+            min_size=min_size,
+            max_size=max_size,
+            ping_after=float(os.getenv('DB_POOL_PING_AFTER_SECONDS', '30')),
+            max_age=float(os.getenv('DB_POOL_MAX_AGE_SECONDS', '1800')),
+            idle_timeout=float(os.getenv('DB_POOL_IDLE_TIMEOUT_SECONDS', '300')),
+            checkout_timeout=float(os.getenv('DB_POOL_CHECKOUT_TIMEOUT', '10')),
+            reset_session=os.getenv('DB_POOL_RESET_SESSION', 'true').lower() in ('1', 'true', 'yes')
+        )
+
+    def _get_read_config(self) -> Optional[dict]:
+        """Primary config pointed at the read replica, or None when there is none"""
+        if self.is_gae and os.getenv('DB_READ_INSTANCE_CONNECTION_NAME'):
+            instance_name = os.getenv('DB_READ_INSTANCE_CONNECTION_NAME')
+            return {**self._config, 'unix_socket': f"/cloudsql/{instance_name}"}
+        if not self.is_gae and os.getenv('DB_READ_HOST'):
+            return {**self._config, 'host': os.getenv('DB_READ_HOST'),
+                    'port': int(os.getenv('DB_READ_PORT') or self._config['port'])}
+        return None
+
+    def use_replica(self, max_lag: float = None) -> bool:
+        """Whether a read tolerating max_lag seconds of staleness may go to the replica"""
+        return self.replica_lag is not None and self.replica_lag.healthy(max_lag)
+
     @contextmanager
     def get_connection(self):
-        """Get a connection from the pool with context management"""
+        """Get a connection from the write pool with context management"""
+        with self._checkout(self.pool) as connection:
+            yield connection
+
+    @contextmanager
+    def get_read_connection(self, max_lag: float = None):
+        """Connection for reads that tolerate max_lag seconds of replica lag.
+
+        Comes from the read pool, which targets the replica when it is
+        within the lag bound and the primary otherwise, so read load never
+        takes connections from inserts.
+        """
+        pool = self.read_pool
+        if self.replica_lag is not None and not self.use_replica(max_lag):
+            pool = self.primary_read_pool
+        with self._checkout(pool) as connection:
+            yield connection
+
+    @contextmanager
+    def _checkout(self, pool: ManagedPool):
         connection = None
+        start = time.perf_counter()
         try:
-            connection = self.pool.get_connection()
-            logger.info("Got connection from pool")
+            connection = pool.get_connection()
+            checked_out = time.perf_counter()
+            db_checkout_wait_seconds.observe(checked_out - start, pool.name)
+            logger.debug("Got connection from pool")
             yield connection
         except Error as e:
             logger.error(f"Error getting connection from pool: {e}")
@@ -75,53 +239,213 @@ class DatabaseManager:
         finally:
             if connection:
                 connection.close()
-                logger.info("Connection returned to pool")
+                db_connection_held_seconds.observe(time.perf_counter() - checked_out, pool.name)
+                logger.debug("Connection returned to pool")
 
-    def save_response(self, survey_data: dict) -> int:
-        """Save survey response with retries"""
-        max_attempts = 3
-        last_error = None
-        
-        for attempt in range(1, max_attempts + 1):
+    def connect_dedicated(self, read_only: bool = False, **overrides):
+        """Open a standalone connection outside the pools, for long reads such as exports.
+
+        read_only connections go to the replica when it is within the lag bound.
+        """
+        config = self._read_config if read_only and self.use_replica() else self._config
+        return mysql.connector.connect(**{**config, **overrides})
+
+    def stats(self) -> dict:
+        """Pool, replica, circuit breaker and spool counters for capacity tuning"""
+        return {
+            "write_pool": self.pool.stats(),
+            "read_pool": self.read_pool.stats(),
+            "primary_read_pool": self.primary_read_pool.stats() if self.primary_read_pool else None,
+            "replica": self.replica_lag.stats() if self.replica_lag is not None else None,
+            "breaker": self.breaker.stats(),
+            "spool": self.spool.stats() if self.spool is not None else None,
+        }
+
+    def add_listener(self, callback):
+        """Register callback(rows) to be called after rows are committed"""
+        self._listeners.append(callback)
+
+    def _notify(self, rows: list):
+        for callback in self._listeners:
             try:
-                logger.info(f"Save attempt {attempt}/{max_attempts}")
-                
-                with self.get_connection() as connection:
-                    cursor = connection.cursor()
-                    
-                    query = """INSERT INTO survey_results 
-                        (session_id, q1_response, q2_response, q3_response, q4_response, 
-                         q5_response, q6_response, n1, n2, n3, plot_x, plot_y, 
-                         browser, region, source, hash_email_session)
-                        VALUES (%(session_id)s, %(q1_response)s, %(q2_response)s, 
-                                %(q3_response)s, %(q4_response)s, %(q5_response)s, 
-                                %(q6_response)s, %(n1)s, %(n2)s, %(n3)s, %(plot_x)s, 
-                                %(plot_y)s, %(browser)s, %(region)s, %(source)s, 
-                                %(hash_email_session)s)
-                    """
-                    
-                    cursor.execute(query, survey_data)
+                callback(rows)
+            except Exception as e:
+                logger.error(f"Insert listener {callback!r} failed: {e}")
+
+    INSERT_QUERY = """INSERT INTO survey_results 
+        (session_id, q1_response, q2_response, q3_response, q4_response, 
+         q5_response, q6_response, n1, n2, n3, plot_x, plot_y, 
+         browser, region, source, hash_email_session)
+        VALUES (%(session_id)s, %(q1_response)s, %(q2_response)s, 
+                %(q3_response)s, %(q4_response)s, %(q5_response)s, 
+                %(q6_response)s, %(n1)s, %(n2)s, %(n3)s, %(plot_x)s, 
+                %(plot_y)s, %(browser)s, %(region)s, %(source)s, 
+                %(hash_email_session)s)
+        ON DUPLICATE KEY UPDATE id = LAST_INSERT_ID(id)
+    """
+
+    INSERT_QUERY_DIMENSIONS = """INSERT INTO survey_results 
+        (session_id, q1_response, q2_response, q3_response, q4_response, 
+         q5_response, q6_response, n1, n2, n3, plot_x, plot_y, 
+         browser_id, region_id, source_id, hash_email_session)
+        VALUES (%(session_id)s, %(q1_response)s, %(q2_response)s, 
+                %(q3_response)s, %(q4_response)s, %(q5_response)s, 
+                %(q6_response)s, %(n1)s, %(n2)s, %(n3)s, %(plot_x)s, 
+                %(plot_y)s, %(browser_id)s, %(region_id)s, %(source_id)s, 
+                %(hash_email_session)s)
+        ON DUPLICATE KEY UPDATE id = LAST_INSERT_ID(id)
+    """
+
+    def _encode_rows(self, connection, rows: list) -> list:
+        """Swap dimension text for interned ids when dictionary encoding is enabled"""
+        if self.dimensions is None:
+            return rows
+        return [self.dimensions.encode(connection, row) for row in rows]
+
+    MAX_SAVE_ATTEMPTS = 3
+    RETRY_DELAY_SECONDS = 2
+
+    def insert_response(self, survey_data: dict) -> int:
+        """Insert a single survey response (one attempt, no retries)"""
+        with self.get_connection() as connection:
+            row = self._encode_rows(connection, [survey_data])[0]
+            cursor = connection.cursor()
+            with db_query_seconds.time('insert'):
+                cursor.execute(self.insert_query, row)
+                connection.commit()
+            
+            # On a duplicate session_id, LAST_INSERT_ID(id) yields the original row and,
+            # without CLIENT_FOUND_ROWS (off by default), rowcount is 0
+            record_id = cursor.lastrowid
+            duplicate = cursor.rowcount == 0
+            cursor.close()
+        self.recent_submissions.remember(survey_data.get('session_id'), record_id)
+        if duplicate:
+            logger.info(f"Duplicate submission {survey_data.get('session_id')}, existing ID: {record_id}")
+        else:
+            logger.info(f"Successfully saved survey response with ID: {record_id}")
+            self._notify([survey_data])
+        return record_id
+
+    def insert_batch(self, rows: list) -> int:
+        """Insert many survey responses as one multi-row INSERT in a single transaction"""
+        with self.get_connection() as connection:
+            encoded = self._encode_rows(connection, rows)
+            cursor = connection.cursor()
+            try:
+                with db_query_seconds.time('insert_batch'):
+                    cursor.executemany(self.insert_query, encoded)
                     connection.commit()
-                    
-                    record_id = cursor.lastrowid
-                    logger.info(f"Successfully saved survey response with ID: {record_id}")
-                    cursor.close()
-                    return record_id
+                inserted = cursor.rowcount
+            except Error:
+                connection.rollback()
+                raise
+            finally:
+                cursor.close()
+            logger.info(f"Flushed batch of {len(rows)} survey responses")
+        if 0 <= inserted < len(rows):
+            # Rows already present are not identified individually; the periodic
+            # aggregate reconcile corrects any double counting
+            logger.info(f"{len(rows) - inserted} duplicate submissions in batch ignored")
+        self._notify(rows)
+        return len(rows)
 
-            except Error as e:
+    def save_response(self, survey_data: dict) -> int:
+        """Save survey response with retries.
+
+        In write-behind mode the response is queued and None is returned; the
+        caller should acknowledge with the session_id instead of a record ID.
+        A session_id seen recently returns its original record ID without
+        touching the database.
+        """
+        found, record_id = self.check_duplicate(survey_data)
+        if found:
+            return record_id
+
+        if self.write_buffer is not None:
+            self.write_buffer.submit(survey_data)
+            self.recent_submissions.remember(survey_data.get('session_id'), None)
+            db_save_outcomes.inc('queued')
+            return None
+
+        last_error = None
+        for attempt in range(1, self.MAX_SAVE_ATTEMPTS + 1):
+            logger.info(f"Save attempt {attempt}/{self.MAX_SAVE_ATTEMPTS}")
+            try:
+                return self.attempt_insert(survey_data)
+            except (CircuitOpen, Error) as e:
                 last_error = e
-                logger.warning(f"Attempt {attempt} failed: {e}")
-                if attempt < max_attempts:
-                    logger.info("Retrying in 2 seconds...")
-                    time.sleep(2)
-                continue
+                delay = self.retry_delay(attempt, e, 'sync')
+                if delay is None:
+                    break
+                time.sleep(delay)
+        return self.save_failed(survey_data, last_error)
+
+    def retry_delay(self, attempt: int, error: Exception, caller: str) -> Optional[float]:
+        """Seconds to wait after a failed save attempt, or None when retrying cannot help"""
+        if isinstance(error, CircuitOpen):
+            return None
+        logger.warning(f"Attempt {attempt} failed: {error}")
+        if not is_transient(error) or attempt >= self.MAX_SAVE_ATTEMPTS:
+            return None
+        logger.info(f"Retrying in {self.RETRY_DELAY_SECONDS} seconds...")
+        db_save_retries.inc(caller)
+        return self.RETRY_DELAY_SECONDS
+
+    def save_failed(self, survey_data: dict, error: Exception) -> None:
+        """Spool a submission whose retries ran out, or raise when it cannot be spooled"""
+        if self.can_spool(error):
+            return self.spool_response(survey_data, error)
+        db_save_outcomes.inc('failed')
+        raise RuntimeError(f"Failed to save survey after {self.MAX_SAVE_ATTEMPTS} attempts: {error}")
+
+    def attempt_insert(self, survey_data: dict) -> int:
+        """One insert guarded by the circuit breaker (raises CircuitOpen while it is open)"""
+        if not self.breaker.allow():
+            raise CircuitOpen("Database circuit breaker is open")
+        try:
+            record_id = self.insert_response(survey_data)
+        except Error as e:
+            # Only connection-level failures say anything about database health
+            if is_transient(e):
+                self.breaker.record_failure()
+            else:
+                self.breaker.record_success()
+            raise
+        except BaseException:
+            # No verdict either way, but a half-open probe must not stay claimed
+            self.breaker.release_probe()
+            raise
+        self.breaker.record_success()
+        db_save_outcomes.inc('saved')
+        return record_id
 
-        raise RuntimeError(f"Failed to save survey after {max_attempts} attempts: {last_error}")
+    def can_spool(self, error: Exception) -> bool:
+        return self.spool is not None and (isinstance(error, CircuitOpen) or is_transient(error))
+
+    def spool_response(self, survey_data: dict, reason: Exception = None) -> None:
+        """Journal a submission for replay after the outage; returns None like write-behind"""
+        self.spool.append(survey_data)
+        self.recent_submissions.remember(survey_data.get('session_id'), None)
+        db_save_outcomes.inc('spooled')
+        logger.warning(f"Spooled submission {survey_data.get('session_id')} for replay: {reason}")
+        return None
+
+    def check_duplicate(self, survey_data: dict) -> Tuple[bool, Optional[int]]:
+        """(True, record_id) when this session_id was saved or queued recently"""
+        session_id = survey_data.get('session_id')
+        if session_id is None:
+            return False, None
+        found, record_id = self.recent_submissions.lookup(session_id)
+        if found:
+            logger.info(f"Duplicate submission {session_id} answered from cache")
+            db_save_outcomes.inc('duplicate')
+        return found, record_id
 
     def test_connection(self):
-        """Test database connectivity"""
+        """Test database connectivity (over the read pool, like any other COUNT)"""
         try:
-            with self.get_connection() as connection:
+            with self.get_read_connection() as connection:
                 cursor = connection.cursor()
                 
                 # Test queries
@@ -137,6 +461,7 @@ class DatabaseManager:
                     "status": "success",
                     "record_count": count,
                     "connection_type": conn_type,
+                    "read_replica": self.replica_lag is not None,
                     "config": {
                         k: v for k, v in self._config.items() 
                         if k not in ['password']
@@ -150,6 +475,225 @@ class DatabaseManager:
                 "config": self._sanitize_config(self._config)
             }
 
-    def __del__(self):
-        """Cleanup connection pool on destruction"""
-        # The pool will automatically close all connections
\ No newline at end of file
+    def close(self, timeout: float = 30.0):
+        """Drain any queued write-behind submissions before shutdown"""
+        if self.write_buffer is not None:
+            self.write_buffer.close(timeout=timeout)
+        if self.spool_replayer is not None:
+            self.spool_replayer.stop()
+        if self.spool is not None:
+            self.spool.close()
+        for pool in (self.pool, self.read_pool, self.primary_read_pool):
+            if pool is not None:
+                pool.close()
+
+
+class WriteBehindBuffer:
+    """Bounded in-memory queue of survey rows flushed with multi-row inserts.
+
+    A background thread flushes whenever batch_size rows are waiting or
+    flush_interval seconds have passed since the first queued row, whichever
+    comes first. When the queue is full, submit() blocks for up to put_timeout
+    seconds and then raises WriteBehindQueueFull so callers can shed load.
+    """
+
+    def __init__(self, db_manager: 'DatabaseManager', max_queue: int = 1000,
+                 batch_size: int = 50, flush_interval: float = 1.0, put_timeout: float = 2.0):
+        self.db = db_manager
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.put_timeout = put_timeout
+        self._queue = queue.Queue(maxsize=max_queue)
+        self._closed = threading.Event()
+        self._thread = threading.Thread(target=self._run, name='db-write-behind', daemon=True)
+        self._thread.start()
+        logger.info(f"Write-behind enabled (queue={max_queue}, batch={batch_size}, "
+                    f"interval={flush_interval}s)")
+
+    def submit(self, survey_data: dict):
+        """Queue a row for insertion, applying backpressure when the queue is full"""
+        if self._closed.is_set():
+            raise WriteBehindQueueFull("Write-behind buffer is shutting down")
+        try:
+            self._queue.put(dict(survey_data), timeout=self.put_timeout)
+        except queue.Full:
+            raise WriteBehindQueueFull(
+                f"Write-behind queue full ({self._queue.maxsize} pending submissions)"
+            )
+
+    def pending(self) -> int:
+        """Approximate number of rows waiting to be flushed"""
+        return self._queue.qsize()
+
+    def _next_batch(self) -> list:
+        try:
+            first = self._queue.get(timeout=self.flush_interval)
+        except queue.Empty:
+            return []
+        batch = [first]
+        deadline = time.monotonic() + self.flush_interval
+        while len(batch) < self.batch_size:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0 or (self._closed.is_set() and self._queue.empty()):
+                break
+            try:
+                batch.append(self._queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+        return batch
+
+    def _run(self):
+        while not (self._closed.is_set() and self._queue.empty()):
+            batch = self._next_batch()
+            if batch:
+                self._flush(batch)
+
+    def _flush(self, batch: list):
+        max_attempts = self.db.MAX_SAVE_ATTEMPTS
+        breaker = self.db.breaker
+        last_error = None
+        for attempt in range(1, max_attempts + 1):
+            if not breaker.allow():
+                last_error = CircuitOpen("Database circuit breaker is open")
+                break
+            try:
+                self.db.insert_batch(batch)
+                breaker.record_success()
+                return
+            except Error as e:
+                last_error = e
+                logger.warning(f"Batch flush attempt {attempt}/{max_attempts} failed: {e}")
+                if not is_transient(e):
+                    # One bad row fails the whole INSERT; find it instead of losing the batch
+                    breaker.record_success()
+                    batch, last_error = self._insert_rows(batch)
+                    if not batch:
+                        return
+                    break
+                breaker.record_failure()
+                if attempt < max_attempts:
+                    db_save_retries.inc('write_behind')
+                    time.sleep(self.db.RETRY_DELAY_SECONDS)
+            except Exception as e:
+                # Not a database answer; free a half-open probe and keep the thread alive
+                breaker.release_probe()
+                last_error = e
+                logger.error(f"Batch flush failed: {e}", exc_info=True)
+                break
+        if self.db.can_spool(last_error):
+            try:
+                self.db.spool.append_many(batch)
+                logger.warning(f"Spooled batch of {len(batch)} survey responses: {last_error}")
+                return
+            except RuntimeError as e:
+                logger.error(f"Could not spool batch: {e}")
+        session_ids = [row.get('session_id') for row in batch]
+        for session_id in session_ids:
+            self.db.recent_submissions.forget(session_id)
+        logger.error(f"Dropped batch of {len(batch)} survey responses: {session_ids}")
+
+    def _insert_rows(self, batch: list) -> Tuple[list, Optional[Exception]]:
+        """Insert rows one at a time, setting aside those the database refuses.
+
+        Stops at a transient error and returns the rows not yet written with
+        that error, so the caller can spool them; otherwise returns ([], None).
+        """
+        for index, row in enumerate(batch):
+            try:
+                self.db.insert_batch([row])
+            except Error as e:
+                if is_transient(e):
+                    self.db.breaker.record_failure()
+                    return batch[index:], e
+                self._reject(row, e)
+        return [], None
+
+    def _reject(self, row: dict, error: Exception):
+        self.db.recent_submissions.forget(row.get('session_id'))
+        db_save_outcomes.inc('failed')
+        if self.db.spool is not None:
+            self.db.spool.reject(row)
+            logger.error(f"Rejected survey response {row.get('session_id')}, kept in "
+                         f"{self.db.spool.rejected_path}: {error}")
+        else:
+            logger.error(f"Rejected survey response {row.get('session_id')}: {error}; row: {row}")
+
+    def close(self, timeout: float = 30.0):
+        """Stop accepting rows and block until the queue has been flushed"""
+        self._closed.set()
+        self._thread.join(timeout=timeout)
+        if self._thread.is_alive():
+            logger.error(f"Write-behind drain timed out with {self.pending()} rows pending")
+
+
+class AsyncDatabaseManager:
+    """Non-blocking facade over DatabaseManager for use from async route handlers.
+
+    mysql-connector is a blocking driver, so every call is handed to a bounded
+    thread pool sized to the connection pool. The event loop only awaits the
+    result, and retries back off with asyncio.sleep instead of time.sleep, so a
+    slow or failing Cloud SQL insert never stalls unrelated requests. Reads go
+    through run_read, a separate executor sized to the read pool, so long
+    analytics queries never occupy the threads inserts are waiting for.
+    """
+
+    def __init__(self, db_manager: DatabaseManager, max_workers: int = None):
+        self.db = db_manager
+        self.max_workers = max_workers or db_manager.pool.max_size
+        self._executor = ThreadPoolExecutor(
+            max_workers=self.max_workers,
+            thread_name_prefix='db-worker'
+        )
+        self._read_executor = ThreadPoolExecutor(
+            max_workers=db_manager.read_pool.max_size,
+            thread_name_prefix='db-read-worker'
+        )
+        logger.info(f"Async database executors started with {self.max_workers} write and "
+                    f"{db_manager.read_pool.max_size} read workers")
+
+    async def run(self, func, *args, **kwargs):
+        """Run a blocking database call on the executor and await its result"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self._executor, profiling.wrap(functools.partial(func, *args, **kwargs))
+        )
+
+    async def run_read(self, func, *args, **kwargs):
+        """Run a blocking read (one that uses get_read_connection) on the read executor"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self._read_executor, profiling.wrap(functools.partial(func, *args, **kwargs))
+        )
+
+    async def save_response(self, survey_data: dict) -> int:
+        """Save survey response with retries and non-blocking backoff"""
+        found, record_id = self.db.check_duplicate(survey_data)
+        if found:
+            return record_id
+
+        if self.db.write_buffer is not None:
+            # Enqueueing may block on backpressure, so keep it off the loop too
+            return await self.run(self.db.save_response, survey_data)
+
+        last_error = None
+        for attempt in range(1, self.db.MAX_SAVE_ATTEMPTS + 1):
+            logger.info(f"Save attempt {attempt}/{self.db.MAX_SAVE_ATTEMPTS}")
+            try:
+                return await self.run(self.db.attempt_insert, survey_data)
+            except (CircuitOpen, Error) as e:
+                last_error = e
+                delay = self.db.retry_delay(attempt, e, 'async')
+                if delay is None:
+                    break
+                await asyncio.sleep(delay)
+        # Spooling fsyncs, so it runs on the executor as well
+        return await self.run(self.db.save_failed, survey_data, last_error)
+
+    async def test_connection(self):
+        """Test database connectivity without blocking the event loop"""
+        return await self.run_read(self.db.test_connection)
+
+    def shutdown(self, wait: bool = True):
+        """Stop accepting work and wait for in-flight queries to finish"""
+        self._executor.shutdown(wait=wait)
+        self._read_executor.shutdown(wait=wait)
\ No newline at end of file
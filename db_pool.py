@@ -0,0 +1,326 @@
+import time
+import logging
+import threading
+from collections import deque
+from typing import Dict, Optional
+
+import mysql.connector
+from mysql.connector import errors
+
+logger = logging.getLogger(__name__)
+
+
+class PooledConnection:
+    """A checked-out connection; close() hands it back to the pool.
+
+    Attribute access is forwarded to the underlying mysql-connector
+    connection, so callers use it exactly like the pooled connections
+    MySQLConnectionPool returns.
+    """
+
+    def __init__(self, pool: 'ManagedPool', connection):
+        self._pool = pool
+        self._cnx = connection
+        self.created_at = time.monotonic()
+        self.last_used = self.created_at
+        self._checked_out = False
+
+    def __getattr__(self, name):
+        return getattr(self._cnx, name)
+
+    def close(self):
+        if self._checked_out:
+            self._checked_out = False
+            self._pool._release(self)
+
+    def _disconnect(self):
+        try:
+            self._cnx.close()
+        except Exception:
+            pass
+
+
+class ManagedPool:
+    """Connection pool with min/max sizing, validation and checkout metrics.
+
+    Connections are opened on demand up to max_size and handed out most
+    recently used first, so the spare ones age out of the idle list and are
+    closed once it holds more than min_size for longer than idle_timeout.
+    A connection idle for longer than ping_after is pinged before reuse
+    (Cloud SQL drops idle sessions), and one older than max_age is replaced.
+    When every connection is in use, get_connection() waits up to
+    checkout_timeout for one to be returned before raising PoolError.
+    """
+
+    def __init__(self, config: Dict, min_size: int = 1, max_size: int = 5,
+                 ping_after: float = 30.0, max_age: float = 1800.0, idle_timeout: float = 300.0,
+                 checkout_timeout: float = 10.0, reset_session: bool = True, name: str = "default"):
+        self.name = name
+        self.config = config
+        self.min_size = min(min_size, max_size)
+        self.max_size = max_size
+        self.ping_after = ping_after
+        self.max_age = max_age
+        self.idle_timeout = idle_timeout
+        self.checkout_timeout = checkout_timeout
+        self.reset_session = reset_session
+        self._idle = deque()
+        self._size = 0
+        self._in_use = 0
+        self._cond = threading.Condition()
+        self._closed = False
+
+        self.checkouts = 0
+        self.waited = 0
+        self.timeouts = 0
+        self.opened = 0
+        self.recycled = 0
+        self.pings = 0
+        self.ping_failures = 0
+        self.peak_in_use = 0
+        self._wait_total = 0.0
+        self._wait_max = 0.0
+        self._recent_waits = deque(maxlen=1024)
+
+    def _connect(self) -> PooledConnection:
+        connection = PooledConnection(self, mysql.connector.connect(**self.config))
+        with self._cond:
+            self.opened += 1
+        return connection
+
+    def prewarm(self) -> int:
+        """Open connections until min_size exist; returns how many were opened"""
+        opened = 0
+        while True:
+            with self._cond:
+                if self._closed or self._size >= self.min_size:
+                    break
+                self._size += 1
+            try:
+                connection = self._connect()
+            except errors.Error:
+                with self._cond:
+                    self._size -= 1
+                    self._cond.notify()
+                raise
+            with self._cond:
+                self._idle.append(connection)
+                self._cond.notify()
+            opened += 1
+        logger.info(f"Connection pool warmed with {opened} connection(s)")
+        return opened
+
+    def get_connection(self, timeout: Optional[float] = None) -> PooledConnection:
+        timeout = self.checkout_timeout if timeout is None else timeout
+        start = time.monotonic()
+        stale = []
+        with self._cond:
+            saturated = False
+            while True:
+                if self._closed:
+                    raise errors.PoolError("Connection pool is closed")
+                if self._idle:
+                    connection = self._idle.pop()
+                    break
+                if self._size < self.max_size:
+                    self._size += 1
+                    connection = None
+                    break
+                saturated = True
+                remaining = start + timeout - time.monotonic()
+                if remaining <= 0:
+                    self.timeouts += 1
+                    raise errors.PoolError(
+                        f"Failed getting connection; pool exhausted ({self.max_size} in use for {timeout}s)"
+                    )
+                self._cond.wait(remaining)
+            self._in_use += 1
+            self.peak_in_use = max(self.peak_in_use, self._in_use)
+            stale = self._expire_idle()
+            wait = time.monotonic() - start
+            self.checkouts += 1
+            self.waited += saturated
+            self._wait_total += wait
+            self._wait_max = max(self._wait_max, wait)
+            self._recent_waits.append(wait)
+
+        for entry in stale:
+            entry._disconnect()
+        try:
+            connection = self._connect() if connection is None else self._validate(connection)
+        except errors.Error:
+            with self._cond:
+                self._in_use -= 1
+                self._size -= 1
+                self._cond.notify()
+            raise
+        connection._checked_out = True
+        return connection
+
+    def _expire_idle(self) -> list:
+        """Remove spare connections idle past idle_timeout (caller holds the lock)"""
+        stale = []
+        now = time.monotonic()
+        while (self._idle and self._size > self.min_size
+               and now - self._idle[0].last_used > self.idle_timeout):
+            stale.append(self._idle.popleft())
+            self._size -= 1
+        return stale
+
+    def _validate(self, connection: PooledConnection) -> PooledConnection:
+        """Replace the connection if it is too old or fails a ping after idling"""
+        now = time.monotonic()
+        if now - connection.created_at > self.max_age:
+            connection._disconnect()
+            with self._cond:
+                self.recycled += 1
+            return self._connect()
+        if now - connection.last_used > self.ping_after:
+            with self._cond:
+                self.pings += 1
+            try:
+                connection.ping(reconnect=False)
+            except errors.Error as e:
+                logger.info(f"Discarding stale pooled connection: {e}")
+                connection._disconnect()
+                with self._cond:
+                    self.ping_failures += 1
+                return self._connect()
+        return connection
+
+    def _release(self, connection: PooledConnection):
+        keep = not self._closed
+        try:
+            if keep and self.reset_session:
+                connection.reset_session()
+            elif keep and connection.in_transaction:
+                connection.rollback()
+        except errors.Error as e:
+            logger.warning(f"Discarding pooled connection that failed to reset: {e}")
+            keep = False
+        connection.last_used = time.monotonic()
+        with self._cond:
+            self._in_use -= 1
+            keep = keep and not self._closed
+            if keep:
+                self._idle.append(connection)
+            else:
+                self._size -= 1
+            self._cond.notify()
+        if not keep:
+            connection._disconnect()
+
+    def close(self):
+        """Close idle connections; ones in use are closed as they are returned"""
+        with self._cond:
+            self._closed = True
+            idle, self._idle = list(self._idle), deque()
+            self._size -= len(idle)
+            self._cond.notify_all()
+        for connection in idle:
+            connection._disconnect()
+
+    def stats(self) -> Dict:
+        with self._cond:
+            waits = sorted(self._recent_waits)
+            return {
+                "size": self._size,
+                "idle": len(self._idle),
+                "in_use": self._in_use,
+                "peak_in_use": self.peak_in_use,
+                "min_size": self.min_size,
+                "max_size": self.max_size,
+                "checkouts": self.checkouts,
+                "saturation": round(self.waited / self.checkouts, 4) if self.checkouts else 0.0,
+                "waited": self.waited,
+                "timeouts": self.timeouts,
+                "wait_ms_avg": round(self._wait_total / self.checkouts * 1000, 3) if self.checkouts else 0.0,
+                "wait_ms_p95": round(waits[int(len(waits) * 0.95)] * 1000, 3) if waits else 0.0,
+                "wait_ms_max": round(self._wait_max * 1000, 3),
+                "opened": self.opened,
+                "recycled": self.recycled,
+                "pings": self.pings,
+                "ping_failures": self.ping_failures,
+            }
+
+
+class ReplicaLagProbe:
+    """Replication lag of the read replica, refreshed at most every interval seconds.
+
+    Reads Seconds_Behind_Source from SHOW REPLICA STATUS (falling back to
+    SHOW SLAVE STATUS on servers older than 8.0.22), which needs the
+    REPLICATION CLIENT privilege. A lag that cannot be read, or a NULL lag
+    because replication is stopped, counts as unhealthy so reads fall back
+    to the primary. Only one thread refreshes at a time; the others use
+    the last value instead of queueing behind the probe. The probe waits at
+    most checkout_timeout for a replica connection; when the pool is busy it
+    keeps the last reading rather than stalling the request that triggered it.
+    """
+
+    def __init__(self, pool: ManagedPool, max_lag: Optional[float] = 30.0, interval: float = 5.0,
+                 checkout_timeout: float = 0.25):
+        self.pool = pool
+        self.max_lag = max_lag
+        self.interval = interval
+        self.checkout_timeout = checkout_timeout
+        self.lag: Optional[float] = None
+        self.checked_at = None
+        self.error = None
+        self.fallbacks = 0
+        self._refreshing = threading.Lock()
+
+    def _read_lag(self) -> Optional[float]:
+        connection = self.pool.get_connection(timeout=self.checkout_timeout)
+        try:
+            cursor = connection.cursor(dictionary=True)
+            try:
+                cursor.execute("SHOW REPLICA STATUS")
+            except errors.ProgrammingError:
+                cursor.execute("SHOW SLAVE STATUS")
+            status = cursor.fetchone()
+            cursor.close()
+        finally:
+            connection.close()
+        if not status:
+            # Not a replica (e.g. the read pool points at the primary)
+            return 0.0
+        lag = status.get("Seconds_Behind_Source", status.get("Seconds_Behind_Master"))
+        return None if lag is None else float(lag)
+
+    def refresh(self):
+        if not self._refreshing.acquire(blocking=False):
+            return
+        try:
+            self.lag = self._read_lag()
+            self.error = None
+        except errors.PoolError as e:
+            # Every replica connection is busy; try again after the next interval
+            logger.debug(f"Replica lag check skipped: {e}")
+        except errors.Error as e:
+            if self.error is None:
+                logger.warning(f"Could not read replica lag, routing reads to the primary: {e}")
+            self.lag = None
+            self.error = str(e)
+        finally:
+            self.checked_at = time.monotonic()
+            self._refreshing.release()
+
+    def healthy(self, max_lag: Optional[float] = None) -> bool:
+        """Whether a read tolerating max_lag seconds (default self.max_lag) may use the replica"""
+        max_lag = self.max_lag if max_lag is None else max_lag
+        if max_lag is None or max_lag < 0:
+            return True
+        if self.checked_at is None or time.monotonic() - self.checked_at > self.interval:
+            self.refresh()
+        ok = self.lag is not None and self.lag <= max_lag
+        if not ok:
+            self.fallbacks += 1
+        return ok
+
+    def stats(self) -> Dict:
+        return {
+            "lag_seconds": self.lag,
+            "max_lag_seconds": self.max_lag,
+            "fallbacks": self.fallbacks,
+            "error": self.error,
+        }
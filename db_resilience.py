@@ -0,0 +1,338 @@
+import os
+import json
+import time
+import fcntl
+import logging
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+from mysql.connector import errors
+
+logger = logging.getLogger(__name__)
+
+
+class CircuitOpen(RuntimeError):
+    """Raised instead of attempting a query while the circuit breaker is open"""
+
+
+def is_transient(error: Exception) -> bool:
+    """Connection loss, timeouts and pool exhaustion, as opposed to bad data or SQL"""
+    return isinstance(error, (errors.OperationalError, errors.InterfaceError, errors.PoolError))
+
+
+class CircuitBreaker:
+    """Fails fast while the database is unhealthy.
+
+    After failure_threshold consecutive transient failures the breaker opens
+    and allow() returns False for reset_timeout seconds. It then lets a
+    single probe through (half-open): success closes it, failure re-opens it.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30.0):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = self.CLOSED
+        self.failures = 0
+        self.opened_at = None
+        self.times_opened = 0
+        self._probe_in_flight = False
+        self._lock = threading.Lock()
+
+    def allow(self) -> bool:
+        with self._lock:
+            if self.state == self.OPEN and time.monotonic() - self.opened_at >= self.reset_timeout:
+                self.state = self.HALF_OPEN
+                self._probe_in_flight = False
+            if self.state == self.HALF_OPEN:
+                if self._probe_in_flight:
+                    return False
+                self._probe_in_flight = True
+                return True
+            return self.state == self.CLOSED
+
+    def record_success(self):
+        with self._lock:
+            if self.state != self.CLOSED:
+                logger.info("Database circuit breaker closed")
+            self.state = self.CLOSED
+            self.failures = 0
+            self._probe_in_flight = False
+
+    def release_probe(self):
+        """Give up a half-open probe that ended without a verdict on database health"""
+        with self._lock:
+            self._probe_in_flight = False
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            if self.state == self.HALF_OPEN or self.failures >= self.failure_threshold:
+                if self.state != self.OPEN:
+                    self.times_opened += 1
+                    logger.warning(f"Database circuit breaker opened after {self.failures} failures")
+                self.state = self.OPEN
+                self.opened_at = time.monotonic()
+                self._probe_in_flight = False
+
+    def stats(self) -> Dict:
+        return {"state": self.state, "failures": self.failures, "times_opened": self.times_opened}
+
+
+class SpoolJournal:
+    """Append-only NDJSON journal of submissions that could not be written.
+
+    append() returns only after the row is on disk. A writer thread group
+    commits: every row queued while the previous fsync was running is
+    written and fsynced together, so an outage costs one fsync per burst
+    rather than per submission. For replay the journal is rotated to a
+    separate file, read in batches, and the byte offset of the last
+    replayed batch is recorded so an interrupted replay resumes there.
+    Replaying a row twice is harmless because session_id is unique.
+
+    Every worker process shares the directory, so appends and rotation hold
+    an flock on spool.lock and a writer whose file was rotated away by
+    another process reopens the journal before writing. Only one process
+    replays at a time (spool.replay.lock).
+    """
+
+    def __init__(self, directory: str, sync_timeout: float = 5.0):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.path = self.directory / "spool.ndjson"
+        self.replay_path = self.directory / "spool.replaying.ndjson"
+        self.offset_path = self.directory / "spool.replaying.offset"
+        self.rejected_path = self.directory / "spool.rejected.ndjson"
+        self.sync_timeout = sync_timeout
+        self._file = open(self.path, "ab")
+        self._file_lock = threading.Lock()
+        self._lock_file = open(self.directory / "spool.lock", "ab")
+        self._replay_lock_file = open(self.directory / "spool.replay.lock", "ab")
+        self._cond = threading.Condition()
+        self._pending: List[bytes] = []
+        self._queued = 0
+        self._synced = 0
+        self._error = None
+        self._closed = False
+        self.spooled = 0
+        self.fsyncs = 0
+        self._thread = threading.Thread(target=self._run, name='db-spool-writer', daemon=True)
+        self._thread.start()
+
+    def append(self, row: Dict):
+        """Durably journal one row; raises if it could not be synced in time"""
+        self.append_many([row])
+
+    def append_many(self, rows: List[Dict]):
+        lines = [(json.dumps(row, default=str, separators=(",", ":")) + "\n").encode() for row in rows]
+        with self._cond:
+            if self._closed:
+                raise RuntimeError("Spool journal is closed")
+            self._pending.extend(lines)
+            self._queued += len(lines)
+            ticket = self._queued
+            self._cond.notify_all()
+            if not self._cond.wait_for(lambda: self._synced >= ticket or self._error,
+                                       timeout=self.sync_timeout):
+                raise RuntimeError("Timed out waiting for spool fsync")
+            if self._synced < ticket:
+                raise RuntimeError(f"Spool write failed: {self._error}")
+
+    def _run(self):
+        while True:
+            with self._cond:
+                self._cond.wait_for(lambda: self._pending or self._closed)
+                if not self._pending and self._closed:
+                    return
+                lines, self._pending = self._pending, []
+                ticket = self._queued
+            try:
+                with self._locked():
+                    self._file.write(b"".join(lines))
+                    self._file.flush()
+                    os.fsync(self._file.fileno())
+            except OSError as e:
+                logger.error(f"Spool write failed: {e}")
+                with self._cond:
+                    self._error = e
+                    self._cond.notify_all()
+                continue
+            with self._cond:
+                self._synced = ticket
+                self._error = None
+                self.spooled += len(lines)
+                self.fsyncs += 1
+                self._cond.notify_all()
+
+    @contextmanager
+    def _locked(self):
+        """Exclusive across threads and processes, with self._file open on the current journal"""
+        with self._file_lock:
+            fcntl.flock(self._lock_file, fcntl.LOCK_EX)
+            try:
+                try:
+                    rotated = os.stat(self.path).st_ino != os.fstat(self._file.fileno()).st_ino
+                except FileNotFoundError:
+                    rotated = True
+                if rotated:
+                    self._file.close()
+                    self._file = open(self.path, "ab")
+                yield
+            finally:
+                fcntl.flock(self._lock_file, fcntl.LOCK_UN)
+
+    def _journal_bytes(self) -> int:
+        try:
+            return self.path.stat().st_size
+        except FileNotFoundError:
+            return 0
+
+    def has_backlog(self) -> bool:
+        return self.replay_path.exists() or self._journal_bytes() > 0
+
+    def _rotate(self) -> Optional[Path]:
+        """File to replay: an unfinished replay first, else the current journal"""
+        with self._locked():
+            if self.replay_path.exists():
+                return self.replay_path
+            if self._journal_bytes() == 0:
+                return None
+            self._file.close()
+            os.replace(self.path, self.replay_path)
+            self._file = open(self.path, "ab")
+        return self.replay_path
+
+    def replay(self, insert_batch: Callable[[List[Dict]], int], batch_size: int = 100) -> int:
+        """Feed journaled rows to insert_batch; returns rows replayed.
+
+        Errors from insert_batch propagate and leave the offset at the last
+        completed batch. Returns 0 while another process is replaying.
+        """
+        try:
+            fcntl.flock(self._replay_lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            return 0
+        try:
+            return self._replay(insert_batch, batch_size)
+        finally:
+            fcntl.flock(self._replay_lock_file, fcntl.LOCK_UN)
+
+    def _replay(self, insert_batch: Callable[[List[Dict]], int], batch_size: int) -> int:
+        path = self._rotate()
+        if path is None:
+            return 0
+        offset = int(self.offset_path.read_text()) if self.offset_path.exists() else 0
+        replayed = 0
+        with open(path, "rb") as f:
+            f.seek(offset)
+            while True:
+                lines = [line for line in (f.readline() for _ in range(batch_size)) if line]
+                if not lines:
+                    break
+                rows = []
+                for line in lines:
+                    try:
+                        if not line.endswith(b"\n"):
+                            raise ValueError("truncated line")
+                        rows.append(json.loads(line))
+                    except ValueError as e:
+                        # A damaged line must not stop the rows after it from replaying
+                        logger.error(f"Setting aside unreadable spool line: {e}")
+                        self._set_aside(line if line.endswith(b"\n") else line + b"\n")
+                if rows:
+                    self._insert_or_reject(insert_batch, rows)
+                replayed += len(rows)
+                offset = f.tell()
+                self.offset_path.write_text(str(offset))
+        self.offset_path.unlink(missing_ok=True)
+        path.unlink()
+        return replayed
+
+    def _insert_or_reject(self, insert_batch, rows: List[Dict]):
+        """Insert a batch; on a non-transient error retry row by row and set bad rows aside"""
+        try:
+            insert_batch(rows)
+        except errors.Error as e:
+            if is_transient(e):
+                raise
+            if len(rows) > 1:
+                for row in rows:
+                    self._insert_or_reject(insert_batch, [row])
+                return
+            # A row the database will never accept must not block the rest
+            logger.error(f"Rejected spooled submission {rows[0].get('session_id')}: {e}")
+            self.reject(rows[0])
+
+    def reject(self, row: Dict):
+        """Keep a row the database refused in spool.rejected.ndjson for manual repair"""
+        self._set_aside((json.dumps(row, default=str) + "\n").encode())
+
+    def _set_aside(self, line: bytes):
+        """Append a row (or an unparseable journal line) to spool.rejected.ndjson"""
+        with open(self.rejected_path, "ab") as f:
+            f.write(line)
+
+    def close(self, timeout: float = 5.0):
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+        self._thread.join(timeout=timeout)
+        self._file.close()
+        self._lock_file.close()
+        self._replay_lock_file.close()
+
+    def stats(self) -> Dict:
+        return {
+            "spooled": self.spooled,
+            "fsyncs": self.fsyncs,
+            "journal_bytes": self._journal_bytes(),
+            "replaying": self.replay_path.exists(),
+        }
+
+
+class SpoolReplayer:
+    """Background thread that drains the spool once the breaker lets writes through"""
+
+    def __init__(self, db_manager, journal: SpoolJournal, breaker: CircuitBreaker,
+                 interval: float = 5.0, batch_size: int = 100):
+        self.db = db_manager
+        self.journal = journal
+        self.breaker = breaker
+        self.interval = interval
+        self.batch_size = batch_size
+        self.replayed = 0
+        self._stopped = threading.Event()
+        self._thread = threading.Thread(target=self._run, name='db-spool-replay', daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        while not self._stopped.wait(self.interval):
+            if not self.journal.has_backlog() or not self.breaker.allow():
+                continue
+            try:
+                count = self.journal.replay(self.db.insert_batch, self.batch_size)
+            except errors.Error as e:
+                if is_transient(e):
+                    self.breaker.record_failure()
+                else:
+                    self.breaker.release_probe()
+                logger.warning(f"Spool replay paused: {e}")
+                continue
+            except Exception as e:
+                # Keep the thread alive and free the half-open probe for the next attempt
+                self.breaker.release_probe()
+                logger.error(f"Spool replay failed: {e}", exc_info=True)
+                continue
+            self.breaker.record_success()
+            if count:
+                self.replayed += count
+                logger.info(f"Replayed {count} spooled survey responses")
+
+    def stop(self, timeout: float = 10.0):
+        self._stopped.set()
+        self._thread.join(timeout=timeout)
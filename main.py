@@ -1,22 +1,34 @@
 # main.py # Force new checksum
 import os
+import time
+import asyncio
 from pathlib import Path
 import logging
-import json
 from decimal import Decimal
-from contextlib import contextmanager
+from contextlib import asynccontextmanager, contextmanager
 
-from fastapi import FastAPI, HTTPException, Request
+from fastapi import FastAPI, HTTPException, Request, BackgroundTasks, Query, Depends
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.security import HTTPBasic
-from fastapi.staticfiles import StaticFiles
 from fastapi.templating import Jinja2Templates
-from fastapi.responses import FileResponse
-from src.api.routes import pdf_routes
+from fastapi.responses import FileResponse, Response
+from src.api.routes import pdf_routes, stats_routes, export_routes, profile_routes
+from src.api.http_cache import PrecompressedAsset
+from src.api.static_assets import static_assets
+from src.monitoring.metrics import registry, stats_gauges, monitor_event_loop
+from src.monitoring.middleware import MetricsMiddleware
+from src.monitoring.profiling import ProfilingMiddleware, profile_store
+from src.visualization.pdf_worker import pdf_pool
 
-from models import SurveyResponse, Question
-from db_manager import DatabaseManager
+from models import SurveyResponse, Question, BatchAnalyzeRequest
+from db_manager import DatabaseManager, AsyncDatabaseManager, WriteBehindQueueFull
 from src.visualization.perspective_analyzer import PerspectiveAnalyzer
+from src.visualization.score_engine import normalize_scores, score_responses
+from src.visualization.answer_table import answer_table_if_ready, get_answer_table
+from src.data.content_store import content_store
+from src.analytics.aggregates import population
+from src.analytics.percentiles import percentile_ranker
+from src.analytics.similarity import similarity_index
 
 # Dev environment setup
 from dotenv import load_dotenv
@@ -29,20 +41,118 @@ logger = logging.getLogger(__name__)
 # Create database manager instance
 logger.info("Creating database manager instance")
 db_manager = DatabaseManager()
+async_db = AsyncDatabaseManager(db_manager)
+
+# Keep the population dashboards current from committed inserts
+db_manager.add_listener(population.observe)
+db_manager.add_listener(percentile_ranker.observe)
+db_manager.add_listener(similarity_index.observe)
+AGGREGATES_RECONCILE_INTERVAL = float(os.getenv('AGGREGATES_RECONCILE_INTERVAL', '600'))
+SIMILARITY_RELOAD_INTERVAL = float(os.getenv('SIMILARITY_RELOAD_INTERVAL', '3600'))
+maintenance_tasks = []
 
 # Get base directory for data files
 BASE_DIR = Path(__file__).resolve().parent
 
+# Answer fields of SurveyResponse that feed the analysis
+ANSWER_FIELDS = [f"q{i}_response" for i in range(1, 7)]
+
+# Warm up in the background at startup instead of waiting for /_ah/warmup
+WARM_ON_STARTUP = os.getenv('WARM_ON_STARTUP', '').lower() in ('1', 'true', 'yes')
+
+# Return /api/submit-and-analyze before the insert completes
+DEFER_PERSIST = os.getenv('SUBMIT_DEFER_PERSIST', 'true').lower() in ('1', 'true', 'yes')
+
+async def load_analytics():
+    """Warm the pools and load the in-memory analytics without delaying startup"""
+    for run, pool in ((async_db.run, db_manager.pool), (async_db.run_read, db_manager.read_pool)):
+        try:
+            await run(pool.prewarm)
+        except Exception as e:
+            logger.error(f"Could not pre-warm connection pool: {e}")
+    # Other instances write too, so reload periodically from the read replica
+    for name, loader, interval in (
+            ("percentile ranks", percentile_ranker.seed, AGGREGATES_RECONCILE_INTERVAL),
+            ("similarity index", similarity_index.load, SIMILARITY_RELOAD_INTERVAL)):
+        maintenance_tasks.append(asyncio.create_task(reload_forever(name, loader, interval)))
+
+async def reload_forever(name: str, loader, interval: float):
+    """Run loader(db_manager) on the read pool now and then every interval seconds"""
+    while True:
+        try:
+            await async_db.run_read(loader, db_manager)
+        except Exception as e:
+            logger.error(f"Could not load {name}: {e}")
+        await asyncio.sleep(interval)
+
+def warm_up_sync():
+    """Load content and the answer table, import the report modules, start PDF workers"""
+    content_store.snapshot()
+    get_answer_table()
+    index_page()
+    import src.visualization.pdf_generator  # noqa: F401
+    import src.visualization.plot_renderer  # noqa: F401
+    pdf_pool.start()
+
+warmup_task = None
+
+def start_warm_up() -> asyncio.Task:
+    """Run the warm-up once in the background; later calls return the same task"""
+    global warmup_task
+    if warmup_task is None:
+        warmup_task = asyncio.create_task(warm_up())
+    return warmup_task
+
+async def warm_up():
+    start = time.perf_counter()
+    try:
+        await asyncio.get_running_loop().run_in_executor(None, warm_up_sync)
+        logger.info(f"Instance warmed up in {time.perf_counter() - start:.2f}s")
+    except Exception as e:
+        logger.error(f"Warm-up failed: {e}", exc_info=True)
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Nothing here blocks serving: connections open on first use and the heavy
+    # modules load in the warm-up (/_ah/warmup on App Engine, or WARM_ON_STARTUP)
+    pdf_routes.pdf_jobs.start()
+    maintenance_tasks.append(asyncio.create_task(
+        population.reconcile_forever(async_db.run_read, db_manager, AGGREGATES_RECONCILE_INTERVAL)
+    ))
+    maintenance_tasks.append(asyncio.create_task(load_analytics()))
+    maintenance_tasks.append(asyncio.create_task(monitor_event_loop()))
+    if WARM_ON_STARTUP:
+        start_warm_up()
+    yield
+    await pdf_routes.pdf_jobs.stop()
+    for task in maintenance_tasks:
+        task.cancel()
+    async_db.shutdown()
+    db_manager.close()
+    pdf_pool.shutdown()
+
 # Create FastAPI app
 app = FastAPI(
     title="Modernity Worldview Analysis API",
     description="API for the Modernity Worldview Analysis survey",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan
 )
 
 # Setup templates and static files
 templates = Jinja2Templates(directory="templates")
-app.mount("/static", StaticFiles(directory="static"), name="static")
+templates.env.globals["static_url"] = static_assets.url
+index_asset = None
+
+def index_page() -> PrecompressedAsset:
+    """index.html rendered once (it has no per-request variables) with gzip/brotli variants"""
+    global index_asset
+    if index_asset is None:
+        html = templates.get_template("index.html").render()
+        asset = PrecompressedAsset(html.encode(), "text/html; charset=utf-8")
+        asset.add_brotli()
+        index_asset = asset
+    return index_asset
 
 # Add CORS middleware
 app.add_middleware(
@@ -57,7 +167,10 @@ app.add_middleware(
     allow_headers=["*"]
 )
 
-app.include_router(pdf_routes.router, prefix="/api")
+API_ROUTERS = (pdf_routes.router, stats_routes.router, export_routes.router, profile_routes.router)
+for router in API_ROUTERS:
+    app.include_router(router, prefix="/api")
+app.state.db_manager = db_manager
 
 # Add security headers middleware
 @app.middleware("http")
@@ -77,77 +190,237 @@ async def add_security_headers(request, call_next):
     )
     return response
 
+# Opt-in request profiling; not installed at all unless a token or sample rate is set
+PROFILE_SAMPLE_RATE = float(os.getenv('PROFILE_SAMPLE_RATE', '0'))
+if os.getenv('PROFILE_TOKEN') or PROFILE_SAMPLE_RATE > 0:
+    app.add_middleware(
+        ProfilingMiddleware,
+        store=profile_store,
+        token=os.getenv('PROFILE_TOKEN') or None,
+        sample_rate=PROFILE_SAMPLE_RATE,
+        min_duration=float(os.getenv('PROFILE_MIN_MS', '0')) / 1000
+    )
+
+# Request latency per route; added last so it wraps every other middleware
+app.add_middleware(MetricsMiddleware, included_routers=[("/api", router) for router in API_ROUTERS])
+
+# Resource state sampled at scrape time
+POOL_STATS = ("size", "idle", "in_use", "peak_in_use", "max_size", "saturation", "checkouts",
+              "waited", "timeouts", "opened", "recycled", "pings", "ping_failures")
+registry.gauge(
+    "db_pool_state", "Connection pool counters by pool",
+    lambda: {(pool.name, stat): value
+             for pool in (db_manager.pool, db_manager.read_pool, db_manager.primary_read_pool)
+             if pool is not None
+             for stat, value in pool.stats().items() if stat in POOL_STATS},
+    ("pool", "stat"))
+registry.gauge(
+    "db_breaker_state", "1 for the circuit breaker's current state",
+    lambda: {(db_manager.breaker.state,): 1}, ("state",))
+registry.gauge(
+    "db_replica_lag_seconds", "Last measured read replica lag",
+    lambda: {(): db_manager.replica_lag.lag} if db_manager.replica_lag is not None else {})
+stats_gauges("db_breaker", "Circuit breaker counters", db_manager.breaker.stats)
+stats_gauges("db_spool", "Outage spool counters",
+             lambda: db_manager.spool.stats() if db_manager.spool is not None else None)
+stats_gauges("pdf_worker_pool", "PDF worker pool occupancy and rejections", pdf_pool.stats)
+stats_gauges("pdf_jobs", "PDF job queue state", lambda: pdf_routes.pdf_jobs.stats())
+
 # Main routes and handlers
+@app.get("/metrics", dependencies=[Depends(stats_routes.require_metrics_token)])
+async def metrics():
+    """Prometheus text exposition; requires the METRICS_TOKEN bearer token"""
+    return Response(registry.render(), media_type="text/plain; version=0.0.4; charset=utf-8")
+
+@app.get("/_ah/warmup")
+async def warmup():
+    """App Engine warmup request: start loading heavy modules before live traffic"""
+    task = start_warm_up()
+    return {"status": "done" if task.done() else "warming"}
+
 @app.get("/")
 async def root(request: Request):
-    return templates.TemplateResponse("index.html", {"request": request})
+    return index_page().response(request)
+
+@app.get("/static/{path:path}")
+async def static_file(request: Request, path: str):
+    """Static files from memory; fingerprinted URLs (see static_url) are cached as immutable"""
+    return static_assets.response(request, path)
 
 @app.post("/api/submit")
 async def submit_survey(response: SurveyResponse):
     try:
-        data = response.dict()
-        for key in data:
-            if isinstance(data[key], Decimal):
-                data[key] = float(data[key])
-        
-        record_id = db_manager.save_response(data)
+        data = prepare_submission(response)
+        record_id = await async_db.save_response(data)
         return {
             "status": "success",
-            "message": "Survey response recorded",
+            "message": "Survey response recorded" if record_id is not None else "Survey response queued",
             "session_id": response.session_id,
             "record_id": record_id
         }
+    except WriteBehindQueueFull as e:
+        logger.warning(f"Submission rejected: {e}")
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": "5"})
+    except Exception as e:
+        logger.error(f"Submission error: {e}", exc_info=True)
+        raise HTTPException(status_code=500, detail=str(e))
+
+@app.post("/api/submit-and-analyze")
+async def submit_and_analyze(response: SurveyResponse, background_tasks: BackgroundTasks,
+                             wait: bool = False):
+    """Validate, analyze and persist a submission in one round trip.
+
+    By default the analysis is returned immediately and the insert runs as a
+    background task after the response is sent; pass ?wait=true (or set
+    SUBMIT_DEFER_PERSIST=false) to persist before responding and get a record_id.
+    """
+    data = prepare_submission(response)
+    answers = {field: data[field] for field in ANSWER_FIELDS}
+    try:
+        payload = build_analysis(answers)
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    except Exception as e:
+        logger.error(f"Error analyzing survey: {e}", exc_info=True)
+        raise HTTPException(status_code=500, detail=str(e))
+
+    payload["session_id"] = response.session_id
+    if DEFER_PERSIST and not wait:
+        background_tasks.add_task(persist_submission, data)
+        payload["record_id"] = None
+        return payload
+
+    try:
+        payload["record_id"] = await async_db.save_response(data)
+    except WriteBehindQueueFull as e:
+        logger.warning(f"Submission rejected: {e}")
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": "5"})
     except Exception as e:
         logger.error(f"Submission error: {e}", exc_info=True)
         raise HTTPException(status_code=500, detail=str(e))
+    return payload
 
 @app.get("/api/questions")
-async def get_questions():
+async def get_questions(request: Request):
     try:
-        questions = load_questions()
-        return questions
+        return content_store.snapshot().questions_asset.response(request)
     except Exception as e:
         logger.error(f"Error getting questions: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.post("/api/analyze")
 async def analyze_survey(responses: dict):
+    try:
+        return build_analysis(responses)
+    except Exception as e:
+        logger.error(f"Error analyzing survey: {e}", exc_info=True)
+        raise HTTPException(status_code=500, detail=str(e))
+
+@app.post("/api/analyze/batch")
+def analyze_survey_batch(request: BatchAnalyzeRequest):
+    """Score and classify many response sets in one call (runs in the threadpool)"""
     try:
         questions_data = load_questions()["questions"]
         templates = load_templates()
-        
-        total_scores = calculate_perspective_scores(responses, questions_data)
-        analysis = PerspectiveAnalyzer.get_perspective_summary(total_scores)
-        description = PerspectiveAnalyzer.get_perspective_description(analysis)
-        category_responses = get_category_responses(analysis, templates)
-        
-        return {
+        batch = score_responses(request.responses, questions_data)
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    except Exception as e:
+        logger.error(f"Error analyzing survey batch: {e}", exc_info=True)
+        raise HTTPException(status_code=500, detail=str(e))
+
+    category_cache = {}
+    results = []
+    for i in range(len(batch)):
+        analysis = batch.analysis(i)
+        if analysis is None:
+            results.append({"status": "error", "detail": "No questions answered"})
+            continue
+        perspective_type = PerspectiveAnalyzer.get_perspective_type(analysis)
+        if perspective_type not in category_cache:
+            category_cache[perspective_type] = get_category_responses(analysis, templates)
+        results.append({
             "status": "success",
-            "perspective": description,
-            "scores": total_scores,
+            "perspective": PerspectiveAnalyzer.get_perspective_description(analysis),
+            "scores": analysis["scores"],
             "analysis": analysis,
-            "category_responses": category_responses
-        }
+            "category_responses": category_cache[perspective_type]
+        })
+
+    return {"status": "success", "count": len(results), "results": results}
+
+@app.post("/api/similar")
+def similar_respondents(responses: dict, k: int = Query(10, ge=1, le=100)):
+    """The k prior respondents closest in score space, with their answer profile"""
+    questions_data = load_questions()["questions"]
+    scores = calculate_perspective_scores(responses, questions_data)
+    if not any(scores):
+        raise HTTPException(status_code=422, detail="No questions answered")
+    try:
+        answers = [responses.get(field) for field in ANSWER_FIELDS]
+        return {"status": "success", "scores": scores,
+                **similarity_index.neighbours(scores, answers, k)}
     except Exception as e:
-        logger.error(f"Error analyzing survey: {e}", exc_info=True)
+        logger.error(f"Error finding similar respondents: {e}", exc_info=True)
         raise HTTPException(status_code=500, detail=str(e))
 
 # Helper functions
+def prepare_submission(response: SurveyResponse) -> dict:
+    data = response.dict()
+    for key in data:
+        if isinstance(data[key], Decimal):
+            data[key] = float(data[key])
+    return data
+
+async def persist_submission(data: dict):
+    """Background insert for /api/submit-and-analyze; failures are logged, not raised"""
+    try:
+        await async_db.save_response(data)
+    except Exception as e:
+        logger.error(f"Deferred save failed for session {data.get('session_id')}: {e}", exc_info=True)
+
+def build_analysis(responses: dict) -> dict:
+    payload = lookup_analysis(responses)
+    if payload is None:
+        payload = compute_analysis(responses)
+    payload["percentiles"] = percentile_ranker.rank(payload["scores"])
+    return payload
+
+def compute_analysis(responses: dict) -> dict:
+    questions_data = load_questions()["questions"]
+    templates = load_templates()
+    
+    total_scores = calculate_perspective_scores(responses, questions_data)
+    analysis = PerspectiveAnalyzer.get_perspective_summary(total_scores)
+    description = PerspectiveAnalyzer.get_perspective_description(analysis)
+    category_responses = get_category_responses(analysis, templates)
+    
+    return {
+        "status": "success",
+        "perspective": description,
+        "scores": total_scores,
+        "analysis": analysis,
+        "category_responses": category_responses
+    }
+
+def lookup_analysis(responses: dict):
+    """Precomputed /api/analyze payload, or None when the request needs the full path.
+
+    Never builds the table on the event loop: until the warm-up (or the
+    background build started here) has finished, requests are scored directly.
+    """
+    try:
+        table = answer_table_if_ready()
+        return table.lookup(responses) if table is not None else None
+    except Exception as e:
+        logger.error(f"Answer table unavailable, computing analysis directly: {e}")
+        return None
+
 def load_questions():
-    path = BASE_DIR / "src" / "data" / "questions_responses.json"
-    with open(path) as f:
-        data = json.load(f)
-        if "questions" not in data:
-            raise ValueError("Invalid questions data format")
-        return data
+    return content_store.snapshot().questions_data
 
 def load_templates():
-    path = BASE_DIR / "src" / "data" / "response_templates.json"
-    with open(path) as f:
-        data = json.load(f)
-        if "categories" not in data:
-            raise ValueError("Invalid templates data format")
-        return data["categories"]
+    return content_store.snapshot().templates
 
 def calculate_perspective_scores(responses: dict, questions_data: dict) -> list:
     total_scores = [0, 0, 0]  # [PreModern, Modern, PostModern]
@@ -162,21 +435,11 @@ def calculate_perspective_scores(responses: dict, questions_data: dict) -> list:
                     scores = question["responses"][response_idx]["scores"]
                     total_scores = [a + b for a, b in zip(total_scores, scores)]
     
-    total = sum(total_scores)
-    if total > 0:
-        normalized_scores = [round((score / total) * 100, 1) for score in total_scores]
-        adjustment = 100 - sum(normalized_scores)
-        normalized_scores[-1] += adjustment
-        return normalized_scores
-    return [0, 0, 0]
+    return normalize_scores(total_scores)
 
 def get_category_responses(analysis: dict, templates: dict) -> dict:
-    perspective_type = analysis['primary']
-    if analysis['strength'] != 'Strong' and analysis['secondary']:
-        perspective_type = f"{analysis['primary']}-{analysis['secondary']}"
-    elif analysis['strength'] == 'Mixed':
-        perspective_type = 'Modern-Balanced'
-        
+    perspective_type = PerspectiveAnalyzer.get_perspective_type(analysis)
+
     category_responses = {}
     for category in templates:
         if perspective_type in templates[category]:
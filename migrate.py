@@ -0,0 +1,131 @@
+# migrate.py
+"""
+Versioned schema migrations for the survey database.
+
+Migrations are the numbered files in migrations/ (0001_name.sql, ...),
+applied in order and recorded with a checksum in schema_migrations.
+Files under migrations/optional/ are only applied when named with
+--optional. MySQL commits DDL implicitly, so each migration is recorded
+only after all of its statements succeed; a failed migration must be
+fixed and re-run by hand from the failing statement.
+
+    python migrate.py status
+    python migrate.py up [--optional NAME] [--dry-run]
+"""
+from pathlib import Path
+from typing import Dict, List
+import argparse
+import hashlib
+import logging
+import re
+
+logger = logging.getLogger(__name__)
+
+MIGRATIONS_DIR = Path(__file__).resolve().parent / "migrations"
+MIGRATION_NAME = re.compile(r"^(\d{4})_\w+\.sql$")
+
+CREATE_HISTORY = """CREATE TABLE IF NOT EXISTS schema_migrations (
+    version VARCHAR(255) PRIMARY KEY,
+    checksum CHAR(64) NOT NULL,
+    applied_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP
+)"""
+
+
+class Migration:
+    def __init__(self, path: Path):
+        self.path = path
+        self.version = path.stem if path.parent == MIGRATIONS_DIR else f"optional/{path.stem}"
+        self.sql = path.read_text()
+        self.checksum = hashlib.sha256(self.sql.encode()).hexdigest()
+
+    def statements(self) -> List[str]:
+        """Split on semicolons that end a line, ignoring -- comment lines"""
+        lines = [line for line in self.sql.splitlines() if not line.strip().startswith("--")]
+        return [s.strip() for s in re.split(r";\s*$", "\n".join(lines), flags=re.M) if s.strip()]
+
+
+def discover(optional: List[str] = ()) -> List[Migration]:
+    migrations = [Migration(p) for p in sorted(MIGRATIONS_DIR.glob("*.sql"))
+                  if MIGRATION_NAME.match(p.name)]
+    for name in optional:
+        path = MIGRATIONS_DIR / "optional" / f"{name}.sql"
+        if not path.exists():
+            raise FileNotFoundError(f"No optional migration named {name}")
+        migrations.append(Migration(path))
+    return migrations
+
+
+def applied_versions(cursor) -> Dict[str, str]:
+    cursor.execute(CREATE_HISTORY)
+    cursor.execute("SELECT version, checksum FROM schema_migrations")
+    return dict(cursor.fetchall())
+
+
+def migrate(db_manager, optional: List[str] = (), dry_run: bool = False) -> List[str]:
+    """Apply pending migrations in order and return their versions"""
+    applied = []
+    with db_manager.get_connection() as connection:
+        cursor = connection.cursor()
+        history = applied_versions(cursor)
+        for migration in discover(optional):
+            if migration.version in history:
+                if history[migration.version] != migration.checksum:
+                    logger.warning(f"Migration {migration.version} changed after it was applied")
+                continue
+            logger.info(f"Applying {migration.version}" + (" (dry run)" if dry_run else ""))
+            for statement in migration.statements():
+                if dry_run:
+                    print(f"{statement};\n")
+                    continue
+                cursor.execute(statement)
+            if not dry_run:
+                cursor.execute(
+                    "INSERT INTO schema_migrations (version, checksum) VALUES (%s, %s)",
+                    (migration.version, migration.checksum)
+                )
+                connection.commit()
+            applied.append(migration.version)
+        cursor.close()
+    return applied
+
+
+def status(db_manager) -> List[Dict]:
+    with db_manager.get_connection() as connection:
+        cursor = connection.cursor()
+        history = applied_versions(cursor)
+        cursor.close()
+    rows = []
+    for migration in discover():
+        state = "pending"
+        if migration.version in history:
+            state = "applied" if history[migration.version] == migration.checksum else "changed"
+        rows.append({"version": migration.version, "state": state})
+    rows.extend({"version": v, "state": "applied"} for v in history
+                if v.startswith("optional/") and v not in {r["version"] for r in rows})
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Apply survey database migrations")
+    parser.add_argument("command", choices=["status", "up"])
+    parser.add_argument("--optional", action="append", default=[],
+                        help="Also apply migrations/optional/<name>.sql")
+    parser.add_argument("--dry-run", action="store_true", help="Print the SQL instead of running it")
+    args = parser.parse_args()
+
+    from dotenv import load_dotenv
+    from db_manager import DatabaseManager
+    load_dotenv()
+    db_manager = DatabaseManager(pool_size=1, spool=False)
+
+    if args.command == "status":
+        for row in status(db_manager):
+            print(f"{row['state']:>8}  {row['version']}")
+    else:
+        applied = migrate(db_manager, args.optional, args.dry_run)
+        print(f"Applied {len(applied)} migration(s)" if applied else "Database is up to date")
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    main()
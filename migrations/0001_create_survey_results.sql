@@ -0,0 +1,22 @@
+-- Baseline: survey_results as the application has been writing it.
+-- A no-op on databases where the table already exists.
+CREATE TABLE IF NOT EXISTS survey_results (
+    id INT AUTO_INCREMENT PRIMARY KEY,
+    session_id VARCHAR(255) NOT NULL,
+    q1_response INT,
+    q2_response INT,
+    q3_response INT,
+    q4_response INT,
+    q5_response INT,
+    q6_response INT,
+    n1 FLOAT,
+    n2 FLOAT,
+    n3 FLOAT,
+    plot_x FLOAT,
+    plot_y FLOAT,
+    browser VARCHAR(255),
+    region VARCHAR(255),
+    source VARCHAR(255) DEFAULT 'web',
+    hash_email_session VARCHAR(255),
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
@@ -0,0 +1,25 @@
+-- Compact column types and secondary indexes for the dashboard, export and
+-- lookup queries. Answers are 1-6, n1-n3 are whole percentages (0-600 for
+-- legacy rows) and plot coordinates carry two decimals.
+ALTER TABLE survey_results
+    MODIFY session_id VARCHAR(64) NOT NULL,
+    MODIFY q1_response TINYINT UNSIGNED NULL,
+    MODIFY q2_response TINYINT UNSIGNED NULL,
+    MODIFY q3_response TINYINT UNSIGNED NULL,
+    MODIFY q4_response TINYINT UNSIGNED NULL,
+    MODIFY q5_response TINYINT UNSIGNED NULL,
+    MODIFY q6_response TINYINT UNSIGNED NULL,
+    MODIFY n1 SMALLINT UNSIGNED NULL,
+    MODIFY n2 SMALLINT UNSIGNED NULL,
+    MODIFY n3 SMALLINT UNSIGNED NULL,
+    MODIFY plot_x DECIMAL(6,2) NULL,
+    MODIFY plot_y DECIMAL(6,2) NULL,
+    MODIFY region VARCHAR(100) NULL,
+    MODIFY source VARCHAR(50) NULL DEFAULT 'web',
+    MODIFY hash_email_session VARCHAR(128) NULL,
+    MODIFY created_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP;
+
+CREATE INDEX idx_survey_results_session_id ON survey_results (session_id);
+CREATE INDEX idx_survey_results_created_at ON survey_results (created_at);
+CREATE INDEX idx_survey_results_source_created ON survey_results (source, created_at);
+CREATE INDEX idx_survey_results_region_created ON survey_results (region, created_at);
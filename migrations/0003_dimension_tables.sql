@@ -0,0 +1,30 @@
+-- Dictionary-encoded browser, region and source. New rows store only the
+-- *_id keys (with DB_DIMENSIONS=true); older rows keep their text until
+-- `python -m src.data.dimensions backfill` converts them.
+CREATE TABLE IF NOT EXISTS dim_browser (
+    id MEDIUMINT UNSIGNED AUTO_INCREMENT PRIMARY KEY,
+    family VARCHAR(32) NOT NULL,
+    major VARCHAR(16) NOT NULL,
+    os VARCHAR(32) NOT NULL,
+    label VARCHAR(96) NOT NULL,
+    UNIQUE KEY uq_dim_browser (family, major, os)
+);
+
+CREATE TABLE IF NOT EXISTS dim_region (
+    id MEDIUMINT UNSIGNED AUTO_INCREMENT PRIMARY KEY,
+    name VARCHAR(100) NOT NULL,
+    UNIQUE KEY uq_dim_region (name)
+);
+
+CREATE TABLE IF NOT EXISTS dim_source (
+    id MEDIUMINT UNSIGNED AUTO_INCREMENT PRIMARY KEY,
+    name VARCHAR(50) NOT NULL,
+    UNIQUE KEY uq_dim_source (name)
+);
+
+ALTER TABLE survey_results
+    ADD COLUMN browser_id MEDIUMINT UNSIGNED NULL AFTER browser,
+    ADD COLUMN region_id MEDIUMINT UNSIGNED NULL AFTER region,
+    ADD COLUMN source_id MEDIUMINT UNSIGNED NULL AFTER source,
+    ADD INDEX idx_survey_results_region_id_created (region_id, created_at),
+    ADD INDEX idx_survey_results_source_id_created (source_id, created_at);
@@ -0,0 +1,9 @@
+-- Idempotent submissions: one row per session_id. Rows duplicated by earlier
+-- retries and double submits are removed first, keeping the earliest.
+DELETE duplicate FROM survey_results duplicate
+    JOIN survey_results original
+        ON original.session_id = duplicate.session_id AND original.id < duplicate.id;
+
+ALTER TABLE survey_results
+    DROP INDEX idx_survey_results_session_id,
+    ADD UNIQUE KEY uq_survey_results_session_id (session_id);
@@ -0,0 +1,9 @@
+-- Optional, once the dimension backfill has finished and nothing reads the
+-- raw text any more: drop the original browser/region/source columns and
+-- their indexes to reclaim the space.
+ALTER TABLE survey_results
+    DROP INDEX idx_survey_results_source_created,
+    DROP INDEX idx_survey_results_region_created,
+    DROP COLUMN browser,
+    DROP COLUMN region,
+    DROP COLUMN source;
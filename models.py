@@ -1,10 +1,14 @@
-from pydantic import BaseModel, Field, validator
-from typing import Optional
+from pydantic import BaseModel, Field, field_validator, validator
+from typing import Optional, List
 from decimal import Decimal
 import uuid
 
+# Free-text columns: longer values are truncated rather than rejected (schema.sql)
+TEXT_COLUMN_LENGTHS = {"browser": 255, "region": 100, "source": 50}
+
 class SurveyResponse(BaseModel):
-    session_id: Optional[str] = Field(default_factory=lambda: str(uuid.uuid4()))
+    # Identifiers and coordinates are limited to their survey_results columns
+    session_id: Optional[str] = Field(default_factory=lambda: str(uuid.uuid4()), max_length=64)
     q1_response: Optional[int] = Field(None, ge=1, le=6)
     q2_response: Optional[int] = Field(None, ge=1, le=6)
     q3_response: Optional[int] = Field(None, ge=1, le=6)
@@ -14,12 +18,17 @@ class SurveyResponse(BaseModel):
     n1: Optional[int] = Field(None, ge=0, le=600)
     n2: Optional[int] = Field(None, ge=0, le=600)
     n3: Optional[int] = Field(None, ge=0, le=600)
-    plot_x: Optional[Decimal] = Field(None, decimal_places=2)
-    plot_y: Optional[Decimal] = Field(None, decimal_places=2)
+    plot_x: Optional[Decimal] = Field(None, max_digits=6, decimal_places=2)
+    plot_y: Optional[Decimal] = Field(None, max_digits=6, decimal_places=2)
     browser: Optional[str] = None
     region: Optional[str] = None
     source: str = "local"
-    hash_email_session: Optional[str] = None
+    hash_email_session: Optional[str] = Field(None, max_length=128)
+
+    @field_validator("browser", "region", "source")
+    @classmethod
+    def truncate_text(cls, value: Optional[str], info) -> Optional[str]:
+        return value[:TEXT_COLUMN_LENGTHS[info.field_name]] if value else value
 
     class Config:
         json_schema_extra = {
@@ -48,4 +57,17 @@ class QuestionResponse(BaseModel):
 
 class Question(BaseModel):
     text: str
-    responses: list[QuestionResponse]
\ No newline at end of file
+    responses: list[QuestionResponse]
+
+class BatchAnalyzeRequest(BaseModel):
+    responses: List[dict] = Field(..., max_length=10000)
+
+    class Config:
+        json_schema_extra = {
+            "example": {
+                "responses": [
+                    {"q1_response": 1, "q2_response": 2, "q3_response": 3,
+                     "q4_response": 4, "q5_response": 5, "q6_response": 1}
+                ]
+            }
+        }
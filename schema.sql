@@ -1,18 +1,53 @@
-CREATE TABLE IF NOT EXISTS survey_responses (
+-- Canonical survey_results schema (the result of applying migrations/).
+-- Change it through a new migration and `python migrate.py up`, then update
+-- this file to match.
+CREATE TABLE IF NOT EXISTS survey_results (
     id INT AUTO_INCREMENT PRIMARY KEY,
-    session_id VARCHAR(255) NOT NULL,
-    source VARCHAR(50) DEFAULT 'web',
+    session_id VARCHAR(64) NOT NULL,
+    q1_response TINYINT UNSIGNED,
+    q2_response TINYINT UNSIGNED,
+    q3_response TINYINT UNSIGNED,
+    q4_response TINYINT UNSIGNED,
+    q5_response TINYINT UNSIGNED,
+    q6_response TINYINT UNSIGNED,
+    n1 SMALLINT UNSIGNED,
+    n2 SMALLINT UNSIGNED,
+    n3 SMALLINT UNSIGNED,
+    plot_x DECIMAL(6,2),
+    plot_y DECIMAL(6,2),
     browser VARCHAR(255),
-    q1_response INT,
-    q2_response INT,
-    q3_response INT,
-    q4_response INT,
-    q5_response INT,
-    q6_response INT,
-    n1 FLOAT,
-    n2 FLOAT,
-    n3 FLOAT,
-    plot_x FLOAT,
-    plot_y FLOAT,
-    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-);
\ No newline at end of file
+    browser_id MEDIUMINT UNSIGNED,
+    region VARCHAR(100),
+    region_id MEDIUMINT UNSIGNED,
+    source VARCHAR(50) DEFAULT 'web',
+    source_id MEDIUMINT UNSIGNED,
+    hash_email_session VARCHAR(128),
+    created_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    UNIQUE KEY uq_survey_results_session_id (session_id),
+    INDEX idx_survey_results_created_at (created_at),
+    INDEX idx_survey_results_source_created (source, created_at),
+    INDEX idx_survey_results_region_created (region, created_at),
+    INDEX idx_survey_results_region_id_created (region_id, created_at),
+    INDEX idx_survey_results_source_id_created (source_id, created_at)
+);
+
+CREATE TABLE IF NOT EXISTS dim_browser (
+    id MEDIUMINT UNSIGNED AUTO_INCREMENT PRIMARY KEY,
+    family VARCHAR(32) NOT NULL,
+    major VARCHAR(16) NOT NULL,
+    os VARCHAR(32) NOT NULL,
+    label VARCHAR(96) NOT NULL,
+    UNIQUE KEY uq_dim_browser (family, major, os)
+);
+
+CREATE TABLE IF NOT EXISTS dim_region (
+    id MEDIUMINT UNSIGNED AUTO_INCREMENT PRIMARY KEY,
+    name VARCHAR(100) NOT NULL,
+    UNIQUE KEY uq_dim_region (name)
+);
+
+CREATE TABLE IF NOT EXISTS dim_source (
+    id MEDIUMINT UNSIGNED AUTO_INCREMENT PRIMARY KEY,
+    name VARCHAR(50) NOT NULL,
+    UNIQUE KEY uq_dim_source (name)
+);
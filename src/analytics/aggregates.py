@@ -0,0 +1,165 @@
+# src/analytics/aggregates.py
+
+from typing import Dict, Iterable, List, Optional
+import asyncio
+import json
+import logging
+import os
+import threading
+import time
+
+import numpy as np
+
+from src.api.http_cache import PrecompressedAsset
+
+logger = logging.getLogger(__name__)
+
+# Range of plot_x / plot_y produced by the survey front end
+PLOT_X_RANGE = (0, 750)
+PLOT_Y_RANGE = (325, 650)
+
+
+class PopulationAggregates:
+    """
+    In-memory population histograms for the results dashboards.
+
+    Keeps a binned ternary histogram of (n1, n2, n3), one histogram per
+    perspective axis and a 2D grid of (plot_x, plot_y) counts. observe()
+    applies newly saved rows in O(1) each; reconcile() periodically rebuilds
+    everything from GROUP BY queries so drift (missed rows, other writers)
+    is corrected. The JSON payload is built once per change and served with
+    an ETag, so a page view costs O(bins) at most and usually nothing.
+    """
+
+    def __init__(self, bins: int = 10, plot_cell: int = 25):
+        self.bins = bins
+        self.plot_cell = plot_cell
+        self._grid_shape = (
+            -(-(PLOT_X_RANGE[1] - PLOT_X_RANGE[0] + 1) // plot_cell),
+            -(-(PLOT_Y_RANGE[1] - PLOT_Y_RANGE[0] + 1) // plot_cell),
+        )
+        self._lock = threading.Lock()
+        self._reset()
+        self.version = 0
+        self.reconciled_at = None
+        self._asset = None
+        self._asset_version = -1
+
+    def _reset(self):
+        self.total = 0
+        self.ternary = np.zeros((self.bins, self.bins), dtype=np.int64)
+        self.axes = np.zeros((3, self.bins), dtype=np.int64)
+        self.plot_grid = np.zeros(self._grid_shape, dtype=np.int64)
+
+    def _bin(self, value: float) -> int:
+        return min(max(int(value * self.bins / 100), 0), self.bins - 1)
+
+    def _plot_cell(self, x: float, y: float):
+        cx = int((x - PLOT_X_RANGE[0]) // self.plot_cell)
+        cy = int((y - PLOT_Y_RANGE[0]) // self.plot_cell)
+        if 0 <= cx < self._grid_shape[0] and 0 <= cy < self._grid_shape[1]:
+            return cx, cy
+        return None
+
+    def _add(self, n: List[Optional[float]], plot_x, plot_y, count: int = 1):
+        self.total += count
+        if None not in n:
+            bins = [self._bin(float(v)) for v in n]
+            self.ternary[bins[0], bins[1]] += count
+            for axis, b in enumerate(bins):
+                self.axes[axis, b] += count
+        if plot_x is not None and plot_y is not None:
+            cell = self._plot_cell(float(plot_x), float(plot_y))
+            if cell:
+                self.plot_grid[cell] += count
+
+    def observe(self, rows: Iterable[Dict]):
+        """Apply rows that were just saved to survey_results"""
+        with self._lock:
+            for row in rows:
+                self._add([row.get('n1'), row.get('n2'), row.get('n3')],
+                          row.get('plot_x'), row.get('plot_y'))
+            self.version += 1
+
+    def reconcile(self, db_manager):
+        """Rebuild all counts from the database (O(distinct values), not O(rows))"""
+        start = time.perf_counter()
+        with db_manager.get_read_connection() as connection:
+            cursor = connection.cursor()
+            cursor.execute("SELECT COUNT(*) FROM survey_results")
+            total = cursor.fetchone()[0]
+            cursor.execute(
+                "SELECT n1, n2, n3, COUNT(*) FROM survey_results "
+                "WHERE n1 IS NOT NULL AND n2 IS NOT NULL AND n3 IS NOT NULL "
+                "GROUP BY n1, n2, n3"
+            )
+            score_groups = cursor.fetchall()
+            cursor.execute(
+                "SELECT plot_x, plot_y, COUNT(*) FROM survey_results "
+                "WHERE plot_x IS NOT NULL AND plot_y IS NOT NULL "
+                "GROUP BY plot_x, plot_y"
+            )
+            plot_groups = cursor.fetchall()
+            cursor.close()
+
+        with self._lock:
+            self._reset()
+            for n1, n2, n3, count in score_groups:
+                self._add([n1, n2, n3], None, None, count)
+            for plot_x, plot_y, count in plot_groups:
+                self._add([None], plot_x, plot_y, count)
+            # Rows counted above only for one of the groupings are included exactly once
+            self.total = total
+            self.version += 1
+            self.reconciled_at = time.time()
+        logger.info(f"Reconciled population aggregates over {total} rows "
+                    f"in {(time.perf_counter() - start) * 1000:.0f}ms")
+
+    async def reconcile_forever(self, run, db_manager, interval: float):
+        """Reconcile now and then every interval seconds; run offloads the blocking query"""
+        while True:
+            try:
+                await run(self.reconcile, db_manager)
+            except Exception as e:
+                logger.error(f"Population aggregate reconcile failed: {e}")
+            await asyncio.sleep(interval)
+
+    def payload(self) -> Dict:
+        return {
+            "total": self.total,
+            "version": self.version,
+            "reconciled_at": self.reconciled_at,
+            "ternary": {
+                "bins": self.bins,
+                "axes": ["PreModern", "Modern"],
+                "counts": self.ternary.tolist(),
+            },
+            "axes": {
+                "bins": self.bins,
+                "PreModern": self.axes[0].tolist(),
+                "Modern": self.axes[1].tolist(),
+                "PostModern": self.axes[2].tolist(),
+            },
+            "plot_grid": {
+                "x_range": list(PLOT_X_RANGE),
+                "y_range": list(PLOT_Y_RANGE),
+                "cell": self.plot_cell,
+                "counts": self.plot_grid.tolist(),
+            },
+        }
+
+    def asset(self) -> PrecompressedAsset:
+        """Serialized payload, rebuilt only when the counts have changed"""
+        with self._lock:
+            if self._asset_version != self.version:
+                body = json.dumps(self.payload(), separators=(",", ":")).encode()
+                self._asset = PrecompressedAsset(body, "application/json",
+                                                 cache_control="public, max-age=60")
+                self._asset_version = self.version
+            return self._asset
+
+
+population = PopulationAggregates(
+    bins=int(os.getenv('AGGREGATES_BINS', '10')),
+    plot_cell=int(os.getenv('AGGREGATES_PLOT_CELL', '25'))
+)
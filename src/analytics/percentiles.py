@@ -0,0 +1,119 @@
+# src/analytics/percentiles.py
+
+from typing import Dict, Iterable, List, Optional
+import logging
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+AXES = ["PreModern", "Modern", "PostModern"]
+COLUMNS = ["n1", "n2", "n3"]
+
+
+class FenwickTree:
+    """Binary indexed tree over integer bins: O(log n) add and prefix sum"""
+
+    def __init__(self, size: int):
+        self.size = size
+        self._tree = [0] * (size + 1)
+
+    @classmethod
+    def from_counts(cls, counts: List[int]) -> 'FenwickTree':
+        """Build in O(n) from per-bin counts"""
+        tree = cls(len(counts))
+        for i, count in enumerate(counts, start=1):
+            tree._tree[i] += count
+            parent = i + (i & -i)
+            if parent <= tree.size:
+                tree._tree[parent] += tree._tree[i]
+        return tree
+
+    def add(self, index: int, count: int = 1):
+        i = index + 1
+        while i <= self.size:
+            self._tree[i] += count
+            i += i & -i
+
+    def prefix(self, index: int) -> int:
+        """Sum of bins [0, index)"""
+        total, i = 0, min(index, self.size)
+        while i > 0:
+            total += self._tree[i]
+            i -= i & -i
+        return total
+
+
+class PercentileRanker:
+    """
+    Fixed-bin CDF per perspective axis for "more X than N% of respondents".
+
+    Scores are percentages, so each axis is a Fenwick tree over 0..100 in
+    resolution-sized bins (1001 bins at the default 0.1). Memory is fixed,
+    inserts and rank queries are O(log bins), and the ranks are exact at
+    that resolution. seed() loads the counts with one GROUP BY query and
+    observe() applies committed inserts.
+    """
+
+    def __init__(self, resolution: float = 0.1):
+        self.resolution = resolution
+        self.bins = int(round(100 / resolution)) + 1
+        self._lock = threading.Lock()
+        self._trees = [FenwickTree(self.bins) for _ in AXES]
+        self.total = 0
+        self.seeded_at = None
+
+    def _bin(self, value: float) -> int:
+        return min(max(int(round(float(value) / self.resolution)), 0), self.bins - 1)
+
+    def observe(self, rows: Iterable[Dict]):
+        """Apply rows that were just saved to survey_results"""
+        with self._lock:
+            for row in rows:
+                values = [row.get(column) for column in COLUMNS]
+                if None in values:
+                    continue
+                for tree, value in zip(self._trees, values):
+                    tree.add(self._bin(value))
+                self.total += 1
+
+    def seed(self, db_manager):
+        """Replace the counts with the current contents of survey_results"""
+        start = time.perf_counter()
+        with db_manager.get_read_connection() as connection:
+            cursor = connection.cursor()
+            cursor.execute(
+                "SELECT n1, n2, n3, COUNT(*) FROM survey_results "
+                "WHERE n1 IS NOT NULL AND n2 IS NOT NULL AND n3 IS NOT NULL "
+                "GROUP BY n1, n2, n3"
+            )
+            groups = cursor.fetchall()
+            cursor.close()
+
+        counts = [[0] * self.bins for _ in AXES]
+        total = 0
+        for *values, count in groups:
+            for axis, value in enumerate(values):
+                counts[axis][self._bin(value)] += count
+            total += count
+        with self._lock:
+            self._trees = [FenwickTree.from_counts(c) for c in counts]
+            self.total = total
+            self.seeded_at = time.time()
+        logger.info(f"Seeded percentile ranks from {total} rows "
+                    f"in {(time.perf_counter() - start) * 1000:.0f}ms")
+
+    def rank(self, scores: List[float]) -> Optional[Dict]:
+        """Percent of respondents scoring strictly lower on each axis"""
+        with self._lock:
+            if not self.total:
+                return None
+            ranks = {
+                axis: round(100 * tree.prefix(self._bin(score)) / self.total, 1)
+                for axis, tree, score in zip(AXES, self._trees, scores)
+            }
+            ranks["population"] = self.total
+            return ranks
+
+
+percentile_ranker = PercentileRanker()
@@ -0,0 +1,201 @@
+# src/analytics/similarity.py
+
+from typing import Dict, Iterable, List, Optional
+import logging
+import math
+import threading
+import time
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+SCORE_COLUMNS = ["n1", "n2", "n3"]
+ANSWER_COLUMNS = [f"q{i}_response" for i in range(1, 7)]
+
+
+class SimplexGridIndex:
+    """
+    k-nearest-neighbour index over [PreModern, Modern, PostModern] scores.
+
+    Scores lie on the 2-simplex, so points are bucketed on a square grid
+    over (PreModern, Modern) with cell_size-point cells. The bulk of the
+    rows live in a CSR layout (rows sorted by cell plus per-cell offsets);
+    new inserts go to a small delta buffer that every query scans and that
+    is merged into the CSR layout once it reaches merge_threshold rows.
+
+    A query scans rings of cells outwards from the query's cell and stops
+    once the k-th best distance is no larger than the nearest possible
+    point in the next ring. Distance is Euclidean in score space plus
+    answer_weight per differing raw answer, which only breaks ties between
+    respondents with (nearly) identical scores and keeps the ring bound valid.
+    """
+
+    def __init__(self, cell_size: float = 2.0, merge_threshold: int = 4096,
+                 answer_weight: float = 0.5):
+        self.cell_size = cell_size
+        self.grid = int(math.ceil(100 / cell_size))
+        self.merge_threshold = merge_threshold
+        self.answer_weight = answer_weight
+        self._lock = threading.Lock()
+        self._set_base(np.zeros((0, 3), dtype=np.float32), np.zeros((0, 6), dtype=np.int8))
+        self._delta_scores = []
+        self._delta_answers = []
+        self.loaded_at = None
+
+    def __len__(self) -> int:
+        return len(self._scores) + len(self._delta_scores)
+
+    def _cells(self, scores: np.ndarray) -> np.ndarray:
+        cells = np.clip((scores[:, :2] / self.cell_size).astype(np.int64), 0, self.grid - 1)
+        return cells[:, 0] * self.grid + cells[:, 1]
+
+    def _set_base(self, scores: np.ndarray, answers: np.ndarray):
+        """Sort rows by cell and rebuild the offsets (caller holds the lock or owns the index)"""
+        cells = self._cells(scores)
+        order = np.argsort(cells, kind="stable")
+        self._scores = scores[order]
+        self._answers = answers[order]
+        self._offsets = np.searchsorted(cells[order], np.arange(self.grid * self.grid + 1))
+
+    @staticmethod
+    def _row_arrays(rows: Iterable[Dict]):
+        scores, answers = [], []
+        for row in rows:
+            values = [row.get(column) for column in SCORE_COLUMNS]
+            if None in values:
+                continue
+            scores.append([float(v) for v in values])
+            answers.append([row.get(column) or 0 for column in ANSWER_COLUMNS])
+        return scores, answers
+
+    def observe(self, rows: Iterable[Dict]):
+        """Apply rows that were just saved to survey_results"""
+        scores, answers = self._row_arrays(rows)
+        with self._lock:
+            self._delta_scores.extend(scores)
+            self._delta_answers.extend(answers)
+            if len(self._delta_scores) >= self.merge_threshold:
+                self._merge()
+
+    def _merge(self):
+        self._set_base(
+            np.concatenate([self._scores, np.asarray(self._delta_scores, dtype=np.float32)]),
+            np.concatenate([self._answers, np.asarray(self._delta_answers, dtype=np.int8)])
+        )
+        self._delta_scores, self._delta_answers = [], []
+
+    def bulk_load(self, scores: np.ndarray, answers: np.ndarray):
+        """Replace the index contents with (N, 3) scores and (N, 6) answers"""
+        scores = np.asarray(scores, dtype=np.float32).reshape(-1, 3)
+        answers = np.nan_to_num(np.asarray(answers, dtype=np.float64)).astype(np.int8).reshape(-1, 6)
+        new = SimplexGridIndex(self.cell_size, self.merge_threshold, self.answer_weight)
+        new._set_base(scores, answers)
+        with self._lock:
+            self._scores, self._answers, self._offsets = new._scores, new._answers, new._offsets
+            self._delta_scores, self._delta_answers = [], []
+            self.loaded_at = time.time()
+
+    def load(self, db_manager, fetch_size: int = 10000):
+        """Rebuild from survey_results, streaming rows with fetchmany"""
+        start = time.perf_counter()
+        columns = SCORE_COLUMNS + ANSWER_COLUMNS
+        chunks = []
+        with db_manager.get_read_connection() as connection:
+            cursor = connection.cursor()
+            cursor.execute(
+                f"SELECT {', '.join(columns)} FROM survey_results "
+                "WHERE n1 IS NOT NULL AND n2 IS NOT NULL AND n3 IS NOT NULL"
+            )
+            while True:
+                rows = cursor.fetchmany(fetch_size)
+                if not rows:
+                    break
+                chunks.append(np.array(rows, dtype=np.float64))
+            cursor.close()
+        data = np.concatenate(chunks) if chunks else np.zeros((0, len(columns)))
+        self.bulk_load(data[:, :3], data[:, 3:])
+        logger.info(f"Loaded similarity index with {len(data)} rows "
+                    f"in {(time.perf_counter() - start) * 1000:.0f}ms")
+
+    def _distances(self, query: np.ndarray, answers: np.ndarray, scores: np.ndarray,
+                   row_answers: np.ndarray) -> np.ndarray:
+        distance = np.sqrt(((scores - query) ** 2).sum(axis=1))
+        if self.answer_weight and len(answers):
+            distance += self.answer_weight * (row_answers != answers).sum(axis=1)
+        return distance
+
+    def query(self, scores: List[float], answers: Optional[List[int]] = None, k: int = 10):
+        """Return (scores, answers, distances) of the k nearest rows, nearest first"""
+        query = np.asarray(scores, dtype=np.float32)
+        query_answers = np.asarray([a or 0 for a in answers] if answers else [], dtype=np.int8)
+        qx, qy = (int(c) for c in np.clip(query[:2] // self.cell_size, 0, self.grid - 1))
+
+        with self._lock:
+            found_scores = [np.asarray(self._delta_scores, dtype=np.float32).reshape(-1, 3)]
+            found_answers = [np.asarray(self._delta_answers, dtype=np.int8).reshape(-1, 6)]
+            base_scores, base_answers, offsets = self._scores, self._answers, self._offsets
+        found_distances = [self._distances(query, query_answers, found_scores[0], found_answers[0])]
+
+        for ring in range(self.grid):
+            slices = []
+            for x in range(max(qx - ring, 0), min(qx + ring, self.grid - 1) + 1):
+                on_edge = abs(x - qx) == ring
+                for y in range(max(qy - ring, 0), min(qy + ring, self.grid - 1) + 1):
+                    if on_edge or abs(y - qy) == ring:
+                        cell = x * self.grid + y
+                        if offsets[cell] < offsets[cell + 1]:
+                            slices.append(slice(offsets[cell], offsets[cell + 1]))
+            if slices:
+                ring_scores = np.concatenate([base_scores[s] for s in slices])
+                ring_answers = np.concatenate([base_answers[s] for s in slices])
+                found_scores.append(ring_scores)
+                found_answers.append(ring_answers)
+                found_distances.append(
+                    self._distances(query, query_answers, ring_scores, ring_answers))
+
+            # Keep only the current best k so later rings compare against a small set
+            distances = np.concatenate(found_distances)
+            if len(distances) > k:
+                best = np.argpartition(distances, k - 1)[:k]
+                found_scores = [np.concatenate(found_scores)[best]]
+                found_answers = [np.concatenate(found_answers)[best]]
+                found_distances = [distances[best]]
+                distances = found_distances[0]
+            # Any point in ring + 1 is at least ring * cell_size away
+            if len(distances) >= k and distances.max() <= ring * self.cell_size:
+                break
+
+        distances = np.concatenate(found_distances)
+        order = np.argsort(distances, kind="stable")[:k]
+        return (np.concatenate(found_scores)[order], np.concatenate(found_answers)[order],
+                distances[order])
+
+    def neighbours(self, scores: List[float], answers: Optional[List[int]] = None,
+                   k: int = 10) -> Dict:
+        """k most similar respondents and their aggregate answer profile"""
+        found_scores, found_answers, distances = self.query(scores, answers, k)
+        profile = {}
+        for i, column in enumerate(ANSWER_COLUMNS):
+            values, counts = np.unique(found_answers[:, i], return_counts=True)
+            profile[column] = {str(int(v)): int(c) for v, c in zip(values, counts) if v}
+        mean_scores = found_scores.mean(axis=0) if len(distances) else None
+        return {
+            "population": len(self),
+            "count": len(distances),
+            "neighbours": [
+                {
+                    "scores": [round(float(s), 1) for s in row_scores],
+                    "answers": {c: (int(a) or None) for c, a in zip(ANSWER_COLUMNS, row_answers)},
+                    "distance": round(float(d), 2),
+                }
+                for row_scores, row_answers, d in zip(found_scores, found_answers, distances)
+            ],
+            "profile": {
+                "mean_scores": None if mean_scores is None else [round(float(s), 1) for s in mean_scores],
+                "answers": profile,
+            },
+        }
+
+
+similarity_index = SimplexGridIndex()
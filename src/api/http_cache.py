@@ -0,0 +1,84 @@
+# src/api/http_cache.py
+
+from typing import Optional
+import gzip
+import hashlib
+
+from fastapi import Request
+from fastapi.responses import Response
+
+
+def brotli_compress(body: bytes) -> Optional[bytes]:
+    """Brotli at maximum quality, or None when the optional brotli package is missing"""
+    try:
+        import brotli
+    except ImportError:
+        return None
+    return brotli.compress(body, quality=11)
+
+
+class PrecompressedAsset:
+    """
+    An immutable response body held in memory with pre-built encodings.
+
+    Each encoding gets its own strong ETag, derived from a hash of the
+    identity bytes, so conditional requests can be answered with a 304
+    without touching the body at all.
+    """
+
+    def __init__(self, body: bytes, media_type: str, cache_control: str = "no-cache",
+                 compress: bool = True):
+        self.media_type = media_type
+        self.cache_control = cache_control
+        self.digest = hashlib.sha256(body).hexdigest()[:32]
+        self.etag = f'"{self.digest}"'
+        self.encodings = {"identity": body}
+        self._etags = {"identity": self.etag}
+        if compress:
+            self.add_encoding("gzip", gzip.compress(body, compresslevel=9, mtime=0))
+
+    def add_encoding(self, name: str, body: bytes):
+        """Register an extra pre-compressed variant (e.g. brotli)"""
+        self.encodings[name] = body
+        self._etags[name] = f'"{self.digest}-{name}"'
+
+    def add_brotli(self) -> bool:
+        """Add a "br" variant when brotli is installed; returns whether it was added"""
+        body = brotli_compress(self.encodings["identity"])
+        if body is not None:
+            self.add_encoding("br", body)
+        return body is not None
+
+    def choose_encoding(self, accept_encoding: str) -> str:
+        accepted = set()
+        for part in accept_encoding.split(","):
+            name, _, params = part.partition(";")
+            name = name.strip().lower()
+            if name and params.replace(" ", "") not in ("q=0", "q=0.0", "q=0.00", "q=0.000"):
+                accepted.add(name)
+        for name in ("br", "gzip"):
+            if name in self.encodings and name in accepted:
+                return name
+        return "identity"
+
+    def not_modified(self, if_none_match: Optional[str]) -> bool:
+        if not if_none_match:
+            return False
+        if if_none_match.strip() == "*":
+            return True
+        candidates = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+        return bool(candidates & set(self._etags.values()))
+
+    def response(self, request: Request, cache_control: Optional[str] = None) -> Response:
+        """Serve the best encoding, or 304 if the client already has this version"""
+        encoding = self.choose_encoding(request.headers.get("accept-encoding", ""))
+        headers = {
+            "ETag": self._etags[encoding],
+            "Cache-Control": cache_control or self.cache_control,
+            "Vary": "Accept-Encoding",
+        }
+        if self.not_modified(request.headers.get("if-none-match")):
+            return Response(status_code=304, headers=headers)
+        if encoding != "identity":
+            headers["Content-Encoding"] = encoding
+        return Response(content=self.encodings[encoding], media_type=self.media_type, headers=headers)
@@ -0,0 +1,73 @@
+# src/api/routes/export_routes.py
+
+from datetime import datetime
+from typing import Optional
+import hmac
+import logging
+import os
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi.responses import StreamingResponse
+from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
+from src.data.export import FORMATS, ExportBusy, ExportLimiter, parquet_available
+
+router = APIRouter()
+logger = logging.getLogger(__name__)
+
+bearer = HTTPBearer(auto_error=False)
+export_limiter = ExportLimiter(max_concurrent=int(os.getenv('EXPORT_MAX_CONCURRENT', '1')))
+
+class ExportResponse(StreamingResponse):
+    """Streams an export and always frees its slot, even if the client leaves before the first chunk"""
+
+    async def __call__(self, scope, receive, send):
+        try:
+            await super().__call__(scope, receive, send)
+        finally:
+            self.export_stream.close()
+
+def require_export_token(credentials: HTTPAuthorizationCredentials = Depends(bearer)):
+    """Bearer token check against EXPORT_API_TOKEN; exports are disabled when it is unset"""
+    token = os.getenv('EXPORT_API_TOKEN')
+    if not token:
+        raise HTTPException(status_code=403, detail="Export is disabled")
+    if credentials is None or not hmac.compare_digest(credentials.credentials.encode(), token.encode()):
+        raise HTTPException(status_code=401, detail="Invalid export token",
+                            headers={"WWW-Authenticate": "Bearer"})
+
+@router.get("/export", dependencies=[Depends(require_export_token)])
+def export_survey_results(
+    request: Request,
+    format: str = Query("csv", pattern="^(csv|ndjson|parquet)$"),
+    after_id: Optional[int] = Query(None, ge=0, description="Resume after this id"),
+    until_id: Optional[int] = Query(None, ge=0),
+    created_from: Optional[datetime] = None,
+    created_to: Optional[datetime] = None,
+    limit: Optional[int] = Query(None, ge=1),
+    chunk_size: int = Query(5000, ge=100, le=50000)
+):
+    """Stream survey_results in id order; rows are never held in memory all at once"""
+    if format == "parquet" and not parquet_available():
+        raise HTTPException(status_code=501, detail="Parquet export requires pyarrow")
+    try:
+        stream = export_limiter.stream(
+            request.app.state.db_manager, format, chunk_size,
+            after_id=after_id, until_id=until_id,
+            created_from=created_from, created_to=created_to, limit=limit
+        )
+    except ExportBusy as e:
+        logger.warning(f"Export rejected: {e}")
+        raise HTTPException(status_code=429, detail=str(e), headers={"Retry-After": "30"})
+
+    media_type, extension = FORMATS[format]
+    try:
+        response = ExportResponse(
+            stream,
+            media_type=media_type,
+            headers={"Content-Disposition": f"attachment; filename=survey_results.{extension}"}
+        )
+    except Exception:
+        stream.close()
+        raise
+    response.export_stream = stream
+    return response
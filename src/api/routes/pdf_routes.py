@@ -1,14 +1,19 @@
 # src/api/routes/pdf_routes.py
 
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, Depends, HTTPException
 from fastapi.responses import Response
 from pydantic import BaseModel
-from typing import Dict, List
-import tempfile
+from typing import Dict, List, Tuple
+import asyncio
 import base64
-import os
 import logging
-from src.visualization.pdf_generator import ModernityPDFReport, generate_pdf_report
+import os
+import time
+from src.visualization.pdf_cache import make_cache_key, pdf_cache
+from src.visualization.pdf_worker import pdf_pool, PDFPoolSaturated, PDFRenderTimeout
+from src.visualization.pdf_jobs import PDFJobManager, PDFJobQueueFull
+from src.monitoring.metrics import pdf_cache_lookups, pdf_output_bytes, pdf_render_seconds
+from src.api.routes.stats_routes import require_metrics_token
 
 router = APIRouter()
 logger = logging.getLogger(__name__)
@@ -17,43 +22,128 @@ class PDFGenerationRequest(BaseModel):
     perspective: str
     scores: List[float]
     category_responses: Dict[str, str]
-    plot_image: str = None  # Base64 encoded plot image
+    plot_image: str = None  # Optional base64 encoded plot image; rendered server-side if omitted
 
-@router.post("/generate-pdf")
-async def generate_pdf_endpoint(request: PDFGenerationRequest):
-    """Handle PDF generation request"""
-    try:
-        plot_image_path = None
-        
-        # If plot image is provided, save it temporarily
-        if request.plot_image:
-            with tempfile.NamedTemporaryFile(delete=False, suffix='.png') as tmp:
-                plot_image_path = tmp.name
-                img_data = base64.b64decode(request.plot_image.split(',')[1])
-                tmp.write(img_data)
-
-        # Generate PDF using our updated generator function
-        pdf_bytes = generate_pdf_report(
+# Cache-key stand-in for the server-rendered plot, which is a function of the scores
+SERVER_PLOT = b"server-rendered-plot-v1"
+
+async def render_report(request: PDFGenerationRequest) -> Tuple[bytes, str]:
+    """Render (or fetch from cache) the PDF for a request; returns (bytes, cache status)"""
+    # The plot is drawn server-side from the scores unless the client uploads one
+    img_data = None
+    if request.plot_image:
+        img_data = base64.b64decode(request.plot_image.split(',')[1])
+
+    # Identical reports are served from the render cache without touching FPDF
+    cache_key = make_cache_key(
+        request.perspective, request.scores, request.category_responses,
+        img_data if img_data else SERVER_PLOT
+    )
+    pdf_bytes = pdf_cache.get(cache_key)
+    if pdf_bytes is not None:
+        pdf_cache_lookups.inc("hit")
+        return pdf_bytes, "HIT"
+    pdf_cache_lookups.inc("miss")
+
+    # Render in the worker pool so FPDF never blocks the event loop
+    with pdf_render_seconds.time():
+        pdf_bytes = await pdf_pool.render(
             perspective=request.perspective,
             scores=request.scores,
             category_responses=request.category_responses,
-            plot_image_path=plot_image_path
+            plot_image=img_data,
+            render_plot=img_data is None
         )
+    pdf_output_bytes.observe(len(pdf_bytes))
+    pdf_cache.put(cache_key, pdf_bytes)
+    return pdf_bytes, "MISS"
 
-        # Clean up temporary file if it was created
-        if plot_image_path and os.path.exists(plot_image_path):
-            try:
-                os.unlink(plot_image_path)
-            except Exception as e:
-                logger.error(f"Error cleaning up temporary file: {e}")
-
-        return Response(
-            content=pdf_bytes,
-            media_type="application/pdf",
-            headers={
-                "Content-Disposition": "attachment; filename=worldview_analysis.pdf"
-            }
-        )
+# How long a queued job waits for a free render worker before it fails
+PDF_JOB_MAX_WAIT = float(os.getenv('PDF_JOB_MAX_WAIT', '120'))
+
+async def render_job(request: PDFGenerationRequest) -> bytes:
+    """Job-queue renderer: waits up to PDF_JOB_MAX_WAIT for a free worker instead of failing at once"""
+    deadline = time.monotonic() + PDF_JOB_MAX_WAIT
+    while True:
+        try:
+            pdf_bytes, _ = await render_report(request)
+            return pdf_bytes
+        except PDFPoolSaturated:
+            if time.monotonic() >= deadline:
+                raise
+            await asyncio.sleep(0.5)
+
+pdf_jobs = PDFJobManager(
+    render_job,
+    workers=int(os.getenv('PDF_JOB_WORKERS', '2')),
+    max_queue=int(os.getenv('PDF_JOB_MAX_QUEUE', '100')),
+    ttl=float(os.getenv('PDF_JOB_TTL', '900')),
+    result_dir=os.getenv('PDF_JOB_DIR') or None
+)
+
+@router.post("/generate-pdf")
+async def generate_pdf_endpoint(request: PDFGenerationRequest):
+    """Handle PDF generation request"""
+    try:
+        pdf_bytes, cache_status = await render_report(request)
+        return pdf_response(pdf_bytes, cache_status=cache_status)
+    except PDFPoolSaturated as e:
+        logger.warning(f"PDF request rejected: {e}")
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": "2"})
+    except PDFRenderTimeout as e:
+        logger.error(f"PDF render timed out: {e}")
+        raise HTTPException(status_code=504, detail=str(e))
     except Exception as e:
         logger.error(f"Error generating PDF: {e}")
-        raise HTTPException(status_code=500, detail=str(e))
\ No newline at end of file
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.get("/generate-pdf/cache-stats", dependencies=[Depends(require_metrics_token)])
+async def pdf_cache_stats():
+    """Hit/miss/eviction counters for sizing the PDF render cache, worker pool and job queue"""
+    return {**pdf_cache.stats(), "workers": pdf_pool.stats(), "jobs": pdf_jobs.stats()}
+
+@router.post("/pdf-jobs", status_code=202)
+async def create_pdf_job(request: PDFGenerationRequest):
+    """Queue a PDF report and return a job id to poll"""
+    try:
+        job = pdf_jobs.submit(request)
+    except PDFJobQueueFull as e:
+        logger.warning(f"PDF job rejected: {e}")
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": "5"})
+    return {
+        **job.to_dict(),
+        "status_url": f"/api/pdf-jobs/{job.job_id}",
+        "download_url": f"/api/pdf-jobs/{job.job_id}/download"
+    }
+
+@router.get("/pdf-jobs/{job_id}")
+async def get_pdf_job(job_id: str):
+    """Poll the status of a queued PDF report"""
+    job = pdf_jobs.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Unknown or expired job")
+    return {**job.to_dict(), "queue_position": pdf_jobs.queue_position(job)}
+
+@router.get("/pdf-jobs/{job_id}/download")
+async def download_pdf_job(job_id: str):
+    """Download a finished PDF report"""
+    job = pdf_jobs.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Unknown or expired job")
+    if job.status == "failed":
+        raise HTTPException(status_code=500, detail=job.error)
+    pdf_bytes = await pdf_jobs.result(job)
+    if pdf_bytes is None:
+        raise HTTPException(status_code=409, detail=f"Job is {job.status}",
+                            headers={"Retry-After": "1"})
+    return pdf_response(pdf_bytes, cache_status="JOB")
+
+def pdf_response(pdf_bytes: bytes, cache_status: str) -> Response:
+    return Response(
+        content=pdf_bytes,
+        media_type="application/pdf",
+        headers={
+            "Content-Disposition": "attachment; filename=worldview_analysis.pdf",
+            "X-Cache": cache_status
+        }
+    )
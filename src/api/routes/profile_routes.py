@@ -0,0 +1,44 @@
+# src/api/routes/profile_routes.py
+
+import hmac
+import os
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import FileResponse, PlainTextResponse
+from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
+from src.monitoring.profiling import profile_store, summary
+
+router = APIRouter()
+
+bearer = HTTPBearer(auto_error=False)
+
+def require_profile_token(credentials: HTTPAuthorizationCredentials = Depends(bearer)):
+    """Bearer token check against PROFILE_TOKEN; the endpoints are hidden when it is unset"""
+    token = os.getenv('PROFILE_TOKEN')
+    if not token:
+        raise HTTPException(status_code=404, detail="Not Found")
+    if credentials is None or not hmac.compare_digest(credentials.credentials.encode(), token.encode()):
+        raise HTTPException(status_code=401, detail="Invalid profile token",
+                            headers={"WWW-Authenticate": "Bearer"})
+
+@router.get("/profiles", dependencies=[Depends(require_profile_token)])
+async def list_profiles():
+    """Stored request profiles, newest first"""
+    return {"profiles": profile_store.list()}
+
+@router.get("/profiles/{name}", dependencies=[Depends(require_profile_token)])
+def download_profile(
+    name: str,
+    format: str = Query("pstats", pattern="^(pstats|text)$"),
+    sort: str = Query("cumulative", pattern="^(cumulative|tottime|calls)$")
+):
+    """The raw pstats file (load with pstats or snakeviz), or a text summary with format=text"""
+    path = profile_store.path(name)
+    if path is None and profile_store.is_pending(name):
+        raise HTTPException(status_code=409, detail="Profile is still being written",
+                            headers={"Retry-After": "1"})
+    if path is None:
+        raise HTTPException(status_code=404, detail="Profile not found")
+    if format == "text":
+        return PlainTextResponse(summary(path, sort=sort))
+    return FileResponse(path, media_type="application/octet-stream", filename=name)
@@ -0,0 +1,36 @@
+# src/api/routes/stats_routes.py
+
+import hmac
+import os
+
+from fastapi import APIRouter, Depends, HTTPException, Request
+from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
+from src.analytics.aggregates import population
+
+router = APIRouter()
+
+bearer = HTTPBearer(auto_error=False)
+
+def require_metrics_token(credentials: HTTPAuthorizationCredentials = Depends(bearer)):
+    """Bearer token check against METRICS_TOKEN for operational endpoints.
+
+    With METRICS_TOKEN unset they are only open when NODE_ENV=development.
+    """
+    token = os.getenv('METRICS_TOKEN')
+    if not token:
+        if os.getenv('NODE_ENV') == 'development':
+            return
+        raise HTTPException(status_code=403, detail="METRICS_TOKEN is not configured")
+    if credentials is None or not hmac.compare_digest(credentials.credentials.encode(), token.encode()):
+        raise HTTPException(status_code=401, detail="Invalid metrics token",
+                            headers={"WWW-Authenticate": "Bearer"})
+
+@router.get("/stats/population", dependencies=[Depends(require_metrics_token)])
+async def population_stats(request: Request):
+    """Population histograms and plot heatmap, served from memory with an ETag"""
+    return population.asset().response(request)
+
+@router.get("/stats/database", dependencies=[Depends(require_metrics_token)])
+async def database_stats(request: Request):
+    """Connection pool wait/saturation, circuit breaker state and spool backlog"""
+    return request.app.state.db_manager.stats()
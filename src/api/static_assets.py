@@ -0,0 +1,96 @@
+# src/api/static_assets.py
+"""
+Fingerprinted static files served from memory.
+
+On first use every file under static/ is read, hashed and wrapped in a
+PrecompressedAsset (text types also get gzip and, when available, brotli
+variants). Templates link to static_url("favicon.ico"), which returns
+/static/favicon.<hash>.ico; that URL changes whenever the content does,
+so it is served with a year-long immutable Cache-Control. The plain name
+still works and is served with no-cache, so clients revalidate by ETag.
+"""
+
+from pathlib import Path
+from typing import Dict, Optional
+import logging
+import mimetypes
+import re
+import threading
+
+from fastapi import HTTPException, Request
+from fastapi.responses import Response
+
+from src.api.http_cache import PrecompressedAsset
+
+logger = logging.getLogger(__name__)
+
+IMMUTABLE = "public, max-age=31536000, immutable"
+REVALIDATE = "no-cache"
+FINGERPRINT = re.compile(r"^(?P<stem>.+)\.(?P<hash>[0-9a-f]{10})(?P<suffix>\.[^./]+)$")
+COMPRESSIBLE = ("text/", "application/javascript", "application/json", "image/svg+xml")
+SKIP = {"__init__.py", "__pycache__"}
+
+
+def fingerprint(name: str, digest: str) -> str:
+    """favicon.ico -> favicon.<hash>.ico"""
+    path = Path(name)
+    return str(path.with_name(f"{path.stem}.{digest[:10]}{path.suffix}"))
+
+
+class StaticAssets:
+    def __init__(self, directory: str, prefix: str = "/static"):
+        self.directory = Path(directory)
+        self.prefix = prefix
+        self._assets: Optional[Dict[str, PrecompressedAsset]] = None
+        self._urls: Dict[str, str] = {}
+        self._lock = threading.Lock()
+
+    def _load(self) -> Dict[str, PrecompressedAsset]:
+        """name -> asset for every file under the directory; built once"""
+        if self._assets is not None:
+            return self._assets
+        with self._lock:
+            if self._assets is not None:
+                return self._assets
+            assets = {}
+            for path in sorted(self.directory.rglob("*")):
+                if not path.is_file() or SKIP & set(path.relative_to(self.directory).parts):
+                    continue
+                name = path.relative_to(self.directory).as_posix()
+                body = path.read_bytes()
+                media_type = mimetypes.guess_type(name)[0] or "application/octet-stream"
+                # Images and fonts are already compressed and gain nothing from gzip
+                compressible = media_type.startswith(COMPRESSIBLE)
+                asset = PrecompressedAsset(body, media_type, cache_control=REVALIDATE,
+                                           compress=compressible)
+                if compressible:
+                    asset.add_brotli()
+                assets[name] = asset
+                self._urls[name] = f"{self.prefix}/{fingerprint(name, asset.digest)}"
+            logger.info(f"Loaded {len(assets)} static assets")
+            self._assets = assets
+        return self._assets
+
+    def url(self, name: str) -> str:
+        """Fingerprinted URL for a file under static/"""
+        self._load()
+        if name not in self._urls:
+            raise KeyError(f"No static asset named {name}")
+        return self._urls[name]
+
+    def response(self, request: Request, path: str) -> Response:
+        assets = self._load()
+        match = FINGERPRINT.match(path)
+        if match:
+            name = f"{match['stem']}{match['suffix']}"
+            if name in assets:
+                asset = assets[name]
+                # A hash from an older deploy still gets the current file, but not cached for a year
+                current = asset.digest.startswith(match["hash"])
+                return asset.response(request, cache_control=IMMUTABLE if current else None)
+        if path in assets:
+            return assets[path].response(request)
+        raise HTTPException(status_code=404, detail="Not Found")
+
+
+static_assets = StaticAssets(Path(__file__).resolve().parents[2] / "static")
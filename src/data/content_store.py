@@ -0,0 +1,128 @@
+# src/data/content_store.py
+
+from typing import Dict, Optional, Tuple
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from pathlib import Path
+
+from src.api.http_cache import PrecompressedAsset
+from src.monitoring.metrics import content_load_seconds
+
+logger = logging.getLogger(__name__)
+
+DATA_DIR = Path(__file__).parent
+QUESTIONS_FILE = "questions_responses.json"
+TEMPLATES_FILE = "response_templates.json"
+
+
+def validate_questions(data: Dict):
+    """Check the shape of questions_responses.json"""
+    if not isinstance(data.get("questions"), dict) or not data["questions"]:
+        raise ValueError("Invalid questions data format")
+    for q_id, question in data["questions"].items():
+        if not isinstance(question.get("text"), str) or not question.get("responses"):
+            raise ValueError(f"Question {q_id} needs text and responses")
+        for response in question["responses"]:
+            if not isinstance(response.get("id"), str) or not isinstance(response.get("text"), str):
+                raise ValueError(f"Response in {q_id} needs an id and text")
+            if len(response.get("scores", [])) != 3:
+                raise ValueError(f"Response {response['id']} must have exactly 3 scores")
+
+
+def validate_templates(data: Dict):
+    """Check the shape of response_templates.json"""
+    if not isinstance(data.get("categories"), dict) or not data["categories"]:
+        raise ValueError("Invalid templates data format")
+    for category, perspectives in data["categories"].items():
+        for perspective, template in perspectives.items():
+            if not isinstance(template.get("response"), str):
+                raise ValueError(f"Template {category}/{perspective} is missing a response")
+
+
+class ContentSnapshot:
+    """One consistent, validated version of the survey content. Treat as read-only."""
+
+    def __init__(self, questions_raw: bytes, templates_raw: bytes):
+        self.questions_data = json.loads(questions_raw)
+        validate_questions(self.questions_data)
+        templates_data = json.loads(templates_raw)
+        validate_templates(templates_data)
+
+        self.questions = self.questions_data["questions"]
+        self.templates = templates_data["categories"]
+        self.responses_by_id = {
+            response["id"]: response
+            for question in self.questions.values()
+            for response in question["responses"]
+        }
+
+        # Same hash the answer table artifact is keyed on
+        digest = hashlib.sha256()
+        digest.update(questions_raw)
+        digest.update(templates_raw)
+        self.version = digest.hexdigest()
+
+        body = json.dumps(self.questions_data, separators=(",", ":")).encode()
+        self.questions_asset = PrecompressedAsset(
+            body, "application/json", cache_control="public, max-age=300"
+        )
+
+
+class ContentStore:
+    """
+    Process-wide cache of the questions and response templates.
+
+    Both files are read, validated and indexed once. Every check_interval
+    seconds a snapshot() call stats the files; if an mtime moved and the
+    content hash differs, a new snapshot is built and swapped in atomically.
+    A file that fails validation is logged and the previous snapshot kept.
+    """
+
+    def __init__(self, data_dir: Path = DATA_DIR, check_interval: float = 2.0):
+        self.questions_path = Path(data_dir) / QUESTIONS_FILE
+        self.templates_path = Path(data_dir) / TEMPLATES_FILE
+        self.check_interval = check_interval
+        self._lock = threading.Lock()
+        self._snapshot: Optional[ContentSnapshot] = None
+        self._stamp: Optional[Tuple[int, int]] = None
+        self._next_check = 0.0
+
+    def _file_stamp(self) -> Tuple[int, int]:
+        return (os.stat(self.questions_path).st_mtime_ns, os.stat(self.templates_path).st_mtime_ns)
+
+    def _reload(self, stamp: Tuple[int, int]):
+        start = time.perf_counter()
+        snapshot = ContentSnapshot(self.questions_path.read_bytes(), self.templates_path.read_bytes())
+        content_load_seconds.observe(time.perf_counter() - start)
+        if self._snapshot is None or snapshot.version != self._snapshot.version:
+            self._snapshot = snapshot
+            logger.info(f"Loaded survey content {snapshot.version[:12]} "
+                        f"in {(time.perf_counter() - start) * 1000:.1f}ms")
+        self._stamp = stamp
+
+    def snapshot(self) -> ContentSnapshot:
+        """Return the current content, reloading first if the files changed"""
+        now = time.monotonic()
+        if self._snapshot is not None and now < self._next_check:
+            return self._snapshot
+
+        with self._lock:
+            if self._snapshot is None or now >= self._next_check:
+                self._next_check = now + self.check_interval
+                stamp = self._file_stamp()
+                if stamp != self._stamp:
+                    try:
+                        self._reload(stamp)
+                    except (OSError, ValueError) as e:
+                        if self._snapshot is None:
+                            raise
+                        logger.error(f"Keeping previous survey content, reload failed: {e}")
+                        self._stamp = stamp
+        return self._snapshot
+
+
+content_store = ContentStore()
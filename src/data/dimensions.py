@@ -0,0 +1,216 @@
+# src/data/dimensions.py
+"""
+Dictionary encoding of the browser, region and source columns.
+
+User agents are reduced to (family, major version, OS) by a memoized
+parser, and those tuples plus the region and source strings are interned
+into the small dim_browser / dim_region / dim_source tables. An
+in-process cache maps values to ids, so after warm-up a submission costs
+no extra queries and survey_results stores three integer keys instead of
+hundreds of bytes of repeated text.
+
+Rows written before the switch are converted by the backfill job, which
+walks survey_results in id order and can be resumed with --after-id:
+
+    python -m src.data.dimensions backfill --batch-size 1000
+"""
+
+from functools import lru_cache
+from typing import Dict, Optional, Tuple
+import argparse
+import logging
+import re
+import time
+
+logger = logging.getLogger(__name__)
+
+# (family, regex capturing the version) in precedence order: many browsers
+# embed "Chrome/" and "Safari/" in their user agent, so specific ones go first
+BROWSER_PATTERNS = [
+    # "Googlebot/2.1", "AhrefsBot/7.0" or a standalone word such as "Slurp", but
+    # not device names that merely contain the letters (e.g. "CUBOT X30")
+    ("Bot", re.compile(r"[\w-]*(?:bot|crawler|spider)/([\d.]*)|\b(?:bot|crawler|spider|slurp)\b",
+                       re.I)),
+    ("Edge", re.compile(r"Edg(?:e|A|iOS)?/([\d.]+)")),
+    ("Opera", re.compile(r"(?:OPR|Opera)/([\d.]+)")),
+    ("Samsung Internet", re.compile(r"SamsungBrowser/([\d.]+)")),
+    ("Firefox", re.compile(r"(?:Firefox|FxiOS)/([\d.]+)")),
+    ("Chrome", re.compile(r"(?:Chrome|CriOS)/([\d.]+)")),
+    ("Safari", re.compile(r"Version/([\d.]+).*Safari/")),
+    ("Internet Explorer", re.compile(r"(?:MSIE |Trident/.*rv:)([\d.]+)")),
+]
+OS_PATTERNS = [
+    ("iOS", re.compile(r"iPhone|iPad|iPod")),
+    ("Android", re.compile(r"Android")),
+    ("ChromeOS", re.compile(r"CrOS")),
+    ("Windows", re.compile(r"Windows")),
+    ("macOS", re.compile(r"Macintosh|Mac OS X")),
+    ("Linux", re.compile(r"Linux|X11")),
+]
+
+REGION_MAX_LENGTH = 100
+SOURCE_MAX_LENGTH = 50
+# dim_browser.major is VARCHAR(16)
+MAJOR_MAX_LENGTH = 16
+
+
+@lru_cache(maxsize=4096)
+def parse_user_agent(user_agent: str) -> Tuple[str, str, str]:
+    """Reduce a user agent string to (family, major version, OS)"""
+    family, version = "Other", ""
+    for name, pattern in BROWSER_PATTERNS:
+        match = pattern.search(user_agent)
+        if match:
+            family, version = name, (match.group(1) or "").split(".")[0][:MAJOR_MAX_LENGTH]
+            break
+    os_name = next((name for name, pattern in OS_PATTERNS if pattern.search(user_agent)), "Other")
+    return family, version, os_name
+
+
+def browser_label(family: str, version: str, os_name: str) -> str:
+    return f"{family} {version} ({os_name})" if version else f"{family} ({os_name})"
+
+
+class DimensionEncoder:
+    """
+    Interns dimension values and caches their ids in process.
+
+    Unknown values are inserted with ON DUPLICATE KEY UPDATE
+    id = LAST_INSERT_ID(id), which returns the existing id when another
+    instance got there first, and committed before the caller's own insert
+    so a rolled-back survey row can never leave a cached id dangling.
+    """
+
+    def __init__(self, max_entries: int = 10000):
+        self.max_entries = max_entries
+        self._ids: Dict[str, Dict] = {"browser": {}, "region": {}, "source": {}}
+        self.hits = 0
+        self.misses = 0
+
+    def _intern(self, cursor, kind: str, key) -> int:
+        if kind == "browser":
+            cursor.execute(
+                "INSERT INTO dim_browser (family, major, os, label) VALUES (%s, %s, %s, %s) "
+                "ON DUPLICATE KEY UPDATE id = LAST_INSERT_ID(id)",
+                (*key, browser_label(*key))
+            )
+        else:
+            cursor.execute(
+                f"INSERT INTO dim_{kind} (name) VALUES (%s) "
+                "ON DUPLICATE KEY UPDATE id = LAST_INSERT_ID(id)",
+                (key,)
+            )
+        return cursor.lastrowid
+
+    def _id(self, cursor, kind: str, key) -> Tuple[int, bool]:
+        cache = self._ids[kind]
+        dim_id = cache.get(key)
+        if dim_id is not None:
+            self.hits += 1
+            return dim_id, False
+        self.misses += 1
+        dim_id = self._intern(cursor, kind, key)
+        if len(cache) < self.max_entries:
+            cache[key] = dim_id
+        return dim_id, True
+
+    @staticmethod
+    def keys(row: Dict) -> Dict[str, Optional[object]]:
+        """Normalized dimension values of a survey row (None when absent)"""
+        browser = (row.get("browser") or "").strip()
+        region = (row.get("region") or "").strip()[:REGION_MAX_LENGTH]
+        source = (row.get("source") or "").strip()[:SOURCE_MAX_LENGTH]
+        return {
+            "browser": parse_user_agent(browser) if browser else None,
+            "region": region or None,
+            "source": source or None,
+        }
+
+    def encode(self, connection, row: Dict) -> Dict:
+        """Copy of row with browser/region/source replaced by *_id keys"""
+        encoded = dict(row)
+        cursor = connection.cursor()
+        interned = False
+        for kind, key in self.keys(row).items():
+            dim_id = None
+            if key is not None:
+                dim_id, created = self._id(cursor, kind, key)
+                interned = interned or created
+            encoded[f"{kind}_id"] = dim_id
+            encoded[kind] = None
+        cursor.close()
+        if interned:
+            connection.commit()
+        return encoded
+
+    def stats(self) -> Dict:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            **{f"{kind}_entries": len(cache) for kind, cache in self._ids.items()},
+        }
+
+
+def backfill(db_manager, encoder: DimensionEncoder = None, batch_size: int = 1000,
+             after_id: int = 0, pause: float = 0.1, clear_text: bool = False) -> int:
+    """
+    Fill browser_id/region_id/source_id for rows written before encoding.
+
+    Uses a dedicated connection and commits per batch, pausing between
+    batches so the web pool and replication are not starved. Returns the
+    number of rows updated; progress is logged with the last id so an
+    interrupted run can continue with after_id. The original text columns
+    are kept unless clear_text is set.
+    """
+    encoder = encoder or DimensionEncoder()
+    text = ", browser = NULL, region = NULL, source = NULL" if clear_text else ""
+    update = (f"UPDATE survey_results SET browser_id = %s, region_id = %s, source_id = %s{text} "
+              "WHERE id = %s")
+    updated = 0
+    connection = db_manager.connect_dedicated()
+    try:
+        cursor = connection.cursor()
+        while True:
+            cursor.execute(
+                "SELECT id, browser, region, source FROM survey_results "
+                "WHERE id > %s AND browser_id IS NULL AND region_id IS NULL AND source_id IS NULL "
+                "AND (browser IS NOT NULL OR region IS NOT NULL OR source IS NOT NULL) "
+                "ORDER BY id LIMIT %s",
+                (after_id, batch_size)
+            )
+            rows = cursor.fetchall()
+            if not rows:
+                break
+            params = []
+            for row_id, browser, region, source in rows:
+                encoded = encoder.encode(connection, {"browser": browser, "region": region, "source": source})
+                params.append((encoded["browser_id"], encoded["region_id"], encoded["source_id"], row_id))
+            cursor.executemany(update, params)
+            connection.commit()
+            updated += len(rows)
+            after_id = rows[-1][0]
+            logger.info(f"Backfilled {updated} rows (last id {after_id})")
+            time.sleep(pause)
+        cursor.close()
+    finally:
+        connection.close()
+    return updated
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    parser = argparse.ArgumentParser(description="Dimension table maintenance")
+    parser.add_argument("command", choices=["backfill"])
+    parser.add_argument("--batch-size", type=int, default=1000)
+    parser.add_argument("--after-id", type=int, default=0, help="Resume after this id")
+    parser.add_argument("--pause", type=float, default=0.1, help="Seconds to sleep between batches")
+    parser.add_argument("--clear-text", action="store_true",
+                        help="Set the original browser/region/source text to NULL once encoded")
+    args = parser.parse_args()
+
+    from dotenv import load_dotenv
+    from db_manager import DatabaseManager
+    load_dotenv()
+    total = backfill(DatabaseManager(pool_size=1, spool=False), batch_size=args.batch_size,
+                     after_id=args.after_id, pause=args.pause, clear_text=args.clear_text)
+    print(f"Backfilled {total} rows")
@@ -0,0 +1,288 @@
+# src/data/export.py
+"""
+Streaming export of survey_results as CSV, NDJSON or Parquet.
+
+Rows are read over a dedicated connection (never one of the web pool's)
+with an unbuffered cursor in id order and fetched in fixed-size chunks, so
+memory stays flat however large the table is. Each chunk is serialized and
+handed on before the next one is fetched. Exports are resumable: pass the
+last id you received as after_id to continue where a broken download left
+off. From the command line:
+
+    python -m src.data.export --format parquet --out survey_results.parquet
+"""
+
+from datetime import datetime
+from decimal import Decimal
+from typing import Dict, Iterator, List, Optional
+import argparse
+import csv
+import io
+import json
+import logging
+import threading
+
+logger = logging.getLogger(__name__)
+
+EXPORT_COLUMNS = [
+    "id", "session_id",
+    "q1_response", "q2_response", "q3_response", "q4_response", "q5_response", "q6_response",
+    "n1", "n2", "n3", "plot_x", "plot_y",
+    "browser", "region", "source", "hash_email_session", "created_at",
+]
+
+FORMATS = {
+    "csv": ("text/csv", "csv"),
+    "ndjson": ("application/x-ndjson", "ndjson"),
+    "parquet": ("application/vnd.apache.parquet", "parquet"),
+}
+
+
+class ExportBusy(RuntimeError):
+    """Raised when the maximum number of concurrent exports is already running"""
+
+
+# Dictionary-encoded columns resolve through their dimension tables, falling
+# back to the row's own text for rows the backfill has not reached yet
+DIMENSION_COLUMNS = {
+    "browser": "COALESCE(b.label, sr.browser)",
+    "region": "COALESCE(r.name, sr.region)",
+    "source": "COALESCE(s.name, sr.source)",
+}
+DIMENSION_JOINS = (
+    " LEFT JOIN dim_browser b ON b.id = sr.browser_id"
+    " LEFT JOIN dim_region r ON r.id = sr.region_id"
+    " LEFT JOIN dim_source s ON s.id = sr.source_id"
+)
+
+
+def build_query(after_id: int = None, until_id: int = None, created_from: datetime = None,
+                created_to: datetime = None, limit: int = None, dimensions: bool = False):
+    """SELECT for the requested id / created_at window, in id order"""
+    clauses, params = [], []
+    if after_id is not None:
+        clauses.append("sr.id > %s")
+        params.append(after_id)
+    if until_id is not None:
+        clauses.append("sr.id <= %s")
+        params.append(until_id)
+    if created_from is not None:
+        clauses.append("sr.created_at >= %s")
+        params.append(created_from)
+    if created_to is not None:
+        clauses.append("sr.created_at < %s")
+        params.append(created_to)
+    columns = [
+        DIMENSION_COLUMNS[c] if dimensions and c in DIMENSION_COLUMNS else f"sr.{c}"
+        for c in EXPORT_COLUMNS
+    ]
+    query = f"SELECT {', '.join(columns)} FROM survey_results sr"
+    if dimensions:
+        query += DIMENSION_JOINS
+    if clauses:
+        query += " WHERE " + " AND ".join(clauses)
+    query += " ORDER BY sr.id"
+    if limit is not None:
+        query += " LIMIT %s"
+        params.append(limit)
+    return query, tuple(params)
+
+
+def iter_chunks(db_manager, chunk_size: int = 5000, **filters) -> Iterator[List[tuple]]:
+    """Yield lists of at most chunk_size rows, closing the connection when done"""
+    query, params = build_query(dimensions=db_manager.dimensions is not None, **filters)
+    connection = db_manager.connect_dedicated(read_only=True)
+    try:
+        cursor = connection.cursor(buffered=False)
+        cursor.execute(query, params)
+        while True:
+            rows = cursor.fetchmany(chunk_size)
+            if not rows:
+                break
+            yield rows
+        cursor.close()
+    finally:
+        connection.close()
+
+
+def _plain(value):
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return float(value)
+    return value
+
+
+def encode_csv(chunks: Iterator[List[tuple]]) -> Iterator[bytes]:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(EXPORT_COLUMNS)
+    for rows in chunks:
+        writer.writerows([_plain(v) for v in row] for row in rows)
+        yield buffer.getvalue().encode()
+        buffer.seek(0)
+        buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue().encode()
+
+
+def encode_ndjson(chunks: Iterator[List[tuple]]) -> Iterator[bytes]:
+    for rows in chunks:
+        yield "".join(
+            json.dumps(dict(zip(EXPORT_COLUMNS, map(_plain, row))), separators=(",", ":")) + "\n"
+            for row in rows
+        ).encode()
+
+
+def parquet_available() -> bool:
+    try:
+        import pyarrow.parquet  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def encode_parquet(chunks: Iterator[List[tuple]]) -> Iterator[bytes]:
+    """One Parquet row group per chunk; the footer is written after the last chunk"""
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    schema = pa.schema([
+        ("id", pa.int64()), ("session_id", pa.string()),
+        *[(f"q{i}_response", pa.int8()) for i in range(1, 7)],
+        ("n1", pa.float64()), ("n2", pa.float64()), ("n3", pa.float64()),
+        ("plot_x", pa.float64()), ("plot_y", pa.float64()),
+        ("browser", pa.string()), ("region", pa.string()), ("source", pa.string()),
+        ("hash_email_session", pa.string()), ("created_at", pa.timestamp("s")),
+    ])
+    sink = io.BytesIO()
+    writer = pq.ParquetWriter(sink, schema)
+    for rows in chunks:
+        columns = list(zip(*rows))
+        batch = pa.record_batch(
+            [pa.array([float(v) if isinstance(v, Decimal) else v for v in column], type=field.type)
+             for column, field in zip(columns, schema)],
+            schema=schema
+        )
+        writer.write_batch(batch)
+        yield sink.getvalue()
+        sink.seek(0)
+        sink.truncate()
+    writer.close()
+    yield sink.getvalue()
+
+
+ENCODERS = {"csv": encode_csv, "ndjson": encode_ndjson, "parquet": encode_parquet}
+
+
+class ExportLimiter:
+    """Caps concurrent exports so they cannot pile up dedicated connections"""
+
+    def __init__(self, max_concurrent: int = 1):
+        self.max_concurrent = max_concurrent
+        self._slots = threading.BoundedSemaphore(max_concurrent)
+
+    def stream(self, db_manager, fmt: str, chunk_size: int = 5000, **filters) -> 'ReservedStream':
+        """Reserve a slot now and return the encoded byte stream, which holds it until closed"""
+        if not self._slots.acquire(blocking=False):
+            raise ExportBusy(f"{self.max_concurrent} export(s) already running")
+        return ReservedStream(self._slots, self._stream(db_manager, fmt, chunk_size, filters))
+
+    def _stream(self, db_manager, fmt: str, chunk_size: int, filters: Dict) -> Iterator[bytes]:
+        exported = 0
+        try:
+            def counted():
+                nonlocal exported
+                for rows in iter_chunks(db_manager, chunk_size, **filters):
+                    exported += len(rows)
+                    yield rows
+            yield from ENCODERS[fmt](counted())
+        finally:
+            logger.info(f"Exported {exported} survey rows as {fmt} (filters={filters})")
+
+
+class ReservedStream:
+    """Export byte stream holding a limiter slot until the export has really stopped.
+
+    The slot is released in the iterator's own finally, after the export
+    generator (and its dedicated connection) is closed. close() stops a
+    suspended iterator at once; one busy producing a chunk on another
+    thread stops right after that chunk. A stream that was never iterated
+    (the client went away before the first chunk) is released by close().
+    """
+
+    def __init__(self, slots: threading.BoundedSemaphore, chunks: Iterator[bytes]):
+        self._slots = slots
+        self._chunks = chunks
+        self._started = False
+        self._closed = False
+        self._lock = threading.Lock()
+        self._iterator = self._iterate()
+
+    def __iter__(self) -> Iterator[bytes]:
+        return self._iterator
+
+    def _iterate(self) -> Iterator[bytes]:
+        with self._lock:
+            if self._closed:
+                return
+            self._started = True
+        try:
+            for chunk in self._chunks:
+                if self._closed:
+                    break
+                yield chunk
+        finally:
+            self._chunks.close()
+            self._slots.release()
+
+    def close(self):
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            started = self._started
+        if not started:
+            self._chunks.close()
+            self._slots.release()
+            return
+        try:
+            self._iterator.close()
+        except ValueError:
+            # Producing a chunk on another thread; _iterate stops and releases after it
+            pass
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Export survey_results")
+    parser.add_argument("--format", choices=sorted(FORMATS), default="csv")
+    parser.add_argument("--out", help="Output file (default: stdout)")
+    parser.add_argument("--after-id", type=int, help="Resume after this id")
+    parser.add_argument("--until-id", type=int)
+    parser.add_argument("--created-from", type=datetime.fromisoformat)
+    parser.add_argument("--created-to", type=datetime.fromisoformat)
+    parser.add_argument("--limit", type=int)
+    parser.add_argument("--chunk-size", type=int, default=5000)
+    args = parser.parse_args(argv)
+
+    from dotenv import load_dotenv
+    from db_manager import DatabaseManager
+    load_dotenv()
+
+    filters = dict(after_id=args.after_id, until_id=args.until_id, created_from=args.created_from,
+                   created_to=args.created_to, limit=args.limit)
+    chunks = iter_chunks(DatabaseManager(pool_size=1, spool=False), args.chunk_size, **filters)
+    out = open(args.out, "wb") if args.out else None
+    try:
+        target = out or io.open(1, "wb", closefd=False)
+        for data in ENCODERS[args.format](chunks):
+            target.write(data)
+        target.flush()
+    finally:
+        if out:
+            out.close()
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    main()
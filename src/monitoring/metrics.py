@@ -0,0 +1,228 @@
+# src/monitoring/metrics.py
+"""
+In-process metrics exported in the Prometheus text format.
+
+A deliberately small subset of prometheus_client: counters, histograms
+with fixed buckets, and gauges whose value is read from a callback at
+scrape time. Recording is a dict lookup, a bisect and two additions under
+a per-metric lock, so it is cheap enough for every request and query.
+Values are per process; Prometheus aggregates across instances.
+"""
+
+from bisect import bisect_left
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+import asyncio
+import logging
+import math
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+# Seconds; spans a cached JSON response up to a slow PDF render
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+SIZE_BUCKETS = (1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+class Counter:
+    kind = "counter"
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = ()):
+        self.name = f"{name}_total"
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self._values: Dict[Tuple, float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, *labels, amount: float = 1.0):
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0.0) + amount
+
+    def samples(self) -> Iterable[str]:
+        with self._lock:
+            values = dict(self._values)
+        for labels, value in values.items():
+            yield f"{self.name}{_format_labels(self.labelnames, labels)} {_format_value(value)}"
+
+
+class Histogram:
+    kind = "histogram"
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = (),
+                 buckets: Sequence[float] = LATENCY_BUCKETS):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(sorted(buckets))
+        self._series: Dict[Tuple, List] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, *labels):
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(labels)
+            if series is None:
+                # Per-bucket (not cumulative) counts, then sum and count
+                series = self._series[labels] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            series[0][index] += 1
+            series[1] += value
+            series[2] += 1
+
+    def time(self, *labels) -> '_Timer':
+        """Context manager observing the elapsed wall time of its block"""
+        return _Timer(self, labels)
+
+    def samples(self) -> Iterable[str]:
+        with self._lock:
+            snapshot = {labels: (list(s[0]), s[1], s[2]) for labels, s in self._series.items()}
+        for labels, (counts, total, count) in snapshot.items():
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets + (math.inf,), counts):
+                cumulative += bucket_count
+                le = _format_labels(self.labelnames, labels, f'le="{_format_value(bound)}"')
+                yield f"{self.name}_bucket{le} {cumulative}"
+            label_text = _format_labels(self.labelnames, labels)
+            yield f"{self.name}_sum{label_text} {_format_value(total)}"
+            yield f"{self.name}_count{label_text} {count}"
+
+
+class _Timer:
+    def __init__(self, histogram: Histogram, labels: Tuple):
+        self.histogram = histogram
+        self.labels = labels
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.histogram.observe(time.perf_counter() - self.start, *self.labels)
+        return False
+
+
+class GaugeCallback:
+    """Gauge read at scrape time: callback returns {label values tuple: value}"""
+
+    kind = "gauge"
+
+    def __init__(self, name: str, help: str, callback: Callable[[], Dict[Tuple, float]],
+                 labelnames: Sequence[str] = ()):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self.callback = callback
+
+    def samples(self) -> Iterable[str]:
+        try:
+            values = self.callback()
+        except Exception as e:
+            logger.warning(f"Metric {self.name} unavailable: {e}")
+            return
+        for labels, value in values.items():
+            if value is None:
+                continue
+            yield f"{self.name}{_format_labels(self.labelnames, labels)} {_format_value(value)}"
+
+
+class Registry:
+    def __init__(self):
+        self._metrics: Dict[str, object] = {}
+        self._lock = threading.Lock()
+
+    def register(self, metric):
+        with self._lock:
+            if metric.name in self._metrics:
+                raise ValueError(f"Metric {metric.name} already registered")
+            self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, help: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self.register(Counter(name, help, labelnames))
+
+    def histogram(self, name: str, help: str, labelnames: Sequence[str] = (),
+                  buckets: Sequence[float] = LATENCY_BUCKETS) -> Histogram:
+        return self.register(Histogram(name, help, labelnames, buckets))
+
+    def gauge(self, name: str, help: str, callback: Callable[[], Dict[Tuple, float]],
+              labelnames: Sequence[str] = (), replace: bool = False) -> GaugeCallback:
+        """Register a callback gauge; replace=True swaps the callback of an existing one"""
+        if replace:
+            with self._lock:
+                self._metrics.pop(name, None)
+        return self.register(GaugeCallback(name, help, callback, labelnames))
+
+    def render(self) -> str:
+        with self._lock:
+            metrics = list(self._metrics.values())
+        lines = []
+        for metric in metrics:
+            lines.append(f"# HELP {metric.name} {metric.help}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            lines.extend(metric.samples())
+        return "\n".join(lines) + "\n"
+
+
+registry = Registry()
+
+# Hot-path metrics; recorded from main, db_manager, the PDF routes and the content store
+http_request_seconds = registry.histogram(
+    "http_request_duration_seconds", "HTTP request latency by route template",
+    ("method", "route", "status"))
+db_checkout_wait_seconds = registry.histogram(
+    "db_pool_checkout_wait_seconds", "Time to obtain a pooled connection", ("pool",))
+db_connection_held_seconds = registry.histogram(
+    "db_pool_connection_held_seconds", "Time a pooled connection was checked out", ("pool",))
+db_query_seconds = registry.histogram(
+    "db_query_duration_seconds", "Insert statement time including commit", ("operation",))
+db_save_retries = registry.counter(
+    "db_save_retries", "Survey save attempts after the first", ("path",))
+db_save_outcomes = registry.counter(
+    "db_save_outcomes", "Survey save results", ("outcome",))
+pdf_render_seconds = registry.histogram(
+    "pdf_render_duration_seconds", "PDF report render time (cache misses only)")
+pdf_output_bytes = registry.histogram(
+    "pdf_output_bytes", "Size of rendered PDF reports", buckets=SIZE_BUCKETS)
+pdf_cache_lookups = registry.counter(
+    "pdf_cache_lookups", "PDF render cache lookups", ("result",))
+content_load_seconds = registry.histogram(
+    "content_load_duration_seconds", "Survey content JSON parse and validation time")
+event_loop_lag_seconds = registry.histogram(
+    "event_loop_lag_seconds", "Delay of a periodic timer beyond its deadline",
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 5.0))
+
+
+async def monitor_event_loop(interval: float = 0.5):
+    """Sleep interval seconds in a loop and record how late each wake-up was"""
+    loop = asyncio.get_running_loop()
+    while True:
+        start = loop.time()
+        await asyncio.sleep(interval)
+        event_loop_lag_seconds.observe(max(0.0, loop.time() - start - interval))
+
+
+def stats_gauges(name: str, help: str, source: Callable[[], Optional[Dict]],
+                 fields: Optional[Sequence[str]] = None) -> GaugeCallback:
+    """Gauge exposing the numeric fields of a stats() dict (all of them by default), one per stat"""
+    def collect():
+        stats = source() or {}
+        names = fields if fields is not None else stats.keys()
+        return {(field,): float(stats[field]) for field in names
+                if isinstance(stats.get(field), (int, float))}
+    return registry.gauge(name, help, collect, ("stat",))
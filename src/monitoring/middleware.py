@@ -0,0 +1,59 @@
+# src/monitoring/middleware.py
+
+from typing import Any, Sequence, Tuple
+import time
+
+from src.monitoring.metrics import http_request_seconds
+
+
+class MetricsMiddleware:
+    """
+    Pure ASGI middleware recording request latency per route template.
+
+    Latency runs until the last body chunk is sent, so background tasks
+    that run after the response do not inflate it. Paths are labelled by
+    the matched route's template ("/api/pdf-jobs/{job_id}"), never the raw
+    URL, and unmatched requests share one label, so the number of series
+    stays bounded. included_routers lists (prefix, router) pairs as passed
+    to include_router: FastAPI versions that keep included routes in their
+    own router report the template without the prefix.
+    """
+
+    def __init__(self, app, included_routers: Sequence[Tuple[str, Any]] = ()):
+        self.app = app
+        self._labels = {id(route): prefix + route.path
+                        for prefix, router in included_routers
+                        for route in router.routes if hasattr(route, "path")}
+
+    def route_label(self, scope) -> str:
+        route = scope.get("route")
+        path = getattr(route, "path", None)
+        if path is None:
+            return "unmatched"
+        return self._labels.get(id(route), path)
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        start = time.perf_counter()
+        state = {"status": 500, "recorded": False}
+
+        def record():
+            if not state["recorded"]:
+                state["recorded"] = True
+                http_request_seconds.observe(time.perf_counter() - start, scope["method"],
+                                             self.route_label(scope), str(state["status"]))
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                state["status"] = message["status"]
+            await send(message)
+            if message["type"] == "http.response.body" and not message.get("more_body", False):
+                record()
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            record()
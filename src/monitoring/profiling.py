@@ -0,0 +1,257 @@
+# src/monitoring/profiling.py
+"""
+Opt-in cProfile capture of individual requests.
+
+ProfilingMiddleware profiles a request when it carries X-Profile-Token
+matching PROFILE_TOKEN, or at random with probability PROFILE_SAMPLE_RATE.
+The event-loop thread is profiled for the whole request (including its
+background tasks); blocking calls handed to the database executors and
+PDF renders (in a worker process or thread) are profiled where they run
+and merged into the same pstats file. Only one request is profiled at a
+time, because cProfile is per thread and the event loop is shared; the
+loop-thread profile therefore also contains whatever other requests the
+loop interleaved. When neither setting is configured the middleware is
+not installed, and the hooks below cost one ContextVar lookup.
+"""
+
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+import asyncio
+import cProfile
+import hmac
+import logging
+import os
+import pstats
+import random
+import re
+import tempfile
+import threading
+import time
+import uuid
+
+logger = logging.getLogger(__name__)
+
+HEADER = b"x-profile-token"
+PROFILE_NAME = re.compile(r"^[\w.-]+\.prof$")
+
+_current: ContextVar[Optional['RequestProfile']] = ContextVar("request_profile", default=None)
+
+
+def current() -> Optional['RequestProfile']:
+    """The profile of the request being handled, if it is being profiled"""
+    return _current.get()
+
+
+def wrap(func: Callable) -> Callable:
+    """func, profiled into the current request's profile when it runs on another thread.
+
+    Call on the event loop before handing func to an executor; executors do
+    not carry the request's context over to their threads.
+    """
+    profile = _current.get()
+    if profile is None:
+        return func
+
+    def profiled(*args, **kwargs):
+        thread_profile = cProfile.Profile()
+        try:
+            return thread_profile.runcall(func, *args, **kwargs)
+        finally:
+            profile.add(thread_profile)
+    return profiled
+
+
+class RequestProfile:
+    """cProfile of the event-loop thread plus parts collected from other threads and processes"""
+
+    def __init__(self):
+        self.loop_profile = cProfile.Profile()
+        self._parts: List = []
+        self._part_files: List[str] = []
+        self._lock = threading.Lock()
+
+    def add(self, part: cProfile.Profile):
+        with self._lock:
+            self._parts.append(part)
+
+    def part_path(self) -> str:
+        """A temp file for a worker process to dump its stats into; merged on save"""
+        fd, path = tempfile.mkstemp(prefix="request-profile-", suffix=".prof")
+        os.close(fd)
+        with self._lock:
+            self._part_files.append(path)
+        return path
+
+    def stats(self) -> pstats.Stats:
+        stats = pstats.Stats(self.loop_profile)
+        with self._lock:
+            parts = self._parts + [path for path in self._part_files if os.path.getsize(path)]
+        for part in parts:
+            try:
+                stats.add(part)
+            except (TypeError, OSError, EOFError) as e:
+                logger.warning(f"Skipping unreadable profile part: {e}")
+        return stats
+
+    def discard_parts(self):
+        with self._lock:
+            paths, self._part_files = self._part_files, []
+        for path in paths:
+            try:
+                os.unlink(path)
+            except OSError:
+                pass
+
+
+class ProfileStore:
+    """Directory of .prof files capped at max_files and max_bytes; the oldest go first"""
+
+    def __init__(self, directory: str, max_files: int = 50, max_bytes: int = 50 * 1024 * 1024):
+        self.directory = Path(directory)
+        self.max_files = max_files
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        # Names announced in X-Profile-Id whose file is not written yet
+        self._pending = set()
+
+    def expect(self, name: str):
+        self._pending.add(name)
+
+    def cancel(self, name: str):
+        self._pending.discard(name)
+
+    def is_pending(self, name: str) -> bool:
+        return name in self._pending
+
+    def save(self, profile: RequestProfile, name: str) -> Path:
+        try:
+            with self._lock:
+                self.directory.mkdir(parents=True, exist_ok=True)
+                path = self.directory / name
+                profile.stats().dump_stats(str(path))
+                self._prune()
+        finally:
+            self._pending.discard(name)
+        return path
+
+    def _prune(self):
+        files = sorted(self.directory.glob("*.prof"), key=lambda p: p.stat().st_mtime, reverse=True)
+        total = 0
+        for index, path in enumerate(files):
+            total += path.stat().st_size
+            if index >= self.max_files or total > self.max_bytes:
+                path.unlink(missing_ok=True)
+
+    def list(self) -> List[Dict]:
+        if not self.directory.is_dir():
+            return []
+        files = sorted(self.directory.glob("*.prof"), key=lambda p: p.stat().st_mtime, reverse=True)
+        return [{
+            "name": path.name,
+            "bytes": path.stat().st_size,
+            "created": datetime.fromtimestamp(path.stat().st_mtime, timezone.utc).isoformat(),
+        } for path in files]
+
+    def path(self, name: str) -> Optional[Path]:
+        """Path of a stored profile, or None for an unknown (or unsafe) name"""
+        if not PROFILE_NAME.match(name):
+            return None
+        path = self.directory / name
+        return path if path.is_file() else None
+
+
+def summary(path: Path, sort: str = "cumulative", limit: int = 60) -> str:
+    """pstats text report of a stored profile"""
+    from io import StringIO
+    out = StringIO()
+    pstats.Stats(str(path), stream=out).strip_dirs().sort_stats(sort).print_stats(limit)
+    return out.getvalue()
+
+
+class ProfilingMiddleware:
+    """
+    Pure ASGI middleware profiling requests selected by token or sampling.
+
+    A profiled response carries X-Profile-Id with the file name to fetch
+    from GET /api/profiles/{name}. The header goes out with the response
+    start, but the profile is only complete once the response body has
+    been sent, so it is written afterwards on the default executor; until
+    then the endpoint answers 409 with Retry-After. Sampled profiles
+    shorter than min_duration seconds are dropped (and then 404);
+    token-requested ones are always kept.
+    """
+
+    def __init__(self, app, store: 'ProfileStore', token: Optional[str] = None,
+                 sample_rate: float = 0.0, min_duration: float = 0.0):
+        self.app = app
+        self.store = store
+        self.token = token.encode() if token else None
+        self.sample_rate = sample_rate
+        self.min_duration = min_duration
+        self._busy = threading.Lock()
+
+    def _requested(self, scope) -> bool:
+        if self.token is None:
+            return False
+        for key, value in scope["headers"]:
+            if key == HEADER:
+                return hmac.compare_digest(value, self.token)
+        return False
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        requested = self._requested(scope)
+        if not (requested or (self.sample_rate > 0 and random.random() < self.sample_rate)):
+            await self.app(scope, receive, send)
+            return
+        if not self._busy.acquire(blocking=False):
+            logger.info(f"Not profiling {scope['method']} {scope['path']}: another profile is running")
+            await self.app(scope, receive, send)
+            return
+
+        started = datetime.now(timezone.utc)
+        slug = re.sub(r"[^\w-]+", "-", scope["path"]).strip("-")[:60] or "root"
+        name = f"{started:%Y%m%dT%H%M%S}-{uuid.uuid4().hex[:8]}_{scope['method']}_{slug}.prof"
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                message["headers"] = list(message.get("headers", [])) + [
+                    (b"x-profile-id", name.encode())]
+                self.store.expect(name)
+            await send(message)
+
+        profile = RequestProfile()
+        token = _current.set(profile)
+        start = time.perf_counter()
+        profile.loop_profile.enable()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            profile.loop_profile.disable()
+            _current.reset(token)
+            elapsed = time.perf_counter() - start
+            try:
+                if requested or elapsed >= self.min_duration:
+                    # pstats merging and the file write stay off the event loop
+                    path = await asyncio.get_running_loop().run_in_executor(
+                        None, self.store.save, profile, name)
+                    logger.info(f"Saved request profile {path} ({elapsed * 1000:.0f}ms)")
+                else:
+                    self.store.cancel(name)
+            except Exception as e:
+                self.store.cancel(name)
+                logger.warning(f"Failed to save request profile: {e}")
+            finally:
+                profile.discard_parts()
+                self._busy.release()
+
+
+profile_store = ProfileStore(
+    os.getenv('PROFILE_DIR') or os.path.join(tempfile.gettempdir(), "request-profiles"),
+    max_files=int(os.getenv('PROFILE_MAX_FILES', '50')),
+    max_bytes=int(os.getenv('PROFILE_MAX_MB', '50')) * 1024 * 1024
+)
@@ -0,0 +1,208 @@
+# src/visualization/answer_table.py
+"""
+Precompiled /api/analyze results for every possible combination of answers.
+
+Six questions with up to five responses each (plus "unanswered") give a
+finite space of 6^6 answer vectors. The build step scores all of them with
+ScoreEngine, deduplicates the outcomes and stores a packed uint16 index
+(answer vector -> result id) next to the distinct scores and classifications.
+Category texts are stored only as template keys and resolved against
+response_templates.json when the table is loaded.
+
+The artifact records the content store version (a hash of both data files);
+a stale or missing artifact is rebuilt automatically, and the in-process
+table follows content store reloads. Build it ahead of time with:
+
+    python -m src.visualization.answer_table
+"""
+
+from typing import Dict, Optional
+import itertools
+import logging
+import threading
+from pathlib import Path
+
+import numpy as np
+
+from src.data.content_store import ContentSnapshot, content_store
+from src.visualization.perspective_analyzer import PerspectiveAnalyzer
+from src.visualization.score_engine import ScoreEngine, STRENGTHS
+
+logger = logging.getLogger(__name__)
+
+DATA_DIR = Path(__file__).parent.parent / "data"
+QUESTIONS_PATH = DATA_DIR / "questions_responses.json"
+TEMPLATES_PATH = DATA_DIR / "response_templates.json"
+ARTIFACT_PATH = DATA_DIR / "answer_table.npz"
+
+# Index value for answer vectors that cannot be analyzed (nothing answered)
+NO_RESULT = np.iinfo(np.uint16).max
+
+
+def build_artifact(questions_data: Dict) -> Dict[str, np.ndarray]:
+    """Score every answer vector and return the packed arrays"""
+    engine = ScoreEngine(questions_data)
+    radix = engine.score_tensor.shape[1]
+    combos = np.array(
+        list(itertools.product(range(radix), repeat=len(engine.question_ids))), dtype=np.int8
+    )
+    # itertools varies the last question fastest; flip so question i has weight radix**i
+    combos = combos[:, ::-1]
+    batch = engine.score(combos)
+
+    # Deduplicate outcomes: one row per distinct (scores, classification)
+    outcome = np.column_stack([
+        batch.scores, batch.primary, batch.strength, batch.secondary, batch.valid
+    ])
+    outcomes, index = np.unique(outcome, axis=0, return_inverse=True)
+    index = index.reshape(-1).astype(np.uint16)
+
+    valid = outcomes[:, 6].astype(bool)
+    remap = np.full(len(outcomes), NO_RESULT, dtype=np.uint16)
+    remap[valid] = np.arange(valid.sum(), dtype=np.uint16)
+    outcomes = outcomes[valid]
+
+    return {
+        'index': remap[index],
+        'scores': outcomes[:, 0:3],
+        'classes': outcomes[:, 3:6].astype(np.int8),
+        'question_ids': np.array(engine.question_ids),
+        'radix': np.array(radix),
+    }
+
+
+class AnswerTable:
+    """O(1) lookup of the full /api/analyze payload for an answer dict"""
+
+    def __init__(self, arrays: Dict[str, np.ndarray], templates: Dict, source: str):
+        self.source_hash = source
+        self.radix = int(arrays['radix'])
+        self.question_ids = [str(q) for q in arrays['question_ids']]
+        self._weights = {q_id: self.radix ** i for i, q_id in enumerate(self.question_ids)}
+        self._index = arrays['index']
+
+        category_cache = {}
+        self._payloads = []
+        for scores, classes in zip(arrays['scores'], arrays['classes']):
+            primary, strength, secondary = (int(x) for x in classes)
+            scores = [float(x) for x in scores]
+            analysis = {
+                'primary': PerspectiveAnalyzer.CATEGORIES[primary],
+                'strength': STRENGTHS[strength],
+                'secondary': PerspectiveAnalyzer.CATEGORIES[secondary] if secondary >= 0 else None,
+                'scores': scores
+            }
+            template_key = PerspectiveAnalyzer.get_perspective_type(analysis)
+            if template_key not in category_cache:
+                category_cache[template_key] = PerspectiveAnalyzer.get_template_responses(
+                    analysis, templates
+                )
+            self._payloads.append({
+                "status": "success",
+                "perspective": PerspectiveAnalyzer.get_perspective_description(analysis),
+                "scores": scores,
+                "analysis": analysis,
+                "category_responses": category_cache[template_key]
+            })
+
+    def key(self, responses: Dict) -> Optional[int]:
+        """Pack an answer dict into a table index, or None if it needs the slow path"""
+        key = 0
+        seen = set()
+        for q_id, response_num in responses.items():
+            if response_num is None:
+                continue
+            question_key = q_id.replace("_response", "").upper()
+            weight = self._weights.get(question_key)
+            if weight is None:
+                continue
+            if type(response_num) is not int or question_key in seen:
+                return None
+            seen.add(question_key)
+            if 1 <= response_num < self.radix:
+                key += response_num * weight
+        return key
+
+    def lookup(self, responses: Dict) -> Optional[Dict]:
+        """Return the precomputed analysis payload, or None to fall back"""
+        key = self.key(responses)
+        if key is None:
+            return None
+        result_id = self._index[key]
+        if result_id == NO_RESULT:
+            return None
+        return dict(self._payloads[result_id])
+
+
+def load_or_build(snapshot: ContentSnapshot = None, artifact_path: Path = ARTIFACT_PATH,
+                  save: bool = True, rebuild: bool = False) -> AnswerTable:
+    """Load the artifact if it matches the survey content, otherwise rebuild it"""
+    if snapshot is None:
+        snapshot = ContentSnapshot(QUESTIONS_PATH.read_bytes(), TEMPLATES_PATH.read_bytes())
+    current = snapshot.version
+
+    arrays = None
+    if artifact_path.exists() and not rebuild:
+        try:
+            with np.load(artifact_path, allow_pickle=False) as stored:
+                if str(stored['source_hash']) == current:
+                    arrays = {name: stored[name] for name in stored.files}
+                else:
+                    logger.info("Answer table is stale, rebuilding")
+        except Exception as e:
+            logger.warning(f"Could not read answer table {artifact_path}: {e}")
+
+    if arrays is None:
+        arrays = build_artifact(snapshot.questions)
+        if save:
+            try:
+                np.savez_compressed(artifact_path, source_hash=np.array(current), **arrays)
+                logger.info(f"Wrote answer table to {artifact_path}")
+            except OSError as e:
+                # Read-only deploys (App Engine) keep the in-memory table only
+                logger.warning(f"Could not write answer table: {e}")
+
+    return AnswerTable(arrays, snapshot.templates, current)
+
+
+_table = None
+_table_lock = threading.Lock()
+_builder = None
+_builder_lock = threading.Lock()
+
+
+def get_answer_table() -> AnswerTable:
+    """Process-wide table, rebuilt whenever the content store reloads new data"""
+    global _table
+    with _table_lock:
+        snapshot = content_store.snapshot()
+        if _table is None or _table.source_hash != snapshot.version:
+            _table = load_or_build(snapshot)
+        return _table
+
+
+def answer_table_if_ready() -> Optional[AnswerTable]:
+    """The current table without blocking; None while it is (re)built on a background thread"""
+    global _builder
+    table = _table
+    if table is not None and table.source_hash == content_store.snapshot().version:
+        return table
+    with _builder_lock:
+        # A builder queued behind a running build (e.g. the warm-up) finds the table ready
+        if _builder is None or not _builder.is_alive():
+            _builder = threading.Thread(target=_build, name="answer-table-build", daemon=True)
+            _builder.start()
+    return None
+
+
+def _build():
+    try:
+        get_answer_table()
+    except Exception as e:
+        logger.error(f"Could not build answer table: {e}")
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    table = load_or_build(rebuild=True)
+    print(f"{len(table._index)} answer vectors, {len(table._payloads)} distinct results")
@@ -0,0 +1,170 @@
+# src/visualization/pdf_cache.py
+
+from collections import OrderedDict
+from typing import Dict, List, Optional
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import threading
+from datetime import datetime
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+
+def make_cache_key(perspective: str, scores: List[float], category_responses: Dict[str, str],
+                   plot_image: Optional[bytes] = None, generated_on: str = None) -> str:
+    """
+    Content hash of everything that ends up in the rendered PDF.
+
+    Scores are normalized to the one-decimal form the report prints, the
+    plot is represented by a hash of its decoded bytes, and the report date
+    is included because it is printed on the first page.
+    """
+    if generated_on is None:
+        generated_on = datetime.now().strftime("%Y-%m-%d")
+    normalized = {
+        "perspective": perspective.strip(),
+        "scores": [f"{score:.1f}" for score in scores],
+        "categories": [[category, text] for category, text in category_responses.items()],
+        "plot": hashlib.sha256(plot_image).hexdigest() if plot_image else None,
+        "date": generated_on,
+    }
+    encoded = json.dumps(normalized, separators=(",", ":"), ensure_ascii=False).encode()
+    return hashlib.sha256(encoded).hexdigest()
+
+
+class PDFRenderCache:
+    """
+    Two-tier cache of rendered PDF reports.
+
+    The memory tier is an LRU bounded by total bytes. The optional disk tier
+    stores one file per key under disk_dir and evicts the least recently
+    used files once disk_max_bytes is exceeded. Disk hits are promoted to
+    memory. Counters are exposed through stats() for sizing.
+    """
+
+    def __init__(self, max_bytes: int = 32 * 1024 * 1024, disk_dir: str = None,
+                 disk_max_bytes: int = 256 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self.disk_max_bytes = disk_max_bytes
+        self.disk_dir = Path(disk_dir) if disk_dir else None
+        self._memory = OrderedDict()
+        self._memory_bytes = 0
+        self._disk = OrderedDict()
+        self._disk_bytes = 0
+        self._lock = threading.Lock()
+        self._counters = {
+            "memory_hits": 0, "disk_hits": 0, "misses": 0,
+            "memory_evictions": 0, "disk_evictions": 0, "stores": 0,
+        }
+        if self.disk_dir:
+            try:
+                self.disk_dir.mkdir(parents=True, exist_ok=True)
+                self._scan_disk()
+            except OSError as e:
+                logger.warning(f"PDF disk cache disabled, {self.disk_dir} unusable: {e}")
+                self.disk_dir = None
+
+    def _scan_disk(self):
+        """Rebuild the disk index (oldest first) from files left by a previous process"""
+        entries = []
+        for path in self.disk_dir.glob("*.pdf"):
+            stat = path.stat()
+            entries.append((stat.st_mtime, path.stem, stat.st_size))
+        for _, key, size in sorted(entries):
+            self._disk[key] = size
+            self._disk_bytes += size
+        self._evict_disk()
+
+    def _disk_path(self, key: str) -> Path:
+        return self.disk_dir / f"{key}.pdf"
+
+    def _store_memory(self, key: str, data: bytes):
+        if len(data) > self.max_bytes:
+            return
+        if key in self._memory:
+            self._memory_bytes -= len(self._memory.pop(key))
+        self._memory[key] = data
+        self._memory_bytes += len(data)
+        while self._memory_bytes > self.max_bytes:
+            _, evicted = self._memory.popitem(last=False)
+            self._memory_bytes -= len(evicted)
+            self._counters["memory_evictions"] += 1
+
+    def _evict_disk(self):
+        while self._disk_bytes > self.disk_max_bytes and self._disk:
+            key, size = self._disk.popitem(last=False)
+            self._disk_bytes -= size
+            self._counters["disk_evictions"] += 1
+            try:
+                self._disk_path(key).unlink()
+            except OSError as e:
+                logger.warning(f"Could not remove cached PDF {key}: {e}")
+
+    def get(self, key: str) -> Optional[bytes]:
+        with self._lock:
+            data = self._memory.get(key)
+            if data is not None:
+                self._memory.move_to_end(key)
+                self._counters["memory_hits"] += 1
+                return data
+
+            if self.disk_dir and key in self._disk:
+                try:
+                    data = self._disk_path(key).read_bytes()
+                    # The mtime orders the LRU scan after a restart
+                    os.utime(self._disk_path(key))
+                except OSError:
+                    # Evicted by another worker, or the file system is read-only
+                    self._disk_bytes -= self._disk.pop(key)
+                else:
+                    self._disk.move_to_end(key)
+                    self._store_memory(key, data)
+                    self._counters["disk_hits"] += 1
+                    return data
+
+            self._counters["misses"] += 1
+            return None
+
+    def put(self, key: str, data: bytes):
+        with self._lock:
+            self._store_memory(key, data)
+            self._counters["stores"] += 1
+            if not self.disk_dir or key in self._disk or len(data) > self.disk_max_bytes:
+                return
+            try:
+                fd, tmp_path = tempfile.mkstemp(dir=self.disk_dir, suffix=".tmp")
+                with os.fdopen(fd, "wb") as f:
+                    f.write(data)
+                os.replace(tmp_path, self._disk_path(key))
+            except OSError as e:
+                logger.warning(f"Could not write cached PDF {key}: {e}")
+                return
+            self._disk[key] = len(data)
+            self._disk_bytes += len(data)
+            self._evict_disk()
+
+    def stats(self) -> Dict:
+        with self._lock:
+            lookups = self._counters["memory_hits"] + self._counters["disk_hits"] + self._counters["misses"]
+            hits = lookups - self._counters["misses"]
+            return {
+                **self._counters,
+                "hit_ratio": round(hits / lookups, 4) if lookups else None,
+                "memory_entries": len(self._memory),
+                "memory_bytes": self._memory_bytes,
+                "memory_max_bytes": self.max_bytes,
+                "disk_entries": len(self._disk),
+                "disk_bytes": self._disk_bytes,
+                "disk_max_bytes": self.disk_max_bytes if self.disk_dir else 0,
+            }
+
+
+pdf_cache = PDFRenderCache(
+    max_bytes=int(os.getenv('PDF_CACHE_MAX_BYTES', str(32 * 1024 * 1024))),
+    disk_dir=os.getenv('PDF_CACHE_DIR') or None,
+    disk_max_bytes=int(os.getenv('PDF_CACHE_DISK_MAX_BYTES', str(256 * 1024 * 1024)))
+)
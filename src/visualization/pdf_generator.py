@@ -8,6 +8,8 @@ import os
 import logging
 from datetime import datetime
 
+from src.visualization.plot_renderer import parse_png
+
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
@@ -20,7 +22,17 @@ class ModernityPDFReport:
         self.pdf.set_left_margin(15)
         self.pdf.set_right_margin(15)
 
-    def create_first_page(self, perspective: str, scores: List[float], plot_image_path: str = None):
+    def register_image(self, name: str, data: bytes):
+        """Make in-memory PNG bytes available to pdf.image(name) without a temp file"""
+        if name not in self.pdf.images:
+            info = parse_png(data)
+            info['i'] = len(self.pdf.images) + 1
+            self.pdf.images[name] = info
+            if 'smask' in info and self.pdf.pdf_version < '1.4':
+                self.pdf.pdf_version = '1.4'
+
+    def create_first_page(self, perspective: str, scores: List[float], plot_image_path: str = None,
+                          plot_image: bytes = None):
         """Create the complete first page in the correct sequence"""
         # Title and date
         self.pdf.set_font("Arial", style="B", size=24)
@@ -33,7 +45,11 @@ class ModernityPDFReport:
         self.pdf.ln(5)
         
         # Visualisation
-        if plot_image_path and os.path.exists(plot_image_path):
+        if plot_image:
+            self.register_image('plot.png', plot_image)
+            self.pdf.image('plot.png', x=25, w=160)
+            self.pdf.ln(10)
+        elif plot_image_path and os.path.exists(plot_image_path):
             self.pdf.image(plot_image_path, x=25, w=160)
             self.pdf.ln(10)
             
@@ -93,13 +109,18 @@ class ModernityPDFReport:
             self.pdf.ln(5)
 
 def generate_pdf_report(perspective: str, scores: List[float], 
-                       category_responses: Dict[str, str], plot_image_path: str = None) -> bytes:
-    """Generate the complete PDF report"""
+                       category_responses: Dict[str, str], plot_image_path: str = None,
+                       plot_image: bytes = None) -> bytes:
+    """Generate the complete PDF report.
+
+    plot_image takes PNG bytes to embed straight from memory; plot_image_path
+    is still accepted for images already on disk.
+    """
     try:
         report = ModernityPDFReport()
         
         # Create first page with all elements in sequence
-        report.create_first_page(perspective, scores, plot_image_path)
+        report.create_first_page(perspective, scores, plot_image_path, plot_image)
         
         # Add category analysis on the second page
         report.add_category_analysis(category_responses)
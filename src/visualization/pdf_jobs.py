@@ -0,0 +1,199 @@
+# src/visualization/pdf_jobs.py
+
+from typing import Any, Awaitable, Callable, Dict, Optional
+import asyncio
+import logging
+import os
+import time
+import uuid
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+
+class PDFJobQueueFull(RuntimeError):
+    """Raised when the job queue is at capacity"""
+
+
+class MemoryResultBackend:
+    """Keeps finished PDFs in process memory"""
+
+    blocking = False
+
+    def __init__(self):
+        self._results = {}
+
+    def put(self, job_id: str, data: bytes):
+        self._results[job_id] = data
+
+    def get(self, job_id: str) -> Optional[bytes]:
+        return self._results.get(job_id)
+
+    def delete(self, job_id: str):
+        self._results.pop(job_id, None)
+
+
+class FileResultBackend:
+    """Writes finished PDFs to a local directory (e.g. /tmp on App Engine)"""
+
+    # File I/O; PDFJobManager runs it on the default executor, off the event loop
+    blocking = True
+
+    def __init__(self, directory: str):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+    def _path(self, job_id: str) -> Path:
+        return self.directory / f"{job_id}.pdf"
+
+    def put(self, job_id: str, data: bytes):
+        tmp_path = self._path(job_id).with_suffix(".tmp")
+        tmp_path.write_bytes(data)
+        os.replace(tmp_path, self._path(job_id))
+
+    def get(self, job_id: str) -> Optional[bytes]:
+        try:
+            return self._path(job_id).read_bytes()
+        except FileNotFoundError:
+            return None
+
+    def delete(self, job_id: str):
+        try:
+            self._path(job_id).unlink()
+        except FileNotFoundError:
+            pass
+
+
+class PDFJob:
+    def __init__(self, job_id: str, payload: Any):
+        self.job_id = job_id
+        self.payload = payload
+        self.status = "queued"
+        self.error = None
+        self.size = None
+        self.created_at = time.time()
+        self.finished_at = None
+
+    def to_dict(self) -> Dict:
+        return {
+            "job_id": self.job_id,
+            "status": self.status,
+            "error": self.error,
+            "size": self.size,
+            "created_at": self.created_at,
+            "finished_at": self.finished_at,
+        }
+
+
+class PDFJobManager:
+    """
+    Bounded in-process queue of PDF render jobs.
+
+    submit() enqueues a job and returns immediately with its id; a fixed
+    number of asyncio workers drain the queue through the supplied render
+    coroutine (which itself uses the render cache and process pool). Job
+    metadata and results expire ttl seconds after the job finishes.
+    """
+
+    def __init__(self, render: Callable[[Any], Awaitable[bytes]], workers: int = 2,
+                 max_queue: int = 100, ttl: float = 900.0, result_dir: str = None):
+        self.render = render
+        self.workers = workers
+        self.ttl = ttl
+        self.backend = FileResultBackend(result_dir) if result_dir else MemoryResultBackend()
+        self._queue = None
+        self._max_queue = max_queue
+        self._jobs: Dict[str, PDFJob] = {}
+        self._tasks = []
+
+    def start(self):
+        """Start the worker tasks; must be called from the running event loop"""
+        if self._tasks:
+            return
+        self._queue = asyncio.Queue(maxsize=self._max_queue)
+        self._tasks = [asyncio.create_task(self._worker(i)) for i in range(self.workers)]
+        logger.info(f"PDF job queue started with {self.workers} workers")
+
+    async def stop(self):
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    def submit(self, payload: Any) -> PDFJob:
+        if not self._tasks:
+            self.start()
+        self.purge_expired()
+        job = PDFJob(uuid.uuid4().hex, payload)
+        try:
+            self._queue.put_nowait(job)
+        except asyncio.QueueFull:
+            raise PDFJobQueueFull(f"PDF job queue full ({self._queue.qsize()} jobs waiting)")
+        self._jobs[job.job_id] = job
+        return job
+
+    def get(self, job_id: str) -> Optional[PDFJob]:
+        job = self._jobs.get(job_id)
+        if job is not None and self._expired(job):
+            self._forget(job)
+            return None
+        return job
+
+    async def result(self, job: PDFJob) -> Optional[bytes]:
+        if job.status != "done":
+            return None
+        return await self._backend_call(self.backend.get, job.job_id)
+
+    async def _backend_call(self, method: Callable, *args):
+        if not self.backend.blocking:
+            return method(*args)
+        return await asyncio.get_running_loop().run_in_executor(None, method, *args)
+
+    def queue_position(self, job: PDFJob) -> Optional[int]:
+        if job.status != "queued":
+            return None
+        waiting = [j for j in self._jobs.values() if j.status == "queued"]
+        return sorted(waiting, key=lambda j: j.created_at).index(job) + 1
+
+    def _expired(self, job: PDFJob) -> bool:
+        return job.finished_at is not None and time.time() - job.finished_at > self.ttl
+
+    def _forget(self, job: PDFJob):
+        self._jobs.pop(job.job_id, None)
+        if self.backend.blocking:
+            asyncio.get_running_loop().run_in_executor(None, self.backend.delete, job.job_id)
+        else:
+            self.backend.delete(job.job_id)
+
+    def purge_expired(self):
+        for job in [j for j in self._jobs.values() if self._expired(j)]:
+            self._forget(job)
+
+    async def _worker(self, index: int):
+        while True:
+            job = await self._queue.get()
+            job.status = "running"
+            try:
+                data = await self.render(job.payload)
+                await self._backend_call(self.backend.put, job.job_id, data)
+                job.size = len(data)
+                job.status = "done"
+            except Exception as e:
+                logger.error(f"PDF job {job.job_id} failed: {e}")
+                job.status = "failed"
+                job.error = str(e)
+            finally:
+                job.finished_at = time.time()
+                job.payload = None
+                self._queue.task_done()
+
+    def stats(self) -> Dict:
+        counts = {}
+        for job in self._jobs.values():
+            counts[job.status] = counts.get(job.status, 0) + 1
+        return {
+            "workers": self.workers,
+            "queued": self._queue.qsize() if self._queue else 0,
+            "max_queue": self._max_queue,
+            "jobs": counts,
+        }
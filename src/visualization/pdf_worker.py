@@ -0,0 +1,189 @@
+# src/visualization/pdf_worker.py
+
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Dict, List, Optional
+import asyncio
+import logging
+import multiprocessing
+import os
+import threading
+import time
+
+from src.monitoring import profiling
+
+logger = logging.getLogger(__name__)
+
+
+class PDFPoolSaturated(RuntimeError):
+    """Raised when every worker is busy and the wait queue is full"""
+
+
+class PDFRenderTimeout(RuntimeError):
+    """Raised when a render job exceeds the per-job timeout"""
+
+
+def _init_worker():
+    """Pre-import FPDF, matplotlib and the report modules so the first job pays no import cost"""
+    import fpdf  # noqa: F401
+    import src.visualization.pdf_generator  # noqa: F401
+    import src.visualization.plot_renderer  # noqa: F401
+    import matplotlib.backends.backend_agg  # noqa: F401
+
+
+def _warm() -> int:
+    return os.getpid()
+
+
+def _render(perspective: str, scores: List[float], category_responses: Dict[str, str],
+            plot_image: Optional[bytes] = None, render_plot: bool = False,
+            profile_path: Optional[str] = None) -> bytes:
+    if profile_path is not None:
+        # Profiled where it runs (often another process) and merged by the requesting process
+        import cProfile
+        profile = cProfile.Profile()
+        try:
+            return profile.runcall(_render, perspective, scores, category_responses,
+                                   plot_image, render_plot)
+        finally:
+            profile.dump_stats(profile_path)
+    from src.visualization.pdf_generator import generate_pdf_report
+    from src.visualization.plot_renderer import render_plot_png
+    if plot_image is None and render_plot:
+        plot_image = render_plot_png(scores)
+    return generate_pdf_report(perspective, scores, category_responses, plot_image=plot_image)
+
+
+class PDFWorkerPool:
+    """
+    Renders PDF reports in a pool of worker processes.
+
+    FPDF layout and image embedding are CPU-bound, so rendering inline would
+    block the event loop. At most workers + max_queue jobs are admitted at
+    once; beyond that render() raises PDFPoolSaturated so the route can
+    answer 503. A job that exceeds timeout raises PDFRenderTimeout, but its
+    slot is only released once the worker process really finishes.
+
+    A timed-out job or a crashed worker (BrokenProcessPool) retires the
+    executor: new jobs go to a fresh set of workers, the old executor's
+    other jobs get the render timeout to finish, and whatever is still
+    running after that (the hung worker) is terminated. A job that hit a
+    crashed pool is retried once on the new one.
+    With workers=0 jobs run on the event loop's default thread pool instead.
+    """
+
+    def __init__(self, workers: int = 2, max_queue: int = 8, timeout: float = 30.0,
+                 start_method: str = "spawn"):
+        self.workers = workers
+        self.capacity = max(workers, 1) + max_queue
+        self.timeout = timeout
+        self.start_method = start_method
+        self.in_flight = 0
+        self.rejected = 0
+        self.timed_out = 0
+        self.restarts = 0
+        self._executor = None
+        self._start_lock = threading.Lock()
+
+    def start(self) -> Optional[ProcessPoolExecutor]:
+        """Create the worker processes and import FPDF in each of them"""
+        with self._start_lock:
+            if self._executor is not None or self.workers <= 0:
+                return self._executor
+            executor = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=multiprocessing.get_context(self.start_method),
+                initializer=_init_worker
+            )
+            pids = {f.result() for f in [executor.submit(_warm) for _ in range(self.workers)]}
+            self._executor = executor
+        logger.info(f"PDF worker pool started with {self.workers} workers ({len(pids)} warm)")
+        return executor
+
+    def _release(self, _future=None):
+        self.in_flight -= 1
+
+    def _retire(self, executor: ProcessPoolExecutor, reason: str):
+        """Stop routing jobs to executor and terminate its workers once the grace period ends"""
+        with self._start_lock:
+            if self._executor is not executor:
+                return  # already replaced by another job's failure
+            self._executor = None
+            self.restarts += 1
+        logger.warning(f"Restarting PDF worker pool: {reason}")
+        threading.Thread(target=self._stop_executor, args=(executor, self.timeout),
+                         name='pdf-pool-reaper', daemon=True).start()
+
+    @staticmethod
+    def _stop_executor(executor: ProcessPoolExecutor, grace: float):
+        processes = list((executor._processes or {}).values())
+        executor.shutdown(wait=False)
+        deadline = time.monotonic() + grace
+        for process in processes:
+            process.join(timeout=max(deadline - time.monotonic(), 0))
+            if process.is_alive():
+                logger.warning(f"Terminating stuck PDF worker {process.pid}")
+                process.terminate()
+
+    async def _run(self, loop, args) -> bytes:
+        executor = None
+        if self.workers > 0:
+            executor = self._executor or await loop.run_in_executor(None, self.start)
+        try:
+            future = loop.run_in_executor(executor, _render, *args)
+        except BrokenProcessPool:
+            self._retire(executor, "worker process died")
+            raise
+        self.in_flight += 1
+        future.add_done_callback(self._release)
+        try:
+            return await asyncio.wait_for(asyncio.shield(future), timeout=self.timeout)
+        except asyncio.TimeoutError:
+            self.timed_out += 1
+            if executor is not None:
+                self._retire(executor, f"a render exceeded {self.timeout:.0f}s")
+            raise PDFRenderTimeout(f"PDF render exceeded {self.timeout:.0f}s")
+        except BrokenProcessPool:
+            self._retire(executor, "worker process died")
+            raise
+
+    async def render(self, perspective: str, scores: List[float],
+                     category_responses: Dict[str, str], plot_image: bytes = None,
+                     render_plot: bool = False) -> bytes:
+        """Render a report; with render_plot the plot is drawn (and cached) in the worker"""
+        if self.in_flight >= self.capacity:
+            self.rejected += 1
+            raise PDFPoolSaturated(f"PDF renderer busy ({self.in_flight} jobs in flight)")
+
+        loop = asyncio.get_running_loop()
+        request_profile = profiling.current()
+        profile_path = request_profile.part_path() if request_profile is not None else None
+        args = (perspective, scores, category_responses, plot_image, render_plot, profile_path)
+        try:
+            return await self._run(loop, args)
+        except BrokenProcessPool:
+            # Usually another job crashed the worker (OOM, segfault); try once on fresh workers
+            return await self._run(loop, args)
+
+    def stats(self) -> Dict:
+        return {
+            "workers": self.workers,
+            "capacity": self.capacity,
+            "in_flight": self.in_flight,
+            "rejected": self.rejected,
+            "timed_out": self.timed_out,
+            "restarts": self.restarts,
+        }
+
+    def shutdown(self, wait: bool = True):
+        if self._executor is not None:
+            self._executor.shutdown(wait=wait)
+            self._executor = None
+
+
+pdf_pool = PDFWorkerPool(
+    workers=int(os.getenv('PDF_WORKERS', '2')),
+    max_queue=int(os.getenv('PDF_MAX_QUEUE', '8')),
+    timeout=float(os.getenv('PDF_RENDER_TIMEOUT', '30')),
+    start_method=os.getenv('PDF_WORKER_START_METHOD', 'spawn')
+)
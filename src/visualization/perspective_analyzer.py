@@ -1,6 +1,6 @@
 from typing import Dict, List
-import json
-from pathlib import Path
+
+from src.data.content_store import content_store
 
 class PerspectiveAnalyzer:
     """Analyzes survey responses to determine perspective types and provide template responses"""
@@ -42,28 +42,42 @@ class PerspectiveAnalyzer:
         return description
 
     @staticmethod
-    def get_template_responses(analysis: Dict) -> Dict[str, str]:
+    def get_perspective_type(analysis: Dict) -> str:
+        """
+        Determine the template key for an analysis, e.g. 'Modern' or 'PreModern-Modern'.
+        
+        Args:
+            analysis: Dictionary from get_perspective_summary()
+            
+        Returns:
+            Perspective type used to select category templates
+        """
+        perspective_type = analysis['primary']
+        if analysis['strength'] != 'Strong' and analysis['secondary']:
+            perspective_type = f"{analysis['primary']}-{analysis['secondary']}"
+        elif analysis['strength'] == 'Mixed':
+            perspective_type = 'Modern-Balanced'
+        return perspective_type
+
+    @staticmethod
+    def get_template_responses(analysis: Dict, templates: Dict = None) -> Dict[str, str]:
         """
         Get appropriate template responses for each category based on analysis.
         
         Args:
             analysis: Dictionary from get_perspective_summary()
+            templates: Optional "categories" mapping; defaults to the content store
             
         Returns:
             Dictionary mapping category names to template responses
         """
         try:
             # Load templates
-            template_path = Path(__file__).parent.parent / "data" / "response_templates.json"
-            with open(template_path) as f:
-                templates = json.load(f)["categories"]
+            if templates is None:
+                templates = content_store.snapshot().templates
 
             # Determine perspective type for template lookup
-            perspective_type = analysis['primary']
-            if analysis['strength'] != 'Strong' and analysis['secondary']:
-                perspective_type = f"{analysis['primary']}-{analysis['secondary']}"
-            elif analysis['strength'] == 'Mixed':
-                perspective_type = 'Modern-Balanced'
+            perspective_type = PerspectiveAnalyzer.get_perspective_type(analysis)
 
             # Get responses for each category
             responses = {}
@@ -0,0 +1,161 @@
+# src/visualization/plot_renderer.py
+
+from functools import lru_cache
+from typing import Dict, List, Tuple
+import io
+import struct
+import zlib
+
+import numpy as np
+
+# Same geometry as the TernaryPlot component in templates/index.html
+WIDTH = 800
+HEIGHT = 700
+MARGIN = 50
+VERTICES = {
+    'top': (WIDTH / 2, MARGIN),                 # Modern
+    'left': (MARGIN, HEIGHT - MARGIN),          # PostModern
+    'right': (WIDTH - MARGIN, HEIGHT - MARGIN)  # PreModern
+}
+
+
+def ternary_to_cartesian(pre: float, mod: float, post: float) -> Tuple[float, float]:
+    """Map [PreModern, Modern, PostModern] scores to pixel coordinates"""
+    total = pre + mod + post
+    weights = {'right': pre / total, 'top': mod / total, 'left': post / total}
+    x = sum(VERTICES[v][0] * w for v, w in weights.items())
+    y = sum(VERTICES[v][1] * w for v, w in weights.items())
+    return x, y
+
+
+def _point_on_edge(start, end, ratio):
+    return (start[0] + (end[0] - start[0]) * ratio, start[1] + (end[1] - start[1]) * ratio)
+
+
+def _draw(ax, scores: Tuple[float, float, float]):
+    top, left, right = VERTICES['top'], VERTICES['left'], VERTICES['right']
+
+    # Strong (>70%) and moderate (50-70%) shading around each vertex
+    for vertex, edge1, edge2 in ((top, left, right), (right, top, left), (left, top, right)):
+        p70a, p70b = _point_on_edge(vertex, edge1, 0.3), _point_on_edge(vertex, edge2, 0.3)
+        p50a, p50b = _point_on_edge(vertex, edge1, 0.5), _point_on_edge(vertex, edge2, 0.5)
+        ax.fill(*zip(vertex, p70a, p70b), color='#90EE90', alpha=0.2, linewidth=0)
+        ax.fill(*zip(p70a, p50a, p50b, p70b), color='#E8EB10', alpha=0.2, linewidth=0)
+
+    # 10% grid lines parallel to each edge
+    for i in range(1, 10):
+        ratio = i / 10
+        for a, b in ((_point_on_edge(left, top, ratio), _point_on_edge(right, top, ratio)),
+                     (_point_on_edge(left, right, ratio), _point_on_edge(top, right, ratio)),
+                     (_point_on_edge(right, left, ratio), _point_on_edge(top, left, ratio))):
+            ax.plot(*zip(a, b), color='#ff0000', linewidth=1, alpha=0.4)
+
+    # Base triangle with ticks
+    ax.plot(*zip(left, top, right, left), color='black', linewidth=2)
+    for i in range(11):
+        ratio = i / 10
+        bx = left[0] + (right[0] - left[0]) * ratio
+        ax.plot([bx, bx], [left[1], left[1] + 5], color='black', linewidth=1)
+        lx, ly = _point_on_edge(left, top, ratio)
+        ax.plot([lx, lx - 5], [ly, ly], color='black', linewidth=1)
+        rx, ry = _point_on_edge(right, top, ratio)
+        ax.plot([rx, rx + 5], [ry, ry], color='black', linewidth=1)
+
+    # Labels
+    ax.text(left[0] + right[0] - 20, left[1] + 40, 'PreModern ▶', ha='right', va='baseline')
+    ax.text(MARGIN + 35, HEIGHT - MARGIN - 90, '◀ Postmodern', ha='right', va='baseline',
+            rotation=60, rotation_mode='anchor')
+    ax.text(right[0] - 305, HEIGHT - MARGIN - 550, '◀ Modern', ha='right', va='baseline',
+            rotation=-60, rotation_mode='anchor')
+
+    # 50% mix triangle
+    mix = (_point_on_edge(left, right, 0.5), _point_on_edge(left, top, 0.5),
+           _point_on_edge(right, top, 0.5))
+    ax.plot(*zip(*mix, mix[0]), color='#ff0000', linewidth=2)
+
+    # Respondent position
+    x, y = ternary_to_cartesian(*scores)
+    ax.scatter([x], [y], s=256, color='red', edgecolors='white', linewidths=2, zorder=5)
+
+
+@lru_cache(maxsize=512)
+def _render_cached(scores: Tuple[float, float, float]) -> bytes:
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    from matplotlib.figure import Figure
+    from PIL import Image
+
+    fig = Figure(figsize=(WIDTH / 100, HEIGHT / 100), dpi=100, facecolor='white')
+    canvas = FigureCanvasAgg(fig)
+    ax = fig.add_axes([0, 0, 1, 1])
+    ax.set_xlim(0, WIDTH)
+    ax.set_ylim(HEIGHT, 0)  # SVG-style y axis
+    ax.axis('off')
+    _draw(ax, scores)
+    canvas.draw()
+
+    # Drop the alpha channel: opaque RGB PNGs embed in FPDF without per-pixel work
+    rgb = np.asarray(canvas.buffer_rgba())[:, :, :3]
+    buffer = io.BytesIO()
+    Image.fromarray(rgb).save(buffer, format='PNG', optimize=False)
+    return buffer.getvalue()
+
+
+def render_plot_png(scores: List[float]) -> bytes:
+    """Render the worldview ternary plot for a score triplet as RGB PNG bytes (cached)"""
+    return _render_cached(tuple(round(float(s), 1) for s in scores))
+
+
+def parse_png(data: bytes) -> Dict:
+    """
+    Build the FPDF 1.7 image-info dict for a PNG held in memory.
+
+    Mirrors FPDF._parsepng, but reads from bytes instead of a file and
+    splits any alpha channel with NumPy rather than per-row regexes.
+    """
+    if data[:8] != b'\x89PNG\r\n\x1a\n':
+        raise ValueError('Not a PNG image')
+    pos = 8
+    pal, trns, idat = '', '', []
+    while pos < len(data):
+        length, chunk = struct.unpack('>I4s', data[pos:pos + 8])
+        body = data[pos + 8:pos + 8 + length]
+        pos += 12 + length
+        if chunk == b'IHDR':
+            w, h, bpc, ct, compression, filtering, interlace = struct.unpack('>IIBBBBB', body)
+            if bpc > 8:
+                raise ValueError('16-bit depth not supported')
+            if interlace:
+                raise ValueError('Interlacing not supported')
+        elif chunk == b'PLTE':
+            pal = body
+        elif chunk == b'tRNS':
+            if ct == 0:
+                trns = [body[1]]
+            elif ct == 2:
+                trns = [body[1], body[3], body[5]]
+            elif body.find(b'\x00') != -1:
+                trns = [body.find(b'\x00')]
+        elif chunk == b'IDAT':
+            idat.append(body)
+        elif chunk == b'IEND':
+            break
+
+    colspace = {0: 'DeviceGray', 2: 'DeviceRGB', 3: 'Indexed', 4: 'DeviceGray', 6: 'DeviceRGB'}[ct]
+    colors = 3 if colspace == 'DeviceRGB' else 1
+    info = {
+        'w': w, 'h': h, 'cs': colspace, 'bpc': bpc, 'f': 'FlateDecode',
+        'dp': f'/Predictor 15 /Colors {colors} /BitsPerComponent {bpc} /Columns {w}',
+        'pal': pal, 'trns': trns,
+    }
+    data = b''.join(idat)
+    if ct >= 4:
+        # Split filtered scanlines into colour and alpha planes, keeping the filter byte
+        channels = colors + 1
+        rows = np.frombuffer(zlib.decompress(data), dtype=np.uint8).reshape(h, 1 + w * channels)
+        filters, pixels = rows[:, :1], rows[:, 1:].reshape(h, w, channels)
+        color = np.hstack([filters, pixels[:, :, :colors].reshape(h, w * colors)])
+        alpha = np.hstack([filters, pixels[:, :, colors]])
+        data = zlib.compress(color.tobytes())
+        info['smask'] = zlib.compress(alpha.tobytes())
+    info['data'] = data
+    return info
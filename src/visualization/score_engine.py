@@ -0,0 +1,166 @@
+# src/visualization/score_engine.py
+
+from typing import Dict, List, Optional
+import json
+from pathlib import Path
+
+import numpy as np
+
+from src.data.content_store import content_store
+from src.visualization.perspective_analyzer import PerspectiveAnalyzer
+
+QUESTIONS_PATH = Path(__file__).parent.parent / "data" / "questions_responses.json"
+
+# Answer code used for unanswered or out-of-range responses
+UNANSWERED = 0
+
+STRENGTHS = ['Pure', 'Strong', 'Moderate', 'Mixed']
+
+
+def normalize_scores(total_scores: List[float]) -> List[float]:
+    """
+    Convert raw [PreModern, Modern, PostModern] totals into percentages.
+
+    Each score is rounded to one decimal place and any rounding drift is
+    folded into the PostModern score so the three always sum to 100.
+    """
+    total = sum(total_scores)
+    if total > 0:
+        normalized_scores = [round((score / total) * 100, 1) for score in total_scores]
+        adjustment = 100 - sum(normalized_scores)
+        normalized_scores[-1] += adjustment
+        return normalized_scores
+    return [0, 0, 0]
+
+
+class BatchScores:
+    """Column-oriented results for N scored response vectors"""
+
+    def __init__(self, scores: np.ndarray, primary: np.ndarray, strength: np.ndarray,
+                 secondary: np.ndarray, valid: np.ndarray):
+        self.scores = scores          # (N, 3) normalized percentages
+        self.primary = primary        # (N,) index into PerspectiveAnalyzer.CATEGORIES
+        self.strength = strength      # (N,) index into STRENGTHS
+        self.secondary = secondary    # (N,) category index, -1 when there is none
+        self.valid = valid            # (N,) False where no question was answered
+
+    def __len__(self):
+        return len(self.scores)
+
+    def analysis(self, i: int) -> Optional[Dict]:
+        """Rebuild the get_perspective_summary() dict for row i"""
+        if not self.valid[i]:
+            return None
+        secondary = int(self.secondary[i])
+        return {
+            'primary': PerspectiveAnalyzer.CATEGORIES[int(self.primary[i])],
+            'strength': STRENGTHS[int(self.strength[i])],
+            'secondary': PerspectiveAnalyzer.CATEGORIES[secondary] if secondary >= 0 else None,
+            'scores': [float(x) for x in self.scores[i]]
+        }
+
+
+class ScoreEngine:
+    """
+    Scores and classifies many survey responses at once.
+
+    The questionnaire is compiled into a (question x response x 3) tensor
+    whose response slot 0 is all zeros, so an (N x questions) matrix of
+    answer codes (1-based, 0 for unanswered) can be scored with one gather
+    and one sum. Normalization and classification are applied once per
+    distinct raw score triple, which keeps results identical to the
+    per-request path while costing O(distinct triples) Python work.
+    """
+
+    def __init__(self, questions_data: Dict):
+        self.question_ids = list(questions_data)
+        self._question_index = {q_id: i for i, q_id in enumerate(self.question_ids)}
+        self.response_counts = [len(questions_data[q]["responses"]) for q in self.question_ids]
+
+        self.score_tensor = np.zeros(
+            (len(self.question_ids), max(self.response_counts) + 1, 3), dtype=np.float64
+        )
+        for qi, q_id in enumerate(self.question_ids):
+            for ri, response in enumerate(questions_data[q_id]["responses"], start=1):
+                self.score_tensor[qi, ri] = response["scores"]
+
+    @classmethod
+    def from_file(cls, path: Path = QUESTIONS_PATH) -> 'ScoreEngine':
+        with open(path) as f:
+            return cls(json.load(f)["questions"])
+
+    def encode(self, responses: List[Dict]) -> np.ndarray:
+        """
+        Convert /api/analyze style dicts ({"q1_response": 3, ...}) to answer codes.
+
+        Unknown questions and out-of-range answers are ignored, as in
+        calculate_perspective_scores().
+        """
+        matrix = np.zeros((len(responses), len(self.question_ids)), dtype=np.int8)
+        for row, response in enumerate(responses):
+            for q_id, response_num in response.items():
+                if response_num is None:
+                    continue
+                qi = self._question_index.get(q_id.replace("_response", "").upper())
+                if qi is None:
+                    continue
+                if not isinstance(response_num, int):
+                    raise ValueError(f"Invalid response for {q_id}: {response_num!r}")
+                if 1 <= response_num <= self.response_counts[qi]:
+                    matrix[row, qi] = response_num
+        return matrix
+
+    def _clean(self, matrix: np.ndarray) -> np.ndarray:
+        matrix = np.asarray(matrix)
+        limits = np.asarray(self.response_counts)
+        return np.where((matrix >= 1) & (matrix <= limits), matrix, UNANSWERED)
+
+    def raw_scores(self, matrix: np.ndarray) -> np.ndarray:
+        """Sum the per-answer score vectors for every row: (N, Q) -> (N, 3)"""
+        codes = self._clean(matrix)
+        question_idx = np.arange(len(self.question_ids))
+        return self.score_tensor[question_idx, codes].sum(axis=1)
+
+    def score(self, matrix: np.ndarray) -> BatchScores:
+        """Normalize and classify every row of an answer-code matrix"""
+        codes = self._clean(matrix).astype(np.int64)
+
+        # Pack each answer vector into one integer so duplicates collapse cheaply
+        radix = self.score_tensor.shape[1]
+        keys = codes @ (radix ** np.arange(codes.shape[1], dtype=np.int64))
+        _, first_rows, key_inverse = np.unique(keys, return_index=True, return_inverse=True)
+
+        raw = self.raw_scores(codes[first_rows])
+        triples, triple_inverse = np.unique(raw, axis=0, return_inverse=True)
+        inverse = triple_inverse.reshape(-1)[key_inverse.reshape(-1)]
+
+        n_unique = len(triples)
+        scores = np.zeros((n_unique, 3), dtype=np.float64)
+        primary = np.zeros(n_unique, dtype=np.int8)
+        strength = np.zeros(n_unique, dtype=np.int8)
+        secondary = np.full(n_unique, -1, dtype=np.int8)
+        valid = np.zeros(n_unique, dtype=bool)
+
+        for u, triple in enumerate(triples):
+            normalized = normalize_scores(triple.tolist())
+            scores[u] = normalized
+            if sum(triple) <= 0:
+                continue
+            analysis = PerspectiveAnalyzer.get_perspective_summary(normalized)
+            primary[u] = PerspectiveAnalyzer.CATEGORIES.index(analysis['primary'])
+            strength[u] = STRENGTHS.index(analysis['strength'])
+            if analysis['secondary']:
+                secondary[u] = PerspectiveAnalyzer.CATEGORIES.index(analysis['secondary'])
+            valid[u] = True
+
+        return BatchScores(
+            scores[inverse], primary[inverse], strength[inverse], secondary[inverse], valid[inverse]
+        )
+
+
+def score_responses(responses: List[Dict], questions_data: Dict = None) -> BatchScores:
+    """Score a list of /api/analyze style response dicts in one pass"""
+    if questions_data is None:
+        questions_data = content_store.snapshot().questions
+    engine = ScoreEngine(questions_data)
+    return engine.score(engine.encode(responses))
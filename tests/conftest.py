@@ -0,0 +1,51 @@
+# tests/conftest.py
+import sys
+from pathlib import Path
+
+import mysql.connector
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from tests import fakedb  # noqa: E402
+
+
+@pytest.fixture
+def fake_db(monkeypatch):
+    """tests.fakedb installed for one test; mysql-connector is restored afterwards"""
+    monkeypatch.setattr(mysql.connector, "connect", mysql.connector.connect)
+    return fakedb.install(fakedb.FakeDatabase(seed=0))
+
+
+@pytest.fixture
+def make_db_manager(fake_db, monkeypatch, tmp_path):
+    """Factory for DatabaseManagers on the fake database; all are closed at teardown"""
+    monkeypatch.setenv("DB_SPOOL_DIR", str(tmp_path / "spool"))
+    monkeypatch.setenv("DB_SPOOL_REPLAY_INTERVAL", "3600")
+    monkeypatch.delenv("DB_READ_HOST", raising=False)
+    monkeypatch.delenv("DB_WRITE_BEHIND", raising=False)
+    monkeypatch.delenv("DB_DIMENSIONS", raising=False)
+    from db_manager import DatabaseManager
+    managers = []
+
+    def make(**kwargs):
+        kwargs.setdefault("spool", False)
+        manager = DatabaseManager(**kwargs)
+        manager.RETRY_DELAY_SECONDS = 0
+        managers.append(manager)
+        return manager
+
+    yield make
+    for manager in managers:
+        manager.close(timeout=5)
+
+
+def survey_row(session_id, **overrides) -> dict:
+    row = {
+        "session_id": session_id, "q1_response": 1, "q2_response": 2, "q3_response": 3,
+        "q4_response": 1, "q5_response": 2, "q6_response": 3, "n1": 40, "n2": 35, "n3": 25,
+        "plot_x": 393.75, "plot_y": 438.75, "browser": "test", "region": "test",
+        "source": "test", "hash_email_session": None,
+    }
+    row.update(overrides)
+    return row
@@ -0,0 +1,181 @@
+# tests/fakedb.py
+"""
+In-process stand-in for a MySQL server.
+
+Installing the fake swaps ``mysql.connector.connect`` so the real
+``DatabaseManager`` code runs unchanged against connections whose latency
+and failure rate can be dialled in from a test or benchmark. Calls block
+with ``time.sleep`` exactly like the real driver does.
+"""
+import itertools
+import random
+import threading
+import time
+
+import mysql.connector
+from mysql.connector import errors
+
+
+class FakeDatabase:
+    """Shared state and knobs for every fake connection"""
+
+    def __init__(self, latency: float = 0.0, failure_rate: float = 0.0, seed: int = None,
+                 connect_latency: float = 0.0):
+        self.latency = latency
+        self.connect_latency = connect_latency
+        self.replica_lag = 0.0
+        self.connections = 0
+        self.failure_rate = failure_rate
+        # Column widths enforced like strict-mode MySQL, e.g. {"region": 100}
+        self.column_limits = {}
+        self.rows = []
+        self.dimensions = {}
+        self._sessions = {}
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+        self._random = random.Random(seed)
+        self.queries = 0
+
+    def _maybe_fail(self):
+        with self._lock:
+            self.queries += 1
+            failed = self._random.random() < self.failure_rate
+        if self.latency:
+            time.sleep(self.latency)
+        if failed:
+            raise errors.OperationalError("Lost connection to MySQL server during query (simulated)")
+
+    def insert(self, params):
+        return self.insert_many([params or {}])
+
+    def insert_many(self, rows):
+        """Insert rows atomically; returns (first ID, rows inserted).
+
+        session_id is unique: a repeat keeps the original row and, like
+        ON DUPLICATE KEY UPDATE id = LAST_INSERT_ID(id), reports its ID.
+        """
+        self._maybe_fail()
+        for row in rows:
+            for column, limit in self.column_limits.items():
+                if isinstance(row.get(column), str) and len(row[column]) > limit:
+                    raise errors.DataError(f"1406 (22001): Data too long for column '{column}' at row 1")
+        first_id, inserted = None, 0
+        with self._lock:
+            for row in rows:
+                record_id = self._sessions.get(row.get("session_id"))
+                if record_id is None:
+                    record_id = next(self._ids)
+                    self.rows.append(dict(row, id=record_id))
+                    if row.get("session_id") is not None:
+                        self._sessions[row["session_id"]] = record_id
+                    inserted += 1
+                first_id = first_id or record_id
+        return first_id, inserted
+
+    def intern(self, table: str, key: tuple) -> int:
+        """INSERT ... ON DUPLICATE KEY UPDATE id = LAST_INSERT_ID(id) on a dimension table"""
+        self._maybe_fail()
+        with self._lock:
+            ids = self.dimensions.setdefault(table, {})
+            return ids.setdefault(key, len(ids) + 1)
+
+    def group_count(self, columns) -> list:
+        """SELECT <columns>, COUNT(*) ... GROUP BY <columns>, skipping NULLs"""
+        self._maybe_fail()
+        counts = {}
+        with self._lock:
+            for row in self.rows:
+                key = tuple(row.get(column) for column in columns)
+                if None not in key:
+                    counts[key] = counts.get(key, 0) + 1
+        return [key + (count,) for key, count in counts.items()]
+
+    def select(self, columns) -> list:
+        """SELECT <columns> FROM survey_results (no filtering)"""
+        self._maybe_fail()
+        with self._lock:
+            return [tuple(row.get(column) for column in columns) for row in self.rows]
+
+
+class FakeCursor:
+    def __init__(self, db: FakeDatabase):
+        self._db = db
+        self.lastrowid = None
+        self.rowcount = -1
+        self._result = []
+
+    def execute(self, query, params=None):
+        statement = query.strip().split(None, 1)[0].upper()
+        if statement == "SHOW":
+            self._db._maybe_fail()
+            self._result = [{"Seconds_Behind_Source": self._db.replica_lag}]
+        elif statement == "INSERT" and query.split()[2].startswith("dim_"):
+            self.lastrowid = self._db.intern(query.split()[2], tuple(params))
+        elif statement == "INSERT":
+            self.lastrowid, self.rowcount = self._db.insert(params or {})
+        elif "GROUP BY" in query.upper():
+            columns = query.upper().split("GROUP BY", 1)[1].split()
+            self._result = self._db.group_count([c.strip(",").lower() for c in columns])
+        elif "COUNT(" not in query.upper():
+            columns = query.split(None, 1)[1].upper().split(" FROM ", 1)[0].split(",")
+            self._result = self._db.select([c.strip().lower().split(".")[-1] for c in columns])
+        else:
+            self._db._maybe_fail()
+            self._result = [(len(self._db.rows),)]
+
+    def executemany(self, query, seq_params):
+        self.lastrowid, self.rowcount = self._db.insert_many(list(seq_params))
+
+    def fetchone(self):
+        return self._result[0] if self._result else None
+
+    def fetchall(self):
+        result, self._result = self._result, []
+        return result
+
+    def fetchmany(self, size=1):
+        result, self._result = self._result[:size], self._result[size:]
+        return result
+
+    def close(self):
+        pass
+
+
+class FakeConnection:
+    in_transaction = False
+
+    def __init__(self, db: FakeDatabase):
+        self._db = db
+
+    def cursor(self, *args, **kwargs):
+        return FakeCursor(self._db)
+
+    def commit(self):
+        pass
+
+    def rollback(self):
+        pass
+
+    def ping(self, reconnect=False, attempts=1, delay=0):
+        self._db._maybe_fail()
+
+    def reset_session(self, user_variables=None, session_variables=None):
+        pass
+
+    def close(self):
+        pass
+
+
+def connect(db: FakeDatabase) -> FakeConnection:
+    """A new connection, paying the simulated handshake cost"""
+    with db._lock:
+        db.connections += 1
+    if db.connect_latency:
+        time.sleep(db.connect_latency)
+    return FakeConnection(db)
+
+
+def install(db: FakeDatabase) -> FakeDatabase:
+    """Route every new connection to ``db``"""
+    mysql.connector.connect = lambda **config: connect(db)
+    return db
@@ -0,0 +1,24 @@
+# tests/reference.py
+"""The original per-request scoring, kept verbatim as the oracle for the vectorized paths"""
+
+
+def baseline_scores(responses: dict, questions_data: dict) -> list:
+    total_scores = [0, 0, 0]  # [PreModern, Modern, PostModern]
+
+    for q_id, response_num in responses.items():
+        if response_num is not None:
+            question_key = q_id.replace("_response", "").upper()
+            if question_key in questions_data:
+                question = questions_data[question_key]
+                response_idx = response_num - 1
+                if 0 <= response_idx < len(question["responses"]):
+                    scores = question["responses"][response_idx]["scores"]
+                    total_scores = [a + b for a, b in zip(total_scores, scores)]
+
+    total = sum(total_scores)
+    if total > 0:
+        normalized_scores = [round((score / total) * 100, 1) for score in total_scores]
+        adjustment = 100 - sum(normalized_scores)
+        normalized_scores[-1] += adjustment
+        return normalized_scores
+    return [0, 0, 0]
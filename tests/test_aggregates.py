@@ -0,0 +1,58 @@
+# tests/test_aggregates.py
+import json
+import random
+
+from src.analytics.aggregates import PopulationAggregates
+from tests.conftest import survey_row
+
+
+def random_rows(count, seed=0):
+    rng = random.Random(seed)
+    rows = []
+    for i in range(count):
+        n1 = rng.randint(0, 100)
+        n2 = rng.randint(0, 100 - n1)
+        rows.append(survey_row(f"agg-{i}", n1=n1, n2=n2, n3=100 - n1 - n2,
+                               plot_x=rng.choice([None, rng.uniform(0, 750)]),
+                               plot_y=rng.uniform(325, 650)))
+    return rows
+
+
+def test_observe_bins_scores_and_plot_positions():
+    aggregates = PopulationAggregates(bins=10, plot_cell=25)
+    aggregates.observe([survey_row("a", n1=100, n2=0, n3=0, plot_x=0, plot_y=325),
+                        survey_row("b", n1=35, n2=45, n3=20, plot_x=749, plot_y=649),
+                        survey_row("c", n1=None, plot_x=None)])
+    payload = aggregates.payload()
+    assert payload["total"] == 3
+    assert payload["axes"]["PreModern"] == [0, 0, 0, 1, 0, 0, 0, 0, 0, 1]
+    assert payload["ternary"]["counts"][9][0] == 1
+    assert payload["ternary"]["counts"][3][4] == 1
+    grid = payload["plot_grid"]["counts"]
+    assert grid[0][0] == 1 and grid[29][12] == 1
+    assert sum(map(sum, grid)) == 2
+
+
+def test_reconcile_matches_incremental_counts(make_db_manager):
+    rows = random_rows(300)
+    manager = make_db_manager()
+    manager.insert_batch(rows)
+
+    observed = PopulationAggregates()
+    observed.observe(rows)
+    reconciled = PopulationAggregates()
+    reconciled.reconcile(manager)
+
+    for key in ("total", "ternary", "axes", "plot_grid"):
+        assert reconciled.payload()[key] == observed.payload()[key], key
+    assert reconciled.reconciled_at is not None
+
+
+def test_asset_is_rebuilt_only_after_a_change():
+    aggregates = PopulationAggregates()
+    first = aggregates.asset()
+    assert aggregates.asset() is first
+    aggregates.observe([survey_row("a")])
+    second = aggregates.asset()
+    assert second is not first and second.etag != first.etag
+    assert json.loads(second.encodings["identity"])["total"] == 1
@@ -0,0 +1,59 @@
+# tests/test_answer_table.py
+import itertools
+import json
+
+from src.visualization.answer_table import QUESTIONS_PATH, TEMPLATES_PATH, load_or_build
+from src.visualization.perspective_analyzer import PerspectiveAnalyzer
+from tests.reference import baseline_scores
+
+
+def test_every_answer_combination_matches_the_scalar_path(tmp_path):
+    questions = json.loads(QUESTIONS_PATH.read_text())["questions"]
+    templates = json.loads(TEMPLATES_PATH.read_text())["categories"]
+    table = load_or_build(artifact_path=tmp_path / "table.npz", save=False)
+
+    codes = range(table.radix)  # 0 = unanswered
+    checked = 0
+    for combination in itertools.product(codes, repeat=len(table.question_ids)):
+        responses = {f"{q_id.lower()}_response": code or None
+                     for q_id, code in zip(table.question_ids, combination)}
+        expected = baseline_scores(responses, questions)
+        payload = table.lookup(responses)
+        if sum(expected) == 0:
+            assert payload is None
+            continue
+        analysis = PerspectiveAnalyzer.get_perspective_summary(expected)
+        assert payload["scores"] == expected, responses
+        assert payload["analysis"] == analysis, responses
+        assert payload["perspective"] == PerspectiveAnalyzer.get_perspective_description(analysis)
+        assert payload["category_responses"] == PerspectiveAnalyzer.get_template_responses(
+            analysis, templates)
+        checked += 1
+    assert checked == table.radix ** len(table.question_ids) - 1
+
+
+def test_lookup_declines_inputs_it_cannot_key(tmp_path):
+    table = load_or_build(artifact_path=tmp_path / "table.npz", save=False)
+    assert table.lookup({"q1_response": "2"}) is None
+    assert table.lookup({}) is None
+
+
+def test_lookup_never_waits_for_a_build(monkeypatch):
+    import threading
+    from src.visualization import answer_table
+
+    release = threading.Event()
+    built = load_or_build(save=False)
+
+    def slow_build(*args, **kwargs):
+        release.wait(5)
+        return built
+
+    monkeypatch.setattr(answer_table, "_table", None)
+    monkeypatch.setattr(answer_table, "load_or_build", slow_build)
+    assert answer_table.answer_table_if_ready() is None  # returns while the build runs
+    assert answer_table.answer_table_if_ready() is None
+    builder = answer_table._builder
+    release.set()
+    builder.join(5)
+    assert answer_table.answer_table_if_ready() is built
@@ -0,0 +1,85 @@
+# tests/test_app.py
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import mysql.connector
+import pytest
+from fastapi.testclient import TestClient
+
+from tests import fakedb
+
+ROOT = Path(__file__).resolve().parent.parent
+ANSWERS = {f"q{i}_response": i % 3 + 1 for i in range(1, 7)}
+
+
+@pytest.fixture(scope="module")
+def app(tmp_path_factory):
+    """main.app on a fake database, with its lifespan running for the whole module"""
+    with pytest.MonkeyPatch.context() as monkeypatch:
+        monkeypatch.setattr(mysql.connector, "connect", mysql.connector.connect)
+        db = fakedb.install(fakedb.FakeDatabase(seed=0))
+        monkeypatch.setenv("DB_SPOOL_DIR", str(tmp_path_factory.mktemp("spool")))
+        for name in ("DB_READ_HOST", "DB_WRITE_BEHIND", "DB_DIMENSIONS", "WARM_ON_STARTUP"):
+            monkeypatch.delenv(name, raising=False)
+        import main
+        with TestClient(main.app) as client:
+            yield main, client, db
+
+
+def test_submit_and_analyze_matches_analyze(app):
+    main, client, db = app
+    analysis = client.post("/api/analyze", json=ANSWERS).json()
+    payload = client.post("/api/submit-and-analyze?wait=true",
+                          json={"session_id": "wait-1", **ANSWERS}).json()
+    assert payload["scores"] == analysis["scores"]
+    assert payload["perspective"] == analysis["perspective"]
+    assert payload["category_responses"] == analysis["category_responses"]
+    assert payload["session_id"] == "wait-1" and payload["record_id"] is not None
+    assert any(row["session_id"] == "wait-1" for row in db.rows)
+
+
+def test_deferred_submit_persists_after_responding(app):
+    main, client, db = app
+    payload = client.post("/api/submit-and-analyze", json={"session_id": "deferred-1", **ANSWERS}).json()
+    assert payload["record_id"] is None
+    # TestClient runs background tasks before returning the response
+    assert any(row["session_id"] == "deferred-1" for row in db.rows)
+
+
+def test_unanswered_submission_is_rejected_and_not_stored(app):
+    main, client, db = app
+    response = client.post("/api/submit-and-analyze?wait=true", json={"session_id": "empty-1"})
+    assert response.status_code == 422
+    assert not any(row["session_id"] == "empty-1" for row in db.rows)
+
+
+def test_import_does_not_load_the_report_modules_or_connect():
+    script = (
+        "import sys\n"
+        "from tests import fakedb\n"
+        "db = fakedb.install(fakedb.FakeDatabase())\n"
+        "import main\n"
+        "loaded = [m for m in ('src.visualization.pdf_generator', 'src.visualization.plot_renderer',"
+        " 'fpdf', 'matplotlib') if m in sys.modules]\n"
+        "print(loaded, db.connections)\n"
+    )
+    env = {**os.environ, "DB_SPOOL_ENABLED": "false", "WARM_ON_STARTUP": "false"}
+    result = subprocess.run([sys.executable, "-c", script], cwd=ROOT, env=env,
+                            capture_output=True, text=True, timeout=120)
+    assert result.returncode == 0, result.stderr
+    assert result.stdout.split("\n")[-2] == "[] 0"
+
+
+def test_warmup_request_loads_content_and_answer_table(app):
+    main, client, db = app
+    assert client.get("/_ah/warmup").json()["status"] in ("warming", "done")
+
+    async def finished():
+        await main.warmup_task
+
+    client.portal.call(finished)
+    assert client.get("/_ah/warmup").json()["status"] == "done"
+    assert main.answer_table_if_ready() is not None
+    assert main.index_asset is not None
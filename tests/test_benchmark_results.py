@@ -0,0 +1,31 @@
+# tests/test_benchmark_results.py
+import json
+
+from benchmarks import results
+
+
+def test_summarize_uses_nearest_rank_percentiles():
+    summary = results.summarize([float(i) for i in range(1, 101)])
+    assert summary["count"] == 100
+    assert summary["p50_ms"] == 51.0
+    assert summary["p99_ms"] == 99.0
+    assert summary["max_ms"] == 100.0
+    assert results.summarize([]) == {"count": 0}
+
+
+def test_write_records_environment_and_params(tmp_path):
+    path = tmp_path / "run.json"
+    results.write(str(path), "micro", {"number": 10}, {"parse": {"p50_ms": 1.5}})
+    document = json.loads(path.read_text())
+    assert document["benchmark"] == "micro"
+    assert document["params"] == {"number": 10}
+    assert set(document["environment"]) >= {"commit", "python", "cpus", "timestamp"}
+
+
+def test_compare_reports_relative_change_of_shared_metrics(capsys):
+    before = {"benchmark": "micro", "params": {}, "results": {"a": {"p50_ms": 2.0, "ok": True}, "gone": 1}}
+    after = {"benchmark": "micro", "params": {}, "results": {"a": {"p50_ms": 3.0, "ok": True}}}
+    results.compare(before, after)
+    out = capsys.readouterr().out
+    assert "a.p50_ms" in out and "+50.0%" in out
+    assert "gone" not in out and "a.ok" not in out and "warning" not in out
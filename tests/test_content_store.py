@@ -0,0 +1,74 @@
+# tests/test_content_store.py
+import json
+import os
+import shutil
+
+import pytest
+
+from src.data import content_store
+from src.data.content_store import ContentStore
+
+
+@pytest.fixture
+def data_dir(tmp_path):
+    for name in (content_store.QUESTIONS_FILE, content_store.TEMPLATES_FILE):
+        shutil.copy(content_store.DATA_DIR / name, tmp_path / name)
+    return tmp_path
+
+
+def rewrite_questions(data_dir, change):
+    path = data_dir / content_store.QUESTIONS_FILE
+    data = json.loads(path.read_text())
+    change(data)
+    path.write_text(json.dumps(data))
+    # Make sure the mtime moves even on coarse-grained file systems
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+
+
+def test_snapshot_indexes_responses(data_dir):
+    snapshot = ContentStore(data_dir, check_interval=0).snapshot()
+    question = next(iter(snapshot.questions.values()))
+    response = question["responses"][0]
+    assert snapshot.responses_by_id[response["id"]] is response
+    assert json.loads(snapshot.questions_asset.encodings["identity"]) == snapshot.questions_data
+
+
+def test_snapshot_is_reused_until_the_files_change(data_dir):
+    store = ContentStore(data_dir, check_interval=0)
+    first = store.snapshot()
+    assert store.snapshot() is first
+
+    rewrite_questions(data_dir, lambda data: next(iter(data["questions"].values())).update(text="Changed?"))
+    second = store.snapshot()
+    assert second is not first and second.version != first.version
+    assert second.questions_asset.etag != first.questions_asset.etag
+
+
+def test_touch_without_a_content_change_keeps_the_snapshot(data_dir):
+    store = ContentStore(data_dir, check_interval=0)
+    first = store.snapshot()
+    path = data_dir / content_store.QUESTIONS_FILE
+    os.utime(path, ns=(os.stat(path).st_atime_ns, os.stat(path).st_mtime_ns + 10**9))
+    assert store.snapshot() is first
+
+
+def test_invalid_edit_keeps_the_previous_snapshot(data_dir):
+    store = ContentStore(data_dir, check_interval=0)
+    first = store.snapshot()
+    rewrite_questions(data_dir, lambda data: next(iter(data["questions"].values()))["responses"][0]
+                      .update(scores=[1, 2]))
+    assert store.snapshot() is first
+
+
+def test_invalid_content_fails_the_first_load(data_dir):
+    rewrite_questions(data_dir, lambda data: data.update(questions={}))
+    with pytest.raises(ValueError):
+        ContentStore(data_dir, check_interval=0).snapshot()
+
+
+def test_files_are_not_checked_within_the_interval(data_dir):
+    store = ContentStore(data_dir, check_interval=3600)
+    first = store.snapshot()
+    rewrite_questions(data_dir, lambda data: next(iter(data["questions"].values())).update(text="Changed?"))
+    assert store.snapshot() is first
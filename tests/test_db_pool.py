@@ -0,0 +1,161 @@
+# tests/test_db_pool.py
+import threading
+import time
+
+import mysql.connector
+import pytest
+from mysql.connector import errors
+
+from db_pool import ManagedPool, ReplicaLagProbe
+
+
+def make_pool(**kwargs) -> ManagedPool:
+    kwargs.setdefault("min_size", 0)
+    kwargs.setdefault("max_size", 2)
+    return ManagedPool({}, **kwargs)
+
+
+def failing(*args, **kwargs):
+    raise errors.InterfaceError("simulated failure")
+
+
+def test_checkout_times_out_when_exhausted(fake_db):
+    pool = make_pool(max_size=1)
+    held = pool.get_connection()
+    with pytest.raises(errors.PoolError):
+        pool.get_connection(timeout=0.05)
+    assert pool.stats()["timeouts"] == 1
+    held.close()
+    pool.get_connection(timeout=0.05).close()
+
+
+def test_waiting_checkout_gets_the_returned_connection(fake_db):
+    pool = make_pool(max_size=1)
+    held = pool.get_connection()
+    threading.Timer(0.05, held.close).start()
+    connection = pool.get_connection(timeout=2)
+    assert connection._cnx is held._cnx
+    stats = pool.stats()
+    assert stats["waited"] == 1 and stats["opened"] == 1
+    connection.close()
+
+
+def test_idle_connection_is_pinged_and_replaced_when_stale(fake_db):
+    pool = make_pool(ping_after=0)
+    first = pool.get_connection()
+    first.close()
+
+    fake_db.failure_rate = 1.0  # the ping fails; reconnecting does not query
+    second = pool.get_connection()
+    fake_db.failure_rate = 0.0
+    stats = pool.stats()
+    assert stats["pings"] == 1 and stats["ping_failures"] == 1
+    assert stats["opened"] == 2
+    assert second._cnx is not first._cnx
+    second.close()
+
+
+def test_healthy_idle_connection_is_reused_after_ping(fake_db):
+    pool = make_pool(ping_after=0)
+    first = pool.get_connection()
+    first.close()
+    second = pool.get_connection()
+    assert second._cnx is first._cnx
+    assert pool.stats()["pings"] == 1 and pool.stats()["ping_failures"] == 0
+
+
+def test_connection_older_than_max_age_is_recycled(fake_db):
+    pool = make_pool(max_age=0)
+    first = pool.get_connection()
+    first.close()
+    second = pool.get_connection()
+    assert second._cnx is not first._cnx
+    assert pool.stats()["recycled"] == 1
+    assert pool.stats()["size"] == 1
+
+
+def test_spare_idle_connections_expire_down_to_min_size(fake_db):
+    pool = make_pool(min_size=1, max_size=3, idle_timeout=0.01)
+    connections = [pool.get_connection() for _ in range(3)]
+    for connection in connections:
+        connection.close()
+    time.sleep(0.02)
+    pool.get_connection().close()
+    stats = pool.stats()
+    assert stats["size"] == 1 and stats["idle"] == 1
+
+
+def test_prewarm_opens_min_size(fake_db):
+    pool = make_pool(min_size=2, max_size=3)
+    assert pool.prewarm() == 2
+    assert pool.stats()["idle"] == 2
+    assert fake_db.connections == 2
+
+
+def test_connection_failing_reset_is_discarded(fake_db):
+    pool = make_pool()
+    connection = pool.get_connection()
+    connection._cnx.reset_session = failing
+    connection.close()
+    stats = pool.stats()
+    assert stats["size"] == 0 and stats["idle"] == 0 and stats["in_use"] == 0
+
+
+def test_open_transaction_is_rolled_back_or_discarded(fake_db):
+    pool = make_pool(reset_session=False)
+    connection = pool.get_connection()
+    connection._cnx.in_transaction = True
+    connection._cnx.rollback = failing
+    connection.close()
+    assert pool.stats()["size"] == 0
+
+    rolled_back = []
+    connection = pool.get_connection()
+    connection._cnx.in_transaction = True
+    connection._cnx.rollback = lambda: rolled_back.append(True)
+    connection.close()
+    assert rolled_back == [True]
+    assert pool.stats()["idle"] == 1
+
+
+def test_double_close_returns_connection_once(fake_db):
+    pool = make_pool()
+    connection = pool.get_connection()
+    connection.close()
+    connection.close()
+    assert pool.stats()["idle"] == 1 and pool.stats()["in_use"] == 0
+
+
+def test_failed_connect_frees_its_slot(fake_db, monkeypatch):
+    pool = make_pool(max_size=1)
+    monkeypatch.setattr(mysql.connector, "connect", failing)
+    with pytest.raises(errors.InterfaceError):
+        pool.get_connection()
+    stats = pool.stats()
+    assert stats["size"] == 0 and stats["in_use"] == 0
+
+
+def test_connection_returned_after_close_is_disconnected(fake_db):
+    pool = make_pool()
+    connection = pool.get_connection()
+    pool.close()
+    connection.close()
+    assert pool.stats()["size"] == 0
+    with pytest.raises(errors.PoolError):
+        pool.get_connection()
+
+
+def test_lag_probe_does_not_wait_for_a_busy_replica_pool(fake_db):
+    pool = make_pool(max_size=1)
+    probe = ReplicaLagProbe(pool, max_lag=30, interval=0, checkout_timeout=0.05)
+    fake_db.replica_lag = 5
+    assert probe.healthy()
+
+    held = pool.get_connection()
+    fake_db.replica_lag = 60
+    start = time.monotonic()
+    assert probe.healthy()  # keeps the last reading
+    assert time.monotonic() - start < 1
+    assert probe.error is None
+    held.close()
+    assert not probe.healthy()
@@ -0,0 +1,192 @@
+# tests/test_db_resilience.py
+import json
+import threading
+import time
+
+import pytest
+from mysql.connector import errors
+
+import db_resilience
+from db_resilience import CircuitBreaker, SpoolJournal
+from tests.conftest import survey_row
+
+
+def read_ndjson(path):
+    return [json.loads(line) for line in path.read_bytes().splitlines()]
+
+
+def test_breaker_opens_after_threshold_and_closes_after_successful_probe():
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout=0.05)
+    assert breaker.allow()
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.CLOSED
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.OPEN
+    assert not breaker.allow()
+
+    time.sleep(0.06)
+    assert breaker.allow()  # the single half-open probe
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+    assert not breaker.allow()
+    breaker.record_success()
+    assert breaker.state == CircuitBreaker.CLOSED
+    assert breaker.allow()
+    assert breaker.times_opened == 1
+
+
+def test_breaker_failed_probe_reopens():
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0.05)
+    breaker.record_failure()
+    time.sleep(0.06)
+    assert breaker.allow()
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.OPEN
+    assert not breaker.allow()
+    assert breaker.times_opened == 2
+
+
+def test_spool_append_is_durable_and_group_commits(tmp_path, monkeypatch):
+    real_fsync = db_resilience.os.fsync
+
+    def slow_fsync(fd):
+        time.sleep(0.02)
+        real_fsync(fd)
+
+    monkeypatch.setattr(db_resilience.os, "fsync", slow_fsync)
+    journal = SpoolJournal(str(tmp_path))
+    threads = [threading.Thread(target=journal.append, args=(survey_row(f"s{i}"),))
+               for i in range(20)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    journal.close()
+
+    assert sorted(row["session_id"] for row in read_ndjson(journal.path)) == sorted(
+        f"s{i}" for i in range(20))
+    assert journal.spooled == 20
+    assert journal.fsyncs < 20
+
+
+def test_replay_resumes_from_offset_after_restart(tmp_path):
+    journal = SpoolJournal(str(tmp_path))
+    journal.append_many([survey_row(f"s{i}") for i in range(5)])
+    inserted = []
+
+    def failing_on_second_batch(rows):
+        if inserted:
+            raise errors.OperationalError("Lost connection (simulated)")
+        inserted.extend(rows)
+        return len(rows)
+
+    with pytest.raises(errors.OperationalError):
+        journal.replay(failing_on_second_batch, batch_size=2)
+    assert journal.offset_path.exists()
+    journal.close()
+
+    restarted = SpoolJournal(str(tmp_path))
+    assert restarted.has_backlog()
+    replayed = restarted.replay(lambda rows: inserted.extend(rows) or len(rows), batch_size=2)
+    restarted.close()
+
+    assert replayed == 3
+    assert [row["session_id"] for row in inserted] == [f"s{i}" for i in range(5)]
+    assert not restarted.offset_path.exists()
+    assert not restarted.replay_path.exists()
+
+
+def test_replay_sets_aside_rows_the_database_rejects(tmp_path):
+    journal = SpoolJournal(str(tmp_path))
+    journal.append_many([survey_row("good-1"), survey_row("bad"), survey_row("good-2")])
+    inserted = []
+
+    def insert_batch(rows):
+        if any(row["session_id"] == "bad" for row in rows):
+            raise errors.DataError("Data too long for column 'region'")
+        inserted.extend(rows)
+        return len(rows)
+
+    assert journal.replay(insert_batch) == 3
+    journal.close()
+    assert [row["session_id"] for row in inserted] == ["good-1", "good-2"]
+    assert [row["session_id"] for row in read_ndjson(journal.rejected_path)] == ["bad"]
+
+
+def test_replay_sets_aside_corrupt_and_truncated_lines(tmp_path):
+    journal = SpoolJournal(str(tmp_path))
+    journal.path.write_bytes(
+        json.dumps(survey_row("a")).encode() + b"\n"
+        + b'{"session_id": "torn\n'
+        + json.dumps(survey_row("b")).encode() + b"\n"
+        + b'{"session_id": "cut'
+    )
+    inserted = []
+    journal.replay(lambda rows: inserted.extend(rows) or len(rows))
+    journal.close()
+
+    assert [row["session_id"] for row in inserted] == ["a", "b"]
+    assert journal.rejected_path.read_bytes() == b'{"session_id": "torn\n{"session_id": "cut\n'
+    assert not journal.replay_path.exists()
+
+
+def test_save_response_spools_while_breaker_is_open(make_db_manager, fake_db):
+    manager = make_db_manager(spool=True)
+    for _ in range(manager.breaker.failure_threshold):
+        manager.breaker.record_failure()
+
+    assert manager.save_response(survey_row("outage-1")) is None
+    assert fake_db.queries == 0
+    assert fake_db.rows == []
+    assert [row["session_id"] for row in read_ndjson(manager.spool.path)] == ["outage-1"]
+
+    manager.breaker.record_success()
+    assert manager.spool.replay(manager.insert_batch) == 1
+    assert [row["session_id"] for row in fake_db.rows] == ["outage-1"]
+
+
+def test_save_response_spools_after_transient_failures(make_db_manager, fake_db):
+    manager = make_db_manager(spool=True)
+    fake_db.failure_rate = 1.0
+
+    assert manager.save_response(survey_row("flaky")) is None
+    assert fake_db.rows == []
+    assert manager.spool.spooled == 1
+
+
+def test_unexpected_error_during_probe_releases_it(make_db_manager, fake_db, monkeypatch):
+    manager = make_db_manager()
+    manager.breaker.reset_timeout = 0
+    for _ in range(manager.breaker.failure_threshold):
+        manager.breaker.record_failure()
+
+    def broken_insert(data):
+        raise TypeError("not a database error")
+
+    monkeypatch.setattr(manager, "insert_response", broken_insert)
+    with pytest.raises(TypeError):
+        manager.attempt_insert(survey_row("probe"))
+    monkeypatch.undo()
+
+    assert manager.breaker.allow()  # the next request may probe again
+
+
+def test_rows_appended_by_another_process_after_rotation_are_kept(tmp_path):
+    # Two journals on one directory stand in for two worker processes
+    replayer = SpoolJournal(str(tmp_path))
+    writer = SpoolJournal(str(tmp_path))
+    writer.append(survey_row("before"))
+    inserted = []
+
+    def insert_batch(rows):
+        if not inserted:
+            writer.append(survey_row("during"))  # lands after the rotation
+        inserted.extend(rows)
+        return len(rows)
+
+    assert replayer.replay(insert_batch) == 1
+    writer.append(survey_row("after"))
+    assert replayer.has_backlog()
+    replayer.replay(insert_batch)
+    writer.close()
+    replayer.close()
+    assert [row["session_id"] for row in inserted] == ["before", "during", "after"]
@@ -0,0 +1,69 @@
+# tests/test_dedup.py
+import threading
+
+from mysql.connector.constants import ClientFlag
+
+from tests.conftest import survey_row
+
+
+def test_recent_duplicate_is_answered_without_a_query(make_db_manager, fake_db):
+    manager = make_db_manager()
+    first = manager.save_response(survey_row("s1"))
+    queries = fake_db.queries
+
+    assert manager.save_response(survey_row("s1")) == first
+    assert fake_db.queries == queries
+    assert len(fake_db.rows) == 1
+
+
+def test_duplicate_missed_by_the_cache_returns_the_original_id(make_db_manager, fake_db):
+    # A second instance (or an evicted cache entry) relies on the unique key alone
+    first = make_db_manager().save_response(survey_row("s1"))
+    other = make_db_manager()
+    committed = []
+    other.add_listener(committed.extend)
+
+    assert other.save_response(survey_row("s1")) == first
+    assert len(fake_db.rows) == 1
+    assert committed == []  # duplicates are not counted again by the aggregates
+
+
+def test_evicted_entry_falls_back_to_the_unique_key(make_db_manager, fake_db):
+    manager = make_db_manager()
+    manager.recent_submissions.max_entries = 1
+    first = manager.save_response(survey_row("s1"))
+    manager.save_response(survey_row("s2"))
+
+    assert manager.recent_submissions.lookup("s1") == (False, None)
+    assert manager.save_response(survey_row("s1")) == first
+    assert len(fake_db.rows) == 2
+
+
+def test_concurrent_duplicates_store_one_row(make_db_manager, fake_db):
+    manager = make_db_manager()
+    committed = []
+    manager.add_listener(committed.extend)
+    barrier = threading.Barrier(8)
+    ids = []
+
+    def submit():
+        barrier.wait()
+        ids.append(manager.save_response(survey_row("same")))
+
+    threads = [threading.Thread(target=submit) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(fake_db.rows) == 1
+    assert set(ids) == {fake_db.rows[0]["id"]}
+    assert len(committed) == 1
+
+
+def test_connection_keeps_found_rows_off(make_db_manager):
+    # With CLIENT_FOUND_ROWS a duplicate reports rowcount 1 and would be counted as new
+    manager = make_db_manager()
+    flags = manager._config.get("client_flags", [])
+    assert ClientFlag.FOUND_ROWS not in flags
+    assert "LAST_INSERT_ID(id)" in manager.insert_query
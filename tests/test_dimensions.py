@@ -0,0 +1,50 @@
+# tests/test_dimensions.py
+import pytest
+
+from src.data.dimensions import DimensionEncoder, parse_user_agent
+
+CHROME = ("Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
+          "(KHTML, like Gecko) Chrome/124.0.6367.91 Safari/537.36")
+EDGE = CHROME + " Edg/124.0.2478.67"
+SAFARI_IOS = ("Mozilla/5.0 (iPhone; CPU iPhone OS 17_4 like Mac OS X) AppleWebKit/605.1.15 "
+              "(KHTML, like Gecko) Version/17.4 Mobile/15E148 Safari/604.1")
+FIREFOX = "Mozilla/5.0 (X11; Linux x86_64; rv:125.0) Gecko/20100101 Firefox/125.0"
+CUBOT = ("Mozilla/5.0 (Linux; Android 12; CUBOT X30 Build/SP1A) AppleWebKit/537.36 "
+         "(KHTML, like Gecko) Chrome/120.0.6099.43 Mobile Safari/537.36")
+GOOGLEBOT = "Mozilla/5.0 (compatible; Googlebot/2.1; +http://www.google.com/bot.html)"
+SLURP = "Mozilla/5.0 (compatible; Yahoo! Slurp; http://help.yahoo.com/help/us/ysearch/slurp)"
+
+
+@pytest.mark.parametrize("user_agent, expected", [
+    (CHROME, ("Chrome", "124", "Windows")),
+    (EDGE, ("Edge", "124", "Windows")),
+    (SAFARI_IOS, ("Safari", "17", "iOS")),
+    (FIREFOX, ("Firefox", "125", "Linux")),
+    (CUBOT, ("Chrome", "120", "Android")),
+    (GOOGLEBOT, ("Bot", "2", "Other")),
+    (SLURP, ("Bot", "", "Other")),
+    ("curl/8.4.0", ("Other", "", "Other")),
+])
+def test_user_agents_are_reduced_to_family_major_and_os(user_agent, expected):
+    assert parse_user_agent(user_agent) == expected
+
+
+def test_overlong_version_is_clamped_to_the_column_width():
+    family, major, _ = parse_user_agent("Mozilla/5.0 Firefox/" + "9" * 40)
+    assert family == "Firefox" and major == "9" * 16
+
+
+def test_encoder_interns_each_value_once(fake_db):
+    import mysql.connector
+    encoder = DimensionEncoder()
+    connection = mysql.connector.connect()
+    first = encoder.encode(connection, {"browser": CHROME, "region": "GB", "source": "web"})
+    second = encoder.encode(connection, {"browser": CHROME, "region": " GB ", "source": "web"})
+    other = encoder.encode(connection, {"browser": FIREFOX, "region": None, "source": "web"})
+
+    assert first == second
+    assert first["browser"] is None and first["browser_id"] is not None
+    assert other["browser_id"] != first["browser_id"] and other["region_id"] is None
+    assert other["source_id"] == first["source_id"]
+    assert len(fake_db.dimensions["dim_browser"]) == 2
+    assert encoder.stats()["misses"] == 4
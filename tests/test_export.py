@@ -0,0 +1,79 @@
+# tests/test_export.py
+import asyncio
+import threading
+
+import pytest
+from starlette.requests import ClientDisconnect
+
+from src.api.routes.export_routes import ExportResponse
+from src.data.export import ExportBusy, ExportLimiter, ReservedStream
+from tests.conftest import survey_row
+
+
+def test_slot_is_held_until_the_stream_finishes(make_db_manager):
+    manager = make_db_manager()
+    manager.insert_batch([survey_row(f"s{i}") for i in range(3)])
+    limiter = ExportLimiter(max_concurrent=1)
+
+    stream = limiter.stream(manager, "ndjson")
+    with pytest.raises(ExportBusy):
+        limiter.stream(manager, "ndjson")
+    body = b"".join(stream)
+    assert body.count(b"\n") == 3
+    limiter.stream(manager, "ndjson").close()
+
+
+def test_closing_an_unstarted_stream_frees_the_slot(make_db_manager):
+    limiter = ExportLimiter(max_concurrent=1)
+    limiter.stream(make_db_manager(), "csv").close()
+    limiter.stream(make_db_manager(), "csv").close()
+
+
+def test_client_gone_before_first_chunk_frees_the_slot(make_db_manager):
+    manager = make_db_manager()
+    limiter = ExportLimiter(max_concurrent=1)
+    stream = limiter.stream(manager, "csv")
+    response = ExportResponse(stream, media_type="text/csv")
+    response.export_stream = stream
+
+    async def receive():
+        return {"type": "http.disconnect"}
+
+    async def send(message):
+        raise OSError("connection reset")
+
+    scope = {"type": "http", "asgi": {"spec_version": "2.4"}}
+    with pytest.raises(ClientDisconnect):
+        asyncio.run(response(scope, receive, send))
+    limiter.stream(manager, "csv").close()
+
+
+def test_slot_is_held_until_a_running_chunk_finishes():
+    slots = threading.BoundedSemaphore(1)
+    slots.acquire()
+    producing, proceed = threading.Event(), threading.Event()
+    finished = []
+
+    def chunks():
+        try:
+            yield b"a"
+            producing.set()
+            proceed.wait()
+            yield b"b"
+            yield b"c"
+        finally:
+            finished.append(True)
+
+    stream = ReservedStream(slots, chunks())
+    iterator = iter(stream)
+    assert next(iterator) == b"a"
+    worker = threading.Thread(target=lambda: next(iterator, None))
+    worker.start()
+    producing.wait()
+
+    stream.close()  # the client went away while the next chunk is being produced
+    assert not slots.acquire(blocking=False)  # the export is still running
+    proceed.set()
+    worker.join()
+    assert finished == [True]
+    assert slots.acquire(blocking=False)
@@ -0,0 +1,70 @@
+# tests/test_http_cache.py
+import gzip
+
+import pytest
+from starlette.requests import Request
+
+from src.api.http_cache import PrecompressedAsset
+
+BODY = b'{"questions": {}}' * 20
+
+
+def request(**headers) -> Request:
+    return Request({
+        "type": "http", "method": "GET", "path": "/", "query_string": b"",
+        "headers": [(name.replace("_", "-").encode(), value.encode()) for name, value in headers.items()],
+    })
+
+
+@pytest.mark.parametrize("accept, expected", [
+    ("", "identity"),
+    ("gzip", "gzip"),
+    ("deflate, GZIP", "gzip"),
+    ("gzip;q=0", "identity"),
+    ("gzip; q=0.0, br", "br"),
+    ("br;q=0.5, gzip", "br"),
+    ("identity", "identity"),
+])
+def test_choose_encoding(accept, expected):
+    asset = PrecompressedAsset(BODY, "application/json")
+    asset.add_encoding("br", b"brotli-bytes")
+    assert asset.choose_encoding(accept) == expected
+
+
+def test_br_is_not_offered_without_a_br_variant():
+    asset = PrecompressedAsset(BODY, "application/json")
+    assert asset.choose_encoding("br, gzip") == "gzip"
+
+
+def test_gzip_response_decodes_to_the_body():
+    asset = PrecompressedAsset(BODY, "application/json", cache_control="public, max-age=300")
+    response = asset.response(request(accept_encoding="gzip"))
+    assert response.status_code == 200
+    assert response.headers["content-encoding"] == "gzip"
+    assert response.headers["vary"] == "Accept-Encoding"
+    assert response.headers["cache-control"] == "public, max-age=300"
+    assert gzip.decompress(response.body) == BODY
+
+
+def test_each_encoding_has_its_own_etag():
+    asset = PrecompressedAsset(BODY, "application/json")
+    plain = asset.response(request()).headers["etag"]
+    zipped = asset.response(request(accept_encoding="gzip")).headers["etag"]
+    assert plain == asset.etag and zipped != plain
+
+
+@pytest.mark.parametrize("if_none_match", [None, '"stale"', "W/\"stale\", \"other\""])
+def test_changed_or_missing_validator_gets_the_body(if_none_match):
+    asset = PrecompressedAsset(BODY, "application/json")
+    headers = {"if_none_match": if_none_match} if if_none_match else {}
+    assert asset.response(request(**headers)).status_code == 200
+
+
+def test_matching_validator_gets_304_without_a_body():
+    asset = PrecompressedAsset(BODY, "application/json")
+    etag = asset.response(request(accept_encoding="gzip")).headers["etag"]
+    for if_none_match in (etag, f"W/{etag}", f'"stale", {etag}', "*"):
+        response = asset.response(request(accept_encoding="gzip", if_none_match=if_none_match))
+        assert response.status_code == 304
+        assert response.body == b""
+        assert response.headers["etag"] == etag
@@ -0,0 +1,94 @@
+# tests/test_metrics.py
+import pytest
+from fastapi import APIRouter, FastAPI
+from fastapi.testclient import TestClient
+
+from src.monitoring.metrics import Registry, http_request_seconds
+from src.monitoring.middleware import MetricsMiddleware
+
+
+def route_labels():
+    return {labels[1] for labels in http_request_seconds._series}
+
+
+def test_requests_are_labelled_by_route_template_only():
+    router = APIRouter()
+
+    @router.get("/files/{name:path}")
+    async def file(name: str):
+        return {}
+
+    @router.get("/items/{item_id}")
+    async def item(item_id: int):
+        return {}
+
+    app = FastAPI()
+    app.include_router(router, prefix="/api")
+    app.add_middleware(MetricsMiddleware, included_routers=[("/api", router)])
+    client = TestClient(app)
+
+    client.get("/api/files/a%2Fb/c%20d.txt")
+    client.get("/api/items/0042")
+    client.get("/no/such/page/12345")
+
+    labels = route_labels()
+    assert {"/api/files/{name:path}", "/api/items/{item_id}", "unmatched"} <= labels
+    assert not any("a%2Fb" in label or "a/b" in label or "0042" in label or "12345" in label
+                   for label in labels)
+
+
+def test_registry_renders_prometheus_text():
+    registry = Registry()
+    counter = registry.counter("jobs", "Jobs run", ("result",))
+    counter.inc("ok")
+    counter.inc("ok", amount=2)
+    histogram = registry.histogram("job_seconds", "Job time", buckets=(0.1, 1.0))
+    histogram.observe(0.5)
+    text = registry.render()
+    assert 'jobs_total{result="ok"} 3' in text
+    assert 'job_seconds_bucket{le="0.1"} 0' in text
+    assert 'job_seconds_bucket{le="1"} 1' in text
+    assert 'job_seconds_bucket{le="+Inf"} 1' in text
+    assert "job_seconds_count 1" in text
+
+
+def test_database_stats_require_the_metrics_token(make_db_manager, monkeypatch):
+    from src.api.routes import stats_routes
+    app = FastAPI()
+    app.include_router(stats_routes.router, prefix="/api")
+    app.state.db_manager = make_db_manager()
+    client = TestClient(app)
+
+    monkeypatch.setenv("METRICS_TOKEN", "secret")
+    assert client.get("/api/stats/database").status_code == 401
+    assert client.get("/api/stats/database",
+                      headers={"Authorization": "Bearer wrong"}).status_code == 401
+    response = client.get("/api/stats/database", headers={"Authorization": "Bearer secret"})
+    assert response.status_code == 200
+    assert "write_pool" in response.json()
+
+
+@pytest.mark.parametrize("path", ["/api/stats/population", "/api/generate-pdf/cache-stats"])
+def test_stats_endpoints_require_the_metrics_token(path, monkeypatch):
+    from src.api.routes import pdf_routes, stats_routes
+    app = FastAPI()
+    app.include_router(stats_routes.router, prefix="/api")
+    app.include_router(pdf_routes.router, prefix="/api")
+    client = TestClient(app)
+
+    monkeypatch.setenv("METRICS_TOKEN", "secret")
+    assert client.get(path).status_code == 401
+    assert client.get(path, headers={"Authorization": "Bearer secret"}).status_code == 200
+
+
+def test_unset_metrics_token_is_only_open_in_development(monkeypatch):
+    from src.api.routes import stats_routes
+    app = FastAPI()
+    app.include_router(stats_routes.router, prefix="/api")
+    client = TestClient(app)
+
+    monkeypatch.delenv("METRICS_TOKEN", raising=False)
+    monkeypatch.delenv("NODE_ENV", raising=False)
+    assert client.get("/api/stats/population").status_code == 403
+    monkeypatch.setenv("NODE_ENV", "development")
+    assert client.get("/api/stats/population").status_code == 200
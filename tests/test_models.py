@@ -0,0 +1,39 @@
+# tests/test_models.py
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from pydantic import ValidationError
+
+from models import SurveyResponse
+
+
+@pytest.mark.parametrize("field, limit", [("session_id", 64), ("hash_email_session", 128)])
+def test_identifiers_are_limited_to_their_column_width(field, limit):
+    assert getattr(SurveyResponse(**{field: "x" * limit}), field) == "x" * limit
+    with pytest.raises(ValidationError):
+        SurveyResponse(**{field: "x" * (limit + 1)})
+
+
+@pytest.mark.parametrize("field, limit", [("browser", 255), ("region", 100), ("source", 50)])
+def test_free_text_is_truncated_to_its_column_width(field, limit):
+    assert getattr(SurveyResponse(**{field: "x" * (limit + 50)}), field) == "x" * limit
+    assert getattr(SurveyResponse(**{field: "short"}), field) == "short"
+
+
+def test_plot_coordinates_fit_decimal_6_2():
+    assert SurveyResponse(plot_x="9999.99").plot_x is not None
+    with pytest.raises(ValidationError):
+        SurveyResponse(plot_x="10000.00")
+
+
+def test_long_user_agent_is_accepted_and_bad_id_rejected():
+    app = FastAPI()
+
+    @app.post("/submit")
+    async def submit(response: SurveyResponse):
+        return {"browser": response.browser}
+
+    client = TestClient(app)
+    response = client.post("/submit", json={"browser": "Mozilla/5.0 " + "x" * 400})
+    assert response.status_code == 200 and len(response.json()["browser"]) == 255
+    assert client.post("/submit", json={"session_id": "x" * 65}).status_code == 422
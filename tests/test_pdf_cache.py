@@ -0,0 +1,61 @@
+# tests/test_pdf_cache.py
+from src.visualization.pdf_cache import PDFRenderCache, make_cache_key
+
+SCORES = [33.33, 33.33, 33.34]
+
+
+def test_cache_key_covers_everything_printed():
+    key = make_cache_key("Modern", SCORES, {"a": "x"}, None, "2026-01-01")
+    assert key == make_cache_key(" Modern ", [33.3, 33.3, 33.3], {"a": "x"}, None, "2026-01-01")
+    assert key != make_cache_key("Modern", SCORES, {"a": "y"}, None, "2026-01-01")
+    assert key != make_cache_key("Modern", SCORES, {"a": "x"}, b"png", "2026-01-01")
+    assert key != make_cache_key("Modern", SCORES, {"a": "x"}, None, "2026-01-02")
+
+
+def test_memory_tier_is_a_byte_bounded_lru():
+    cache = PDFRenderCache(max_bytes=10)
+    cache.put("a", b"aaaa")
+    cache.put("b", b"bbbb")
+    assert cache.get("a") == b"aaaa"  # a is now most recently used
+    cache.put("c", b"cccc")
+    assert cache.get("b") is None
+    assert cache.get("a") == b"aaaa" and cache.get("c") == b"cccc"
+    stats = cache.stats()
+    assert stats["memory_evictions"] == 1 and stats["memory_bytes"] == 8
+    assert stats["memory_hits"] == 3 and stats["misses"] == 1
+
+
+def test_disk_tier_survives_a_restart_and_evicts_oldest(tmp_path):
+    cache = PDFRenderCache(max_bytes=0, disk_dir=str(tmp_path), disk_max_bytes=10)
+    cache.put("a", b"aaaa")
+    cache.put("b", b"bbbb")
+    cache.put("c", b"cccc")
+    assert not (tmp_path / "a.pdf").exists()
+
+    restarted = PDFRenderCache(max_bytes=100, disk_dir=str(tmp_path), disk_max_bytes=10)
+    assert restarted.get("b") == b"bbbb"
+    assert restarted.stats()["disk_hits"] == 1
+    assert restarted.get("b") == b"bbbb"  # promoted to memory
+    assert restarted.stats()["memory_hits"] == 1
+
+
+def test_file_removed_by_another_process_is_a_miss(tmp_path):
+    cache = PDFRenderCache(max_bytes=0, disk_dir=str(tmp_path))
+    cache.put("a", b"aaaa")
+    (tmp_path / "a.pdf").unlink()
+    assert cache.get("a") is None
+    assert cache.stats()["disk_entries"] == 0
+
+
+def test_failed_mtime_update_is_a_miss(tmp_path, monkeypatch):
+    from src.visualization import pdf_cache
+
+    cache = PDFRenderCache(max_bytes=0, disk_dir=str(tmp_path))
+    cache.put("a", b"aaaa")
+
+    def read_only(*args, **kwargs):
+        raise OSError(30, "Read-only file system")
+
+    monkeypatch.setattr(pdf_cache.os, "utime", read_only)
+    assert cache.get("a") is None
+    assert cache.stats()["misses"] == 1
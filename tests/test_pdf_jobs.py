@@ -0,0 +1,120 @@
+# tests/test_pdf_jobs.py
+import asyncio
+
+import pytest
+
+from src.visualization.pdf_jobs import PDFJobManager, PDFJobQueueFull
+
+
+async def settle(manager, job, timeout=2.0):
+    for _ in range(int(timeout / 0.01)):
+        if job.status in ("done", "failed"):
+            return
+        await asyncio.sleep(0.01)
+
+
+def run(scenario):
+    return asyncio.run(scenario())
+
+
+def test_job_runs_and_its_result_can_be_downloaded():
+    async def render(payload):
+        return b"%PDF-" + payload
+
+    async def scenario():
+        manager = PDFJobManager(render, workers=1)
+        job = manager.submit(b"1")
+        assert manager.get(job.job_id) is job
+        await settle(manager, job)
+        result = await manager.result(job)
+        await manager.stop()
+        return job, result
+
+    job, result = run(scenario)
+    assert job.status == "done" and job.size == 6
+    assert result == b"%PDF-1"
+
+
+def test_failed_render_is_reported_on_the_job():
+    async def render(payload):
+        raise RuntimeError("renderer exploded")
+
+    async def scenario():
+        manager = PDFJobManager(render, workers=1)
+        job = manager.submit(None)
+        await settle(manager, job)
+        await manager.stop()
+        return job
+
+    job = run(scenario)
+    assert job.status == "failed" and "exploded" in job.error
+
+
+def test_queue_is_bounded_and_reports_positions():
+    release = None
+
+    async def render(payload):
+        await release.wait()
+        return b"x"
+
+    async def scenario():
+        nonlocal release
+        release = asyncio.Event()
+        manager = PDFJobManager(render, workers=1, max_queue=2)
+        running = manager.submit(0)
+        await asyncio.sleep(0.01)  # the worker takes the first job
+        waiting = [manager.submit(1), manager.submit(2)]
+        with pytest.raises(PDFJobQueueFull):
+            manager.submit(3)
+        positions = [manager.queue_position(job) for job in waiting]
+        release.set()
+        await manager.stop()
+        return running, positions
+
+    running, positions = run(scenario)
+    assert running.status == "running"
+    assert positions == [1, 2]
+
+
+def test_finished_jobs_expire():
+    async def render(payload):
+        return b"x"
+
+    async def scenario():
+        manager = PDFJobManager(render, workers=1, ttl=0)
+        job = manager.submit(None)
+        await settle(manager, job)
+        await asyncio.sleep(0.01)
+        found = manager.get(job.job_id)
+        await manager.stop()
+        return found
+
+    assert run(scenario) is None
+
+
+def test_file_backend_io_runs_off_the_event_loop(tmp_path, monkeypatch):
+    import threading
+    from src.visualization.pdf_jobs import FileResultBackend
+
+    threads = []
+    original_put = FileResultBackend.put
+
+    def put(self, job_id, data):
+        threads.append(threading.current_thread())
+        original_put(self, job_id, data)
+
+    monkeypatch.setattr(FileResultBackend, "put", put)
+
+    async def render(payload):
+        return b"%PDF-file"
+
+    async def scenario():
+        manager = PDFJobManager(render, workers=1, result_dir=str(tmp_path))
+        job = manager.submit(None)
+        await settle(manager, job)
+        result = await manager.result(job)
+        await manager.stop()
+        return result
+
+    assert run(scenario) == b"%PDF-file"
+    assert threads and threads[0] is not threading.main_thread()
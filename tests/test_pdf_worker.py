@@ -0,0 +1,71 @@
+# tests/test_pdf_worker.py
+import asyncio
+import os
+import time
+
+import pytest
+
+from src.visualization import pdf_worker
+from src.visualization.pdf_worker import PDFPoolSaturated, PDFRenderTimeout, PDFWorkerPool
+
+
+def hang(*args):
+    time.sleep(60)
+
+
+def crash(*args):
+    os._exit(1)
+
+
+def quick(*args):
+    return b"%PDF-test"
+
+
+def render(pool):
+    return asyncio.run(pool.render("Modern", [30.0, 40.0, 30.0], {}))
+
+
+@pytest.fixture
+def pool(monkeypatch):
+    # fork so the worker sees the patched _render
+    monkeypatch.setattr(pdf_worker, "_init_worker", lambda: None)
+    pool = PDFWorkerPool(workers=1, max_queue=0, timeout=0.5, start_method="fork")
+    yield pool
+    pool.shutdown(wait=False)
+
+
+def test_hung_render_is_terminated_and_the_pool_replaced(pool, monkeypatch):
+    monkeypatch.setattr(pdf_worker, "_render", hang)
+    hung = list(pool.start()._processes.values())
+
+    async def scenario():
+        with pytest.raises(PDFRenderTimeout):
+            await pool.render("Modern", [30.0, 40.0, 30.0], {})
+        assert pool._executor is None and pool.restarts == 1
+        # The slot is freed once the stuck worker is terminated after the grace period
+        for _ in range(100):
+            if pool.in_flight == 0 and not any(process.is_alive() for process in hung):
+                break
+            await asyncio.sleep(0.05)
+        assert pool.in_flight == 0
+        assert not any(process.is_alive() for process in hung)
+        monkeypatch.setattr(pdf_worker, "_render", quick)
+        return await pool.render("Modern", [30.0, 40.0, 30.0], {})
+
+    assert asyncio.run(scenario()) == b"%PDF-test"
+
+
+def test_crashed_worker_does_not_break_later_renders(pool, monkeypatch):
+    monkeypatch.setattr(pdf_worker, "_render", crash)
+    with pytest.raises(Exception):
+        render(pool)
+    monkeypatch.setattr(pdf_worker, "_render", quick)
+    assert render(pool) == b"%PDF-test"
+    assert pool.restarts >= 1
+
+
+def test_saturated_pool_rejects(pool):
+    pool.in_flight = pool.capacity
+    with pytest.raises(PDFPoolSaturated):
+        render(pool)
+    assert pool.rejected == 1
@@ -0,0 +1,78 @@
+# tests/test_percentiles.py
+import random
+
+from src.analytics.percentiles import AXES, FenwickTree, PercentileRanker
+from tests.conftest import survey_row
+
+
+def test_fenwick_prefix_sums_match_a_plain_list():
+    rng = random.Random(0)
+    size = 37
+    counts = [0] * size
+    tree = FenwickTree(size)
+    for _ in range(500):
+        index, count = rng.randrange(size), rng.randint(1, 5)
+        tree.add(index, count)
+        counts[index] += count
+    built = FenwickTree.from_counts(counts)
+    for index in range(size + 2):
+        assert tree.prefix(index) == sum(counts[:index])
+        assert built.prefix(index) == sum(counts[:index])
+
+
+def oracle_rank(rows, scores, resolution):
+    """Percent of rows strictly lower, compared at the ranker's bin resolution"""
+    to_bin = lambda value: round(value / resolution)  # noqa: E731
+    ranks = {}
+    for axis, column, score in zip(AXES, ("n1", "n2", "n3"), scores):
+        lower = sum(1 for row in rows if to_bin(row[column]) < to_bin(score))
+        ranks[axis] = round(100 * lower / len(rows), 1)
+    return ranks
+
+
+def random_rows(count, seed=0):
+    rng = random.Random(seed)
+    rows = []
+    for i in range(count):
+        n1 = round(rng.uniform(0, 100), 1)
+        n2 = round(rng.uniform(0, 100 - n1), 1)
+        rows.append(survey_row(f"pct-{i}", n1=n1, n2=n2, n3=round(100 - n1 - n2, 1)))
+    return rows
+
+
+def test_ranks_match_a_brute_force_oracle():
+    rows = random_rows(400)
+    ranker = PercentileRanker(resolution=0.1)
+    ranker.observe(rows)
+    rng = random.Random(1)
+    for _ in range(200):
+        scores = [round(rng.uniform(0, 100), 1) for _ in AXES]
+        ranks = ranker.rank(scores)
+        assert ranks.pop("population") == len(rows)
+        assert ranks == oracle_rank(rows, scores, 0.1), scores
+
+
+def test_out_of_range_scores_are_clamped():
+    ranker = PercentileRanker()
+    ranker.observe(random_rows(50))
+    assert ranker.rank([-5, -5, -5])["PreModern"] == 0
+    assert ranker.rank([150, 150, 150])["Modern"] <= 100
+
+
+def test_empty_ranker_and_incomplete_rows():
+    ranker = PercentileRanker()
+    assert ranker.rank([50, 30, 20]) is None
+    ranker.observe([survey_row("partial", n3=None)])
+    assert ranker.rank([50, 30, 20]) is None
+
+
+def test_seed_matches_observe(make_db_manager):
+    rows = random_rows(300, seed=2)
+    manager = make_db_manager()
+    manager.insert_batch(rows)
+    observed = PercentileRanker()
+    observed.observe(rows)
+    seeded = PercentileRanker()
+    seeded.seed(manager)
+    for scores in ([10, 20, 70], [33.3, 33.3, 33.4], [99.9, 0, 0.1]):
+        assert seeded.rank(scores) == observed.rank(scores)
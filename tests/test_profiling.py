@@ -0,0 +1,128 @@
+# tests/test_profiling.py
+import asyncio
+import cProfile
+import os
+import threading
+
+import pstats
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from src.monitoring import profiling
+from src.monitoring.profiling import ProfileStore, ProfilingMiddleware, RequestProfile
+
+
+def make_app(store, **kwargs):
+    app = FastAPI()
+    loop_threads = []
+
+    @app.get("/work")
+    async def work():
+        loop_threads.append(threading.get_ident())
+        await asyncio.get_running_loop().run_in_executor(None, profiling.wrap(sum), range(1000))
+        return {"ok": True}
+
+    app.add_middleware(ProfilingMiddleware, store=store, **kwargs)
+    return app, loop_threads
+
+
+def test_token_request_is_profiled_and_saved(tmp_path):
+    store = ProfileStore(str(tmp_path))
+    app, _ = make_app(store, token="secret")
+    with TestClient(app) as client:
+        plain = client.get("/work")
+        profiled = client.get("/work", headers={"X-Profile-Token": "secret"})
+
+    assert "x-profile-id" not in plain.headers
+    name = profiled.headers["x-profile-id"]
+    path = store.path(name)
+    assert path is not None and not store.is_pending(name)
+    functions = {func for _, _, func in pstats.Stats(str(path)).stats}
+    assert "<built-in method builtins.sum>" in functions
+
+
+def test_wrong_token_is_not_profiled(tmp_path):
+    store = ProfileStore(str(tmp_path))
+    app, _ = make_app(store, token="secret")
+    with TestClient(app) as client:
+        response = client.get("/work", headers={"X-Profile-Token": "guess"})
+    assert "x-profile-id" not in response.headers
+    assert store.list() == []
+
+
+def test_save_runs_off_the_event_loop(tmp_path, monkeypatch):
+    store = ProfileStore(str(tmp_path))
+    app, loop_threads = make_app(store, token="secret")
+    save_threads = []
+    save = store.save
+
+    def recording_save(profile, name):
+        save_threads.append(threading.get_ident())
+        return save(profile, name)
+
+    monkeypatch.setattr(store, "save", recording_save)
+    with TestClient(app) as client:
+        client.get("/work", headers={"X-Profile-Token": "secret"})
+    assert save_threads and save_threads[0] != loop_threads[0]
+
+
+def test_short_sampled_profile_is_dropped(tmp_path):
+    store = ProfileStore(str(tmp_path))
+    app, _ = make_app(store, sample_rate=1.0, min_duration=60)
+    with TestClient(app) as client:
+        name = client.get("/work").headers["x-profile-id"]
+    assert store.path(name) is None and not store.is_pending(name)
+
+
+def test_pending_profile_until_saved(tmp_path):
+    store = ProfileStore(str(tmp_path))
+    store.expect("a.prof")
+    assert store.is_pending("a.prof") and store.path("a.prof") is None
+    profile = RequestProfile()
+    profile.loop_profile.runcall(sum, range(10))
+    store.save(profile, "a.prof")
+    assert not store.is_pending("a.prof") and store.path("a.prof") is not None
+
+
+def test_store_keeps_the_newest_max_files(tmp_path):
+    store = ProfileStore(str(tmp_path), max_files=2)
+    for i in range(4):
+        profile = RequestProfile()
+        profile.loop_profile.runcall(sum, range(10))
+        path = store.save(profile, f"{i}.prof")
+        os.utime(path, (i, i))
+    assert [entry["name"] for entry in store.list()] == ["3.prof", "2.prof"]
+
+
+def test_rejects_unsafe_names(tmp_path):
+    store = ProfileStore(str(tmp_path))
+    (tmp_path / "x.prof").write_bytes(b"")
+    assert store.path("../x.prof") is None
+    assert store.path("x.txt") is None
+
+
+def test_merges_thread_parts(tmp_path):
+    profile = RequestProfile()
+    profile.loop_profile.runcall(sum, range(10))
+    part = cProfile.Profile()
+    part.runcall(sorted, [3, 1, 2])
+    profile.add(part)
+    functions = {func for _, _, func in profile.stats().stats}
+    assert "<built-in method builtins.sorted>" in functions
+
+
+def test_pending_profile_download_asks_to_retry(tmp_path, monkeypatch):
+    from src.api.routes import profile_routes
+    store = ProfileStore(str(tmp_path))
+    monkeypatch.setattr(profile_routes, "profile_store", store)
+    monkeypatch.setenv("PROFILE_TOKEN", "secret")
+    app = FastAPI()
+    app.include_router(profile_routes.router, prefix="/api")
+    store.expect("a.prof")
+    with TestClient(app) as client:
+        auth = {"Authorization": "Bearer secret"}
+        pending = client.get("/api/profiles/a.prof", headers=auth)
+        store.cancel("a.prof")
+        missing = client.get("/api/profiles/a.prof", headers=auth)
+    assert pending.status_code == 409 and pending.headers["retry-after"] == "1"
+    assert missing.status_code == 404
@@ -0,0 +1,31 @@
+# tests/test_read_routing.py
+import pytest
+
+
+@pytest.fixture
+def replica_manager(make_db_manager, monkeypatch):
+    monkeypatch.setenv("DB_READ_HOST", "replica.internal")
+    monkeypatch.setenv("DB_READ_PORT", "")  # as shipped in .env.example
+    monkeypatch.setenv("DB_READ_LAG_CHECK_INTERVAL", "0")
+    return make_db_manager()
+
+
+def test_empty_read_port_uses_the_primary_port(replica_manager):
+    assert replica_manager._read_config["host"] == "replica.internal"
+    assert replica_manager._read_config["port"] == replica_manager._config["port"]
+
+
+def test_reads_fall_back_to_the_primary_while_the_replica_lags(replica_manager, fake_db):
+    fake_db.replica_lag = 1
+    with replica_manager.get_read_connection():
+        pass
+    assert replica_manager.read_pool.stats()["opened"] == 1
+    assert replica_manager.primary_read_pool.stats()["opened"] == 0
+
+    fake_db.replica_lag = 120
+    with replica_manager.get_read_connection():
+        pass
+    assert replica_manager.primary_read_pool.stats()["opened"] == 1
+    with replica_manager.get_read_connection(max_lag=300):
+        pass
+    assert replica_manager.replica_lag.fallbacks == 1
@@ -0,0 +1,60 @@
+# tests/test_save_response.py
+import asyncio
+
+import pytest
+from mysql.connector import errors
+
+from db_manager import AsyncDatabaseManager
+from tests.conftest import survey_row
+
+
+def flaky(manager, failures):
+    """Make the next inserts raise the given errors, then succeed"""
+    insert = manager.insert_response
+    pending = list(failures)
+
+    def insert_response(data):
+        if pending:
+            raise pending.pop(0)
+        return insert(data)
+
+    manager.insert_response = insert_response
+
+
+def save_sync(manager, row):
+    return manager.save_response(row)
+
+
+def save_async(manager, row):
+    async_db = AsyncDatabaseManager(manager)
+    try:
+        return asyncio.run(async_db.save_response(row))
+    finally:
+        async_db.shutdown()
+
+
+@pytest.fixture(params=[save_sync, save_async], ids=["sync", "async"])
+def save(request):
+    return request.param
+
+
+def test_transient_errors_are_retried(make_db_manager, fake_db, save):
+    manager = make_db_manager()
+    flaky(manager, [errors.OperationalError("gone away")] * (manager.MAX_SAVE_ATTEMPTS - 1))
+    assert save(manager, survey_row("s1")) == fake_db.rows[0]["id"]
+
+
+def test_data_errors_are_not_retried(make_db_manager, fake_db, save):
+    manager = make_db_manager()
+    flaky(manager, [errors.DataError("Data too long"), errors.OperationalError("unused")])
+    with pytest.raises(RuntimeError, match="Data too long"):
+        save(manager, survey_row("s1"))
+    assert fake_db.rows == []
+
+
+def test_exhausted_retries_raise_without_a_spool(make_db_manager, fake_db, save):
+    manager = make_db_manager()
+    flaky(manager, [errors.OperationalError("gone away")] * manager.MAX_SAVE_ATTEMPTS)
+    with pytest.raises(RuntimeError, match="gone away"):
+        save(manager, survey_row("s1"))
+
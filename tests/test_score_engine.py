@@ -0,0 +1,55 @@
+# tests/test_score_engine.py
+import json
+import random
+
+import pytest
+
+from src.visualization.perspective_analyzer import PerspectiveAnalyzer
+from src.visualization.score_engine import QUESTIONS_PATH, ScoreEngine, score_responses
+from tests.reference import baseline_scores
+
+
+@pytest.fixture(scope="module")
+def questions():
+    return json.loads(QUESTIONS_PATH.read_text())["questions"]
+
+
+def random_responses(rng: random.Random, questions: dict) -> dict:
+    """Answers including unanswered, out-of-range and unknown questions"""
+    responses = {}
+    for key, question in questions.items():
+        field, choice = f"{key.lower()}_response", rng.random()
+        if choice < 0.1:
+            responses[field] = None
+        elif choice < 0.15:
+            responses[field] = rng.choice([0, -1, len(question["responses"]) + 1])
+        elif choice >= 0.2:  # 0.15-0.2: question left out entirely
+            responses[field] = rng.randint(1, len(question["responses"]))
+    if rng.random() < 0.1:
+        responses["q99_response"] = 1
+    return responses
+
+
+def test_batch_scores_match_the_scalar_path(questions):
+    rng = random.Random(20240501)
+    sample = [random_responses(rng, questions) for _ in range(5000)]
+    batch = score_responses(sample, questions)
+
+    for i, responses in enumerate(sample):
+        expected = baseline_scores(responses, questions)
+        assert [float(x) for x in batch.scores[i]] == expected, responses
+        if sum(expected) == 0:
+            assert not batch.valid[i]
+            continue
+        assert batch.analysis(i) == PerspectiveAnalyzer.get_perspective_summary(expected), responses
+
+
+def test_raw_scores_match_per_question_sums(questions):
+    engine = ScoreEngine(questions)
+    answers = [[1] * len(engine.question_ids), engine.response_counts]
+    raw = engine.raw_scores(answers)
+    for row, codes in zip(raw, answers):
+        expected = [0, 0, 0]
+        for q_id, code in zip(engine.question_ids, codes):
+            expected = [a + b for a, b in zip(expected, questions[q_id]["responses"][code - 1]["scores"])]
+        assert list(row) == expected
@@ -0,0 +1,67 @@
+# tests/test_similarity.py
+import numpy as np
+import pytest
+
+from src.analytics.similarity import ANSWER_COLUMNS, SCORE_COLUMNS, SimplexGridIndex
+from tests.conftest import survey_row
+
+
+def random_points(rng, count):
+    weights = rng.dirichlet([1, 1, 1], size=count)
+    scores = np.round(weights * 100, 1).astype(np.float32)
+    answers = rng.integers(0, 7, size=(count, len(ANSWER_COLUMNS)), dtype=np.int8)
+    return scores, answers
+
+
+def brute_force(scores, answers, query, query_answers, k, answer_weight):
+    distance = np.sqrt(((scores - query) ** 2).sum(axis=1))
+    distance += answer_weight * (answers != query_answers).sum(axis=1)
+    return np.sort(distance)[:k]
+
+
+@pytest.mark.parametrize("cell_size, k", [(2.0, 1), (2.0, 10), (5.0, 25), (50.0, 10)])
+def test_knn_matches_brute_force(cell_size, k):
+    rng = np.random.default_rng(0)
+    scores, answers = random_points(rng, 3000)
+    index = SimplexGridIndex(cell_size=cell_size, merge_threshold=400)
+    index.bulk_load(scores[:2000], answers[:2000])
+    # Single-row inserts: some are merged into the CSR layout, the rest stay in the delta
+    for row_scores, row_answers in zip(scores[2000:], answers[2000:]):
+        values = [*row_scores.tolist(), *row_answers.tolist()]
+        index.observe([dict(zip(SCORE_COLUMNS + ANSWER_COLUMNS, values))])
+    assert len(index) == 3000 and 0 < len(index._delta_scores) < 400
+
+    query_scores, query_answers = random_points(rng, 100)
+    corners = np.array([[100, 0, 0], [0, 100, 0], [0, 0, 100]], dtype=np.float32)
+    for query, query_row in zip(np.concatenate([query_scores, corners]),
+                                np.concatenate([query_answers, query_answers[:3]])):
+        _, _, found = index.query(query.tolist(), query_row.tolist(), k)
+        expected = brute_force(scores, answers, query, query_row, k, index.answer_weight)
+        np.testing.assert_allclose(found, expected, atol=1e-3)
+
+
+def test_query_returns_everything_when_k_exceeds_the_population():
+    rng = np.random.default_rng(1)
+    scores, answers = random_points(rng, 5)
+    index = SimplexGridIndex()
+    index.bulk_load(scores, answers)
+    _, _, distances = index.query([33, 33, 34], k=10)
+    assert len(distances) == 5 and list(distances) == sorted(distances)
+
+
+def test_empty_index():
+    result = SimplexGridIndex().neighbours([50, 30, 20], k=5)
+    assert result["count"] == 0 and result["profile"]["mean_scores"] is None
+
+
+def test_load_from_the_database(make_db_manager):
+    rows = [survey_row(f"sim-{i}", n1=i, n2=100 - i, n3=0, q1_response=i % 6 + 1) for i in range(50)]
+    manager = make_db_manager()
+    manager.insert_batch(rows)
+    index = SimplexGridIndex()
+    index.load(manager, fetch_size=7)
+    assert len(index) == 50
+    result = index.neighbours([10, 90, 0], [5, None, None, None, None, None], k=3)
+    nearest = [n["scores"][0] for n in result["neighbours"]]
+    assert nearest[0] == 10 and sorted(nearest[1:]) == [9, 11]
+    assert result["profile"]["answers"]["q1_response"] == {"4": 1, "5": 1, "6": 1}
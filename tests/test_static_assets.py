@@ -0,0 +1,85 @@
+# tests/test_static_assets.py
+import gzip
+
+import pytest
+from fastapi import HTTPException
+from starlette.requests import Request
+
+from src.api import http_cache, static_assets
+from src.api.http_cache import PrecompressedAsset
+from src.api.static_assets import IMMUTABLE, REVALIDATE, StaticAssets, fingerprint
+
+CSS = b"body { color: black; }\n" * 20
+
+
+def request(**headers) -> Request:
+    return Request({
+        "type": "http", "method": "GET", "path": "/", "query_string": b"",
+        "headers": [(name.replace("_", "-").encode(), value.encode()) for name, value in headers.items()],
+    })
+
+
+@pytest.fixture
+def assets(tmp_path):
+    (tmp_path / "css").mkdir()
+    (tmp_path / "css" / "site.css").write_bytes(CSS)
+    (tmp_path / "logo.png").write_bytes(b"\x89PNG not really")
+    (tmp_path / "__init__.py").write_text("")
+    return StaticAssets(tmp_path)
+
+
+def test_fingerprint_keeps_the_directory_and_suffix():
+    assert fingerprint("css/site.min.css", "0123456789abcdef") == "css/site.min.0123456789.css"
+
+
+def test_url_changes_with_the_content(tmp_path, assets):
+    url = assets.url("css/site.css")
+    assert url.startswith("/static/css/site.") and url.endswith(".css")
+    (tmp_path / "css" / "site.css").write_bytes(CSS + b"p {}\n")
+    assert StaticAssets(tmp_path).url("css/site.css") != url
+    with pytest.raises(KeyError):
+        assets.url("__init__.py")
+
+
+def test_fingerprinted_url_is_immutable(assets):
+    path = assets.url("css/site.css").removeprefix("/static/")
+    response = assets.response(request(accept_encoding="gzip"), path)
+    assert response.headers["cache-control"] == IMMUTABLE
+    assert gzip.decompress(response.body) == CSS
+
+
+def test_plain_and_stale_names_revalidate(assets):
+    plain = assets.response(request(), "css/site.css")
+    stale = assets.response(request(), "css/site.0000000000.css")
+    assert plain.headers["cache-control"] == REVALIDATE
+    assert stale.headers["cache-control"] == REVALIDATE
+    assert plain.body == stale.body == CSS
+
+
+def test_images_are_not_recompressed(assets):
+    response = assets.response(request(accept_encoding="gzip, br"), "logo.png")
+    assert "content-encoding" not in response.headers
+
+
+def test_unknown_and_skipped_files_are_404(assets):
+    for path in ("missing.css", "__init__.py", "css/missing.0123456789.css"):
+        with pytest.raises(HTTPException) as error:
+            assets.response(request(), path)
+        assert error.value.status_code == 404
+
+
+def test_text_gets_brotli_when_available(monkeypatch, assets):
+    monkeypatch.setattr(http_cache, "brotli_compress", lambda body: b"br:" + body[:4])
+    response = assets.response(request(accept_encoding="gzip, br"), "css/site.css")
+    assert response.headers["content-encoding"] == "br"
+
+
+def test_add_brotli_without_the_package(monkeypatch):
+    monkeypatch.setattr(http_cache, "brotli_compress", lambda body: None)
+    asset = PrecompressedAsset(CSS, "text/css")
+    assert asset.add_brotli() is False
+    assert asset.choose_encoding("br, gzip") == "gzip"
+
+
+def test_bundled_favicon_has_a_fingerprinted_url():
+    assert static_assets.static_assets.url("favicon.ico").startswith("/static/favicon.")
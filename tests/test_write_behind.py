@@ -0,0 +1,40 @@
+# tests/test_write_behind.py
+import json
+
+from tests.conftest import survey_row
+
+
+def flush(manager, rows):
+    for row in rows:
+        manager.save_response(row)
+    manager.write_buffer.close(timeout=5)
+
+
+def test_rows_are_flushed_in_batches(make_db_manager, fake_db):
+    manager = make_db_manager(write_behind=True)
+    flush(manager, [survey_row(f"s{i}") for i in range(10)])
+    assert sorted(row["session_id"] for row in fake_db.rows) == sorted(f"s{i}" for i in range(10))
+    assert fake_db.queries < 10
+
+
+def test_bad_row_does_not_drop_its_batch(make_db_manager, fake_db):
+    fake_db.column_limits = {"region": 100}
+    manager = make_db_manager(write_behind=True, spool=True)
+    rows = [survey_row(f"s{i}") for i in range(5)]
+    rows[2]["region"] = "x" * 101
+    flush(manager, rows)
+
+    assert sorted(row["session_id"] for row in fake_db.rows) == ["s0", "s1", "s3", "s4"]
+    rejected = [json.loads(line) for line in manager.spool.rejected_path.read_bytes().splitlines()]
+    assert [row["session_id"] for row in rejected] == ["s2"]
+    # The rejected session may be submitted again (e.g. after the client shortens it)
+    assert manager.recent_submissions.lookup("s2") == (False, None)
+
+
+def test_bad_row_without_spool_only_loses_that_row(make_db_manager, fake_db):
+    fake_db.column_limits = {"region": 100}
+    manager = make_db_manager(write_behind=True)
+    rows = [survey_row(f"s{i}") for i in range(3)]
+    rows[0]["region"] = "x" * 101
+    flush(manager, rows)
+    assert sorted(row["session_id"] for row in fake_db.rows) == ["s1", "s2"]